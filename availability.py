@@ -0,0 +1,111 @@
+"""
+Este módulo define la clase RoomSchedule, un índice de intervalos por
+habitación que permite consultar y registrar reservas por rango de fechas
+en tiempo logarítmico.
+"""
+from array import array
+from bisect import bisect_left, bisect_right
+
+
+class RoomSchedule:
+    """
+    Lista ordenada de estancias no traslapadas de una habitación.
+
+    Cada estancia es un intervalo semiabierto [check_in, check_out) expresado
+    en ordinales de día, de modo que una salida y una entrada el mismo día
+    no se consideran traslapadas.
+
+    Las tres columnas son arreglos de enteros de 4 bytes, de modo que el
+    índice ocupa 12 bytes por estancia.
+
+    Attributes:
+        starts (array): Ordinales de entrada ordenados ascendentemente.
+        ends (array): Ordinales de salida, paralelos a ``starts``.
+        rows (array): Fila de la reserva en el almacén columnar, paralela
+        a ``starts``.
+    """
+
+    def __init__(self):
+        """
+        Inicializa un calendario vacío para la habitación.
+        """
+        self.starts = array('i')
+        self.ends = array('i')
+        self.rows = array('i')
+
+    def __len__(self):
+        return len(self.starts)
+
+    def is_available(self, check_in, check_out):
+        """
+        Indica si la habitación está libre en el rango dado.
+
+        Args:
+            check_in (int): Ordinal del día de entrada.
+            check_out (int): Ordinal del día de salida.
+
+        Returns:
+            bool: True si ninguna estancia se traslapa con el rango.
+        """
+        index = bisect_right(self.starts, check_in)
+        if index > 0 and self.ends[index - 1] > check_in:
+            return False
+        if index < len(self.starts) and self.starts[index] < check_out:
+            return False
+        return True
+
+    def add(self, check_in, check_out, row):
+        """
+        Registra una estancia si no se traslapa con las existentes.
+
+        Args:
+            check_in (int): Ordinal del día de entrada.
+            check_out (int): Ordinal del día de salida.
+            row (int): Fila de la reserva en el almacén columnar.
+
+        Returns:
+            bool: True si la estancia se registró, False si hay traslape.
+        """
+        if not self.is_available(check_in, check_out):
+            return False
+        index = bisect_left(self.starts, check_in)
+        self.starts.insert(index, check_in)
+        self.ends.insert(index, check_out)
+        self.rows.insert(index, row)
+        return True
+
+    def find(self, check_in):
+        """
+        Busca la estancia que inicia en ``check_in``.
+
+        Returns:
+            int: Fila de la reserva en el almacén columnar, o None si no
+            existe una estancia con esa fecha de entrada.
+        """
+        index = bisect_left(self.starts, check_in)
+        if index == len(self.starts) or self.starts[index] != check_in:
+            return None
+        return self.rows[index]
+
+    def remove(self, check_in=None):
+        """
+        Elimina la estancia que inicia en ``check_in``.
+
+        Args:
+            check_in (int, opcional): Ordinal del día de entrada. Si no se
+            indica se elimina la primera estancia de la habitación.
+
+        Returns:
+            tuple: (entrada, salida, fila) de la estancia eliminada o None
+            si no existe una estancia con esa fecha de entrada.
+        """
+        if not self.starts:
+            return None
+        if check_in is None:
+            index = 0
+        else:
+            index = bisect_left(self.starts, check_in)
+            if index == len(self.starts) or self.starts[index] != check_in:
+                return None
+        return (self.starts.pop(index), self.ends.pop(index),
+                self.rows.pop(index))
@@ -0,0 +1,140 @@
+"""
+Este módulo define la clase BatchFiles, que guarda lotes de registros en
+un solo archivo cada uno para que JsonFileBackend no escriba un archivo
+por registro al guardar miles de reservas juntas.
+"""
+import contextlib
+import json
+import os
+import threading
+import uuid
+
+
+class BatchFiles:
+    """
+    Archivos de lote de una carpeta con un índice de posiciones en
+    memoria.
+
+    Cada lote es un archivo ``<tipo>_<uuid>.jsonl`` que no se modifica
+    después de escribirse, con una línea ``llave<TAB>registro`` por
+    registro. Un registro ``null`` marca la llave como eliminada, y una
+    llave eliminada sigue así aunque otro lote la traiga. El índice lee
+    los lotes que otros procesos agreguen cuando cambia la carpeta.
+
+    Attributes:
+        folder (str): Carpeta de los lotes.
+    """
+
+    SUFFIX = ".jsonl"
+
+    def __init__(self, folder):
+        """
+        Inicializa el índice; los lotes se leen en el primer acceso.
+
+        Args:
+            folder (str): Carpeta de los lotes; se crea con el primero.
+        """
+        self.folder = folder
+        # Tipo a {llave: (archivo, inicio, fin)}; None si se eliminó.
+        self._index = {}
+        self._loaded = set()
+        self._mtime = None
+        self._lock = threading.Lock()
+
+    def index(self, kind):
+        """
+        Devuelve el índice de los lotes de un tipo de entidad.
+
+        Returns:
+            dict: Llave a su posición, o a None si se eliminó.
+        """
+        try:
+            mtime = os.stat(self.folder).st_mtime_ns
+        except FileNotFoundError:
+            return self._index.get(kind, {})
+        if mtime != self._mtime:
+            with self._lock:
+                # La marca se toma antes de recorrer la carpeta: un lote
+                # que llegue durante el recorrido la vuelve a cambiar.
+                self._mtime = mtime
+                with os.scandir(self.folder) as entries:
+                    for entry in entries:
+                        if entry.name.endswith(self.SUFFIX) and \
+                                entry.name not in self._loaded:
+                            self._load(entry.path)
+        return self._index.get(kind, {})
+
+    def _load(self, path):
+        name = os.path.basename(path)
+        index = self._index.setdefault(name.rsplit("_", 1)[0], {})
+        position = 0
+        with open(path, 'rb') as file:
+            for line in file:
+                head = line.partition(b"\t")[0]
+                start = position + len(head) + 1
+                position += len(line)
+                self._add(index, json.loads(head),
+                          (path, start, position - 1),
+                          line[len(head) + 1:-1] == b"null")
+        self._loaded.add(name)
+
+    @staticmethod
+    def _add(index, key, location, deleted):
+        if deleted:
+            index[key] = None
+        elif index.get(key, location) is not None:
+            index[key] = location
+
+    def write(self, kind, entries):
+        """
+        Guarda varios registros en un lote nuevo, de forma atómica.
+
+        Args:
+            kind (str): Tipo de entidad.
+            entries (list): Pares (llave, registro codificado en JSON, o
+            b"null" para eliminarla).
+        """
+        os.makedirs(self.folder, exist_ok=True)
+        path = os.path.join(self.folder,
+                            f"{kind}_{uuid.uuid4().hex}{self.SUFFIX}")
+        lines = []
+        locations = []
+        position = 0
+        for key, data in entries:
+            head = json.dumps(key).encode('utf-8')
+            lines.append(head + b"\t" + data + b"\n")
+            locations.append((key, (path, position + len(head) + 1,
+                                    position + len(lines[-1]) - 1),
+                              data == b"null"))
+            position += len(lines[-1])
+        # Se escribe aparte y se renombra para que nadie lea un lote a
+        # medias.
+        temporary = path + ".tmp"
+        try:
+            with open(temporary, 'wb') as file:
+                file.write(b"".join(lines))
+            os.replace(temporary, path)
+        finally:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(temporary)
+        with self._lock:
+            index = self._index.setdefault(kind, {})
+            for key, location, deleted in locations:
+                self._add(index, key, location, deleted)
+            self._loaded.add(os.path.basename(path))
+
+    def read(self, kind, key):
+        """
+        Lee un registro guardado en un lote.
+
+        Returns:
+            bytes: El registro codificado en JSON, o None si no está en
+            ningún lote o se eliminó.
+        """
+        location = self.index(kind).get(key)
+        if location is None:
+            return None
+        path, start, end = location
+        with open(path, 'rb') as file:
+            file.seek(start)
+            return file.read(end - start)
@@ -0,0 +1,420 @@
+"""
+Este módulo contiene la suite de benchmarks de las rutas críticas de
+reservas: Hotel.reserve_room, Hotel.cancel_reservation,
+Reservation.create_reservation, Customer.create_customer/modify_info y las
+consultas de disponibilidad.
+
+Cada escenario se ejecuta en varias escalas de reservas y habitaciones y
+reporta operaciones por segundo, percentiles de latencia y memoria pico.
+Los resultados se guardan en JSON para compararlos entre commits.
+
+Con ``--writers`` se mide además el rendimiento de la bitácora de
+escritura anticipada con varios escritores concurrentes.
+
+Uso:
+    python -m benchmark
+    python -m benchmark --bookings 1000,100000,1000000 --rooms 3,10000
+    python -m benchmark --writers 1,8,64
+    python -m benchmark --compare bench_results/anterior.json
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import date
+from customer import Customer
+from hotel import Hotel
+from journal import JournaledBackend
+from reservation import Reservation
+from storage import MemoryBackend
+
+FIRST_DAY = date(2024, 1, 1).toordinal()
+
+
+def generate_stays(bookings, rooms):
+    """
+    Genera estancias sin traslapes repartidas entre las habitaciones.
+
+    Args:
+        bookings (int): Número de estancias a generar.
+        rooms (list): Números de habitación.
+
+    Returns:
+        list: Tuplas (habitación, huésped, entrada, salida) con fechas
+        en formato 'YYYY-MM-DD'.
+    """
+    stays = []
+    for number in range(bookings):
+        room = rooms[number % len(rooms)]
+        check_in = FIRST_DAY + (number // len(rooms)) * 3
+        stays.append((room, f"Guest {number}",
+                      date.fromordinal(check_in).isoformat(),
+                      date.fromordinal(check_in + 2).isoformat()))
+    return stays
+
+
+def make_hotel(rooms):
+    """
+    Crea un hotel en memoria con ``rooms`` habitaciones.
+    """
+    numbers = [str(100 + number) for number in range(rooms)]
+    return Hotel("Bench", "123 Main St", "1234567890",
+                 store=MemoryBackend(), rooms=numbers)
+
+
+def scenario_reserve_room(bookings, rooms):
+    """
+    Reserva todas las estancias generadas.
+    """
+    hotel = make_hotel(rooms)
+    stays = generate_stays(bookings, hotel.rooms)
+    return [lambda stay=stay: hotel.reserve_room(*stay) for stay in stays]
+
+
+def scenario_cancel_reservation(bookings, rooms):
+    """
+    Cancela todas las estancias de un hotel previamente lleno.
+    """
+    hotel = make_hotel(rooms)
+    stays = generate_stays(bookings, hotel.rooms)
+    with _quiet():
+        for stay in stays:
+            hotel.reserve_room(*stay)
+    return [lambda stay=stay: hotel.cancel_reservation(stay[0], stay[2])
+            for stay in stays]
+
+
+def scenario_create_reservation(bookings, rooms):
+    """
+    Crea reservas completas (hotel y almacén).
+    """
+    hotel = make_hotel(rooms)
+    customer = Customer("EdBaldwin", "ed.baldwin@nasa.gov.us",
+                        "1234567890", "Happy Valley 123", store=hotel.store)
+    reservations = [
+        Reservation(customer, hotel, {'room_number': room,
+                                      'check_in_date': check_in,
+                                      'check_out_date': check_out})
+        for room, _, check_in, check_out
+        in generate_stays(bookings, hotel.rooms)]
+    return [reservation.create_reservation for reservation in reservations]
+
+
+def scenario_create_customer(bookings, rooms):
+    """
+    Crea un cliente por reserva.
+    """
+    del rooms
+    store = MemoryBackend()
+    customers = [Customer(f"Customer{number}", f"c{number}@example.com",
+                          "1234567890", "Happy Valley 123", store=store)
+                 for number in range(bookings)]
+    return [customer.create_customer for customer in customers]
+
+
+def scenario_modify_customer(bookings, rooms):
+    """
+    Modifica repetidamente un conjunto pequeño de clientes.
+    """
+    del rooms
+    store = MemoryBackend()
+    customers = []
+    for number in range(min(bookings, 1000)):
+        customer = Customer(f"Customer{number}", f"c{number}@example.com",
+                            "1234567890", "Happy Valley 123", store=store)
+        customer.create_customer()
+        customers.append(customer)
+    return [lambda customer=customers[number % len(customers)]:
+            customer.modify_info(customer.name, "new@example.com",
+                                 "0987654321", "Calle Nueva 456")
+            for number in range(bookings)]
+
+
+def scenario_is_available(bookings, rooms):
+    """
+    Consulta la disponibilidad de una habitación en un hotel lleno.
+    """
+    hotel = make_hotel(rooms)
+    stays = generate_stays(bookings, hotel.rooms)
+    with _quiet():
+        for stay in stays:
+            hotel.reserve_room(*stay)
+    return [lambda stay=stay: hotel.is_available(stay[0], stay[2], stay[3])
+            for stay in stays]
+
+
+def scenario_find_free_rooms(bookings, rooms):
+    """
+    Busca habitaciones libres para estancias de tres noches.
+    """
+    hotel = make_hotel(rooms)
+    stays = generate_stays(bookings, hotel.rooms)
+    with _quiet():
+        for stay in stays:
+            hotel.reserve_room(*stay)
+    queries = min(bookings, 10000)
+    return [lambda stay=stays[number]: hotel.find_free_rooms(
+        stay[2], stay[3]) for number in range(queries)]
+
+
+# No depende del directorio de trabajo, para que los resultados no
+# terminen sin rastrear en otra carpeta del árbol.
+RESULTS_DIR = os.environ.get('BENCH_RESULTS', os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), 'bench_results'))
+
+SCENARIOS = {
+    'reserve_room': scenario_reserve_room,
+    'cancel_reservation': scenario_cancel_reservation,
+    'create_reservation': scenario_create_reservation,
+    'create_customer': scenario_create_customer,
+    'modify_customer': scenario_modify_customer,
+    'is_available': scenario_is_available,
+    'find_free_rooms': scenario_find_free_rooms,
+}
+
+
+@contextlib.contextmanager
+def _quiet():
+    with open(os.devnull, 'w', encoding='utf-8') as devnull:
+        with contextlib.redirect_stdout(devnull):
+            yield
+
+
+def _percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def run_scenario(name, bookings, rooms, measure_memory=True):
+    """
+    Ejecuta un escenario y mide su desempeño.
+
+    Args:
+        name (str): Nombre del escenario en SCENARIOS.
+        bookings (int): Número de reservas de la escala.
+        rooms (int): Número de habitaciones de la escala.
+        measure_memory (bool, opcional): Repetir el escenario con
+        tracemalloc para medir la memoria pico.
+
+    Returns:
+        dict: Operaciones, ops/s, percentiles en microsegundos y memoria
+        pico en bytes (None si no se midió).
+    """
+    operations = SCENARIOS[name](bookings, rooms)
+    latencies = []
+    clock = time.perf_counter_ns
+    with _quiet():
+        start = clock()
+        for operation in operations:
+            begin = clock()
+            operation()
+            latencies.append(clock() - begin)
+        elapsed = clock() - start
+    del operations
+    peak = None
+    if measure_memory:
+        tracemalloc.start()
+        operations = SCENARIOS[name](bookings, rooms)
+        with _quiet():
+            for operation in operations:
+                operation()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    latencies.sort()
+    return {
+        'scenario': name,
+        'bookings': bookings,
+        'rooms': rooms,
+        'operations': len(latencies),
+        'ops_per_second': len(latencies) / (elapsed / 1e9),
+        'p50_us': _percentile(latencies, 0.50) / 1000,
+        'p95_us': _percentile(latencies, 0.95) / 1000,
+        'p99_us': _percentile(latencies, 0.99) / 1000,
+        'max_us': latencies[-1] / 1000,
+        'peak_memory_bytes': peak,
+    }
+
+
+def run_writers(writers, operations, sync=True):
+    """
+    Mide la bitácora con escritores concurrentes que guardan reservas.
+
+    Args:
+        writers (int): Número de hilos escritores.
+        operations (int): Total de reservas a guardar entre todos.
+        sync (bool, opcional): Llamar a ``fsync`` en cada confirmación.
+
+    Returns:
+        dict: Operaciones, ops/s, percentiles en microsegundos y número
+        de ``fsync`` con su promedio de entradas por confirmación.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        store = JournaledBackend(MemoryBackend(),
+                                 os.path.join(directory, "journal.log"),
+                                 sync=sync)
+        latencies = [[] for _ in range(writers)]
+        barrier = threading.Barrier(writers + 1)
+
+        def write(number):
+            clock = time.perf_counter_ns
+            samples = latencies[number]
+            barrier.wait()
+            for sequence in range(number, operations, writers):
+                begin = clock()
+                store.put('reservation', str(sequence),
+                          {'room_number': '101', 'sequence': sequence})
+                samples.append(clock() - begin)
+
+        threads = [threading.Thread(target=write, args=(number,))
+                   for number in range(writers)]
+        for thread in threads:
+            thread.start()
+        barrier.wait()
+        start = time.perf_counter_ns()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter_ns() - start
+        commits = store.journal.commits
+        store.close()
+    ordered = sorted(sample for samples in latencies for sample in samples)
+    return {
+        'scenario': 'journal_writers',
+        'bookings': operations,
+        'rooms': 0,
+        'writers': writers,
+        'operations': len(ordered),
+        'ops_per_second': len(ordered) / (elapsed / 1e9),
+        'p50_us': _percentile(ordered, 0.50) / 1000,
+        'p95_us': _percentile(ordered, 0.95) / 1000,
+        'p99_us': _percentile(ordered, 0.99) / 1000,
+        'max_us': ordered[-1] / 1000,
+        'fsyncs': commits,
+        'entries_per_fsync': len(ordered) / commits if commits else None,
+        'peak_memory_bytes': None,
+    }
+
+
+def _commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
+                              capture_output=True, text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))
+                              ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(results, baseline, threshold=0.10):
+    """
+    Compara resultados contra una corrida anterior.
+
+    Args:
+        results (list): Resultados de la corrida actual.
+        baseline (list): Resultados de la corrida anterior.
+        threshold (float, opcional): Caída relativa de ops/s a partir de
+        la cual se reporta una regresión.
+
+    Returns:
+        list: Tuplas (escenario, reservas, habitaciones, cambio relativo)
+        de los escenarios con regresión.
+    """
+    previous = {(item['scenario'], item['bookings'], item['rooms'],
+                 item.get('writers')): item
+                for item in baseline}
+    regressions = []
+    for item in results:
+        key = (item['scenario'], item['bookings'], item['rooms'],
+               item.get('writers'))
+        if key not in previous:
+            continue
+        change = item['ops_per_second'] / \
+            previous[key]['ops_per_second'] - 1
+        if change < -threshold:
+            regressions.append(key[:3] + (change,))
+    return regressions
+
+
+def _integers(text):
+    return [int(float(value)) for value in text.split(',')]
+
+
+def main(argv=None):
+    """
+    Punto de entrada de la línea de comandos.
+
+    Returns:
+        int: 1 si se detectaron regresiones, 0 de lo contrario.
+    """
+    parser = argparse.ArgumentParser(description="Benchmarks de reservas.")
+    parser.add_argument('--bookings', type=_integers, default=[1000, 10000],
+                        help="Escalas de reservas, p. ej. 1e3,1e4,1e6.")
+    parser.add_argument('--rooms', type=_integers, default=[3, 1000],
+                        help="Escalas de habitaciones, p. ej. 3,10000.")
+    parser.add_argument('--scenarios', default=",".join(SCENARIOS),
+                        help="Escenarios separados por comas.")
+    parser.add_argument('--no-memory', action='store_true',
+                        help="No medir la memoria pico.")
+    parser.add_argument('--writers', type=_integers, default=[],
+                        help="Escritores concurrentes de la bitácora, "
+                             "p. ej. 1,8,64.")
+    parser.add_argument('--journal-operations', type=int, default=5000)
+    parser.add_argument('--output-dir', default=RESULTS_DIR,
+                        help="Carpeta de resultados; por omisión la "
+                             "variable BENCH_RESULTS o bench_results "
+                             "junto a este módulo, que git ignora.")
+    parser.add_argument('--compare', help="Resultados JSON anteriores.")
+    parser.add_argument('--threshold', type=float, default=0.10)
+    arguments = parser.parse_args(argv)
+
+    results = []
+    for name in arguments.scenarios.split(','):
+        for bookings in arguments.bookings:
+            for rooms in arguments.rooms:
+                result = run_scenario(name, bookings, rooms,
+                                      not arguments.no_memory)
+                results.append(result)
+                memory = result['peak_memory_bytes']
+                memory = "-" if memory is None else f"{memory / 2**20:.1f}"
+                print(f"{name:<20} {bookings:>9} reservas {rooms:>6} hab. "
+                      f"{result['ops_per_second']:>12,.0f} ops/s "
+                      f"p50 {result['p50_us']:8.1f} us "
+                      f"p99 {result['p99_us']:8.1f} us "
+                      f"pico {memory} MiB")
+    for writers in arguments.writers:
+        result = run_writers(writers, arguments.journal_operations)
+        results.append(result)
+        print(f"{'journal_writers':<20} {writers:>9} escritores "
+              f"{result['ops_per_second']:>12,.0f} ops/s "
+              f"p50 {result['p50_us']:8.1f} us "
+              f"p99 {result['p99_us']:8.1f} us "
+              f"{result['entries_per_fsync']:.1f} entradas/fsync")
+
+    commit = _commit()
+    os.makedirs(arguments.output_dir, exist_ok=True)
+    path = os.path.join(arguments.output_dir,
+                        f"{time.strftime('%Y%m%d-%H%M%S')}_{commit}.json")
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump({'commit': commit, 'python': sys.version,
+                   'platform': platform.platform(), 'results': results},
+                  file, indent=2)
+    print(f"Resultados guardados en {path}")
+
+    if arguments.compare:
+        with open(arguments.compare, 'r', encoding='utf-8') as file:
+            baseline = json.load(file)['results']
+        regressions = compare(results, baseline, arguments.threshold)
+        for name, bookings, rooms, change in regressions:
+            print(f"Regresión: {name} {bookings} reservas {rooms} hab. "
+                  f"{change:+.1%} ops/s")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,202 @@
+"""
+Este módulo implementa la importación y exportación masiva de clientes,
+hoteles y reservas en formato JSONL (un registro JSON por línea).
+
+Ambas operaciones trabajan como flujos con memoria constante: los
+registros se leen, validan y escriben en lotes a través del almacén.
+
+Uso:
+    python -m bulk import customers customers.jsonl --sqlite hotel.db
+    python -m bulk export reservations -o reservations.jsonl
+    python -m bulk import hotels hotels.jsonl --sharded datos
+"""
+import argparse
+import json
+import sys
+import time
+from itertools import islice
+from customer import Customer
+from dates import parse_date
+from logstore import LogStore
+from storage import DEFAULT_BACKEND, ShardedFileBackend, SQLiteBackend
+
+KINDS = {'customers': 'customer', 'hotels': 'hotel',
+         'reservations': 'reservation'}
+
+
+def _validate_customer(record):
+    customer = Customer(record.get('name'), record.get('email'),
+                        record.get('mobile_phone'), record.get('address'))
+    customer.validate()
+    return customer.name, customer.to_dict()
+
+
+def _validate_hotel(record):
+    if not record.get('name') or not record.get('location') \
+       or not record.get('phone'):
+        raise ValueError("Todos los campos son obligatorios.")
+    return record['name'], record
+
+
+def _validate_reservation(record):
+    for field in ('reservation_id', 'room_number', 'check_in_date',
+                  'check_out_date'):
+        if not record.get(field):
+            raise ValueError(f"Falta el campo {field}.")
+    if parse_date(record['check_out_date']) <= \
+       parse_date(record['check_in_date']):
+        raise ValueError("Las fechas de reservación son incorrectas.")
+    return record['reservation_id'], record
+
+
+VALIDATORS = {'customer': _validate_customer, 'hotel': _validate_hotel,
+              'reservation': _validate_reservation}
+
+
+def read_records(lines, kind, on_error=None):
+    """
+    Convierte líneas JSONL en pares (llave, registro) validados.
+
+    Args:
+        lines (iterable): Líneas de texto JSONL.
+        kind (str): Tipo de entidad.
+        on_error (callable, opcional): Función que recibe el número de
+        línea y el mensaje de cada registro rechazado.
+
+    Yields:
+        tuple: Pares (llave, registro) válidos.
+    """
+    validate = VALIDATORS[kind]
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield validate(json.loads(line))
+        except (ValueError, TypeError, AttributeError) as exception:
+            if on_error is not None:
+                on_error(number, str(exception))
+
+
+def import_records(store, kind, lines, batch_size=10000, on_error=None):
+    """
+    Importa registros JSONL al almacén en lotes.
+
+    Args:
+        store (StorageBackend): Almacén destino.
+        kind (str): Tipo de entidad.
+        lines (iterable): Líneas de texto JSONL.
+        batch_size (int, opcional): Registros por llamada a put_many.
+        on_error (callable, opcional): Función que recibe el número de
+        línea y el mensaje de cada registro rechazado.
+
+    Returns:
+        dict: Registros importados y rechazados, segundos transcurridos y
+        registros por segundo.
+    """
+    rejected = [0]
+
+    def reject(number, message):
+        rejected[0] += 1
+        if on_error is not None:
+            on_error(number, message)
+
+    records = read_records(lines, kind, reject)
+    imported = 0
+    start = time.perf_counter()
+    while True:
+        batch = list(islice(records, batch_size))
+        if not batch:
+            break
+        store.put_many(kind, batch)
+        imported += len(batch)
+    elapsed = time.perf_counter() - start
+    return {'imported': imported, 'rejected': rejected[0],
+            'seconds': elapsed,
+            'records_per_second': imported / elapsed if elapsed else 0.0}
+
+
+def export_records(store, kind, output):
+    """
+    Exporta los registros de un tipo de entidad como JSONL.
+
+    Args:
+        store (StorageBackend): Almacén origen.
+        kind (str): Tipo de entidad.
+        output (file): Archivo de texto donde se escriben las líneas.
+
+    Returns:
+        dict: Registros exportados, segundos transcurridos y registros
+        por segundo.
+    """
+    exported = 0
+    start = time.perf_counter()
+    for _, record in store.scan(kind):
+        output.write(json.dumps(record) + "\n")
+        exported += 1
+    elapsed = time.perf_counter() - start
+    return {'exported': exported, 'seconds': elapsed,
+            'records_per_second': exported / elapsed if elapsed else 0.0}
+
+
+def _print_rejected(number, message):
+    print(f"Línea {number}: {message}", file=sys.stderr)
+
+
+def _open_store(arguments):
+    if arguments.sqlite:
+        return SQLiteBackend(arguments.sqlite)
+    if arguments.log:
+        return LogStore(arguments.log)
+    if arguments.sharded:
+        return ShardedFileBackend(arguments.sharded)
+    return DEFAULT_BACKEND
+
+
+def main(argv=None):
+    """
+    Punto de entrada de la línea de comandos.
+    """
+    parser = argparse.ArgumentParser(
+        description="Importación y exportación masiva en JSONL.")
+    parser.add_argument('command', choices=('import', 'export'))
+    parser.add_argument('kind', choices=sorted(KINDS))
+    parser.add_argument('path', nargs='?',
+                        help="Archivo JSONL a importar.")
+    parser.add_argument('-o', '--output',
+                        help="Archivo destino de la exportación.")
+    parser.add_argument('--batch-size', type=int, default=10000)
+    parser.add_argument('--sqlite', help="Usar un almacén SQLite.")
+    parser.add_argument('--log', help="Usar un almacén LogStore.")
+    parser.add_argument('--sharded',
+                        help="Usar archivos JSON repartidos en "
+                             "subdirectorios.")
+    arguments = parser.parse_args(argv)
+    kind = KINDS[arguments.kind]
+    store = _open_store(arguments)
+    try:
+        if arguments.command == 'import':
+            if arguments.path is None:
+                parser.error("import requiere la ruta del archivo JSONL.")
+            with open(arguments.path, 'r', encoding='utf-8') as lines:
+                report = import_records(store, kind, lines,
+                                        arguments.batch_size,
+                                        _print_rejected)
+            print(f"{report['imported']} registros importados, "
+                  f"{report['rejected']} rechazados, "
+                  f"{report['records_per_second']:,.0f} registros/s.",
+                  file=sys.stderr)
+        elif arguments.output:
+            with open(arguments.output, 'w', encoding='utf-8') as output:
+                report = export_records(store, kind, output)
+        else:
+            report = export_records(store, kind, sys.stdout)
+        if arguments.command == 'export':
+            print(f"{report['exported']} registros exportados, "
+                  f"{report['records_per_second']:,.0f} registros/s.",
+                  file=sys.stderr)
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Este módulo define la clase CachedBackend, un caché LRU de lectura que se
+coloca delante de cualquier StorageBackend para evitar releer y volver a
+interpretar registros que se consultan repetidamente.
+"""
+import threading
+from collections import OrderedDict
+from storage import VERSION, StorageBackend, merge_patch
+
+
+class CachedBackend(StorageBackend):
+    """
+    Caché LRU acotado de registros sobre otro almacén.
+
+    Las escrituras y borrados pasan al almacén subyacente y actualizan el
+    caché en el mismo paso, por lo que las lecturas repetidas no vuelven a
+    tocar el almacén. Con ``validate=True`` cada acierto compara además la
+    marca del registro (``mtime`` del archivo o versión) para detectar
+    cambios hechos por otros procesos.
+
+    Pensado para registros planos como los de clientes: las copias que se
+    entregan son superficiales.
+
+    Attributes:
+        backend (StorageBackend): Almacén subyacente.
+        maxsize (int): Número máximo de registros en caché.
+        kinds (tuple): Tipos de entidad que se guardan en caché; el resto
+        pasa directo al almacén.
+        validate (bool): Si se valida la marca del registro en cada acierto.
+        hits (int): Lecturas resueltas desde el caché.
+        misses (int): Lecturas que tuvieron que ir al almacén.
+        evictions (int): Registros desalojados por falta de espacio.
+    """
+
+    def __init__(self, backend, maxsize=1024, kinds=('customer',),
+                 validate=False):
+        """
+        Inicializa el caché.
+
+        Args:
+            backend (StorageBackend): Almacén subyacente.
+            maxsize (int, opcional): Número máximo de registros.
+            kinds (tuple, opcional): Tipos de entidad a guardar en caché.
+            validate (bool, opcional): Validar la marca en cada acierto.
+        """
+        self.backend = backend
+        self.maxsize = maxsize
+        self.kinds = frozenset(kinds)
+        self.validate = validate
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def stats(self):
+        """
+        Devuelve los contadores del caché.
+
+        Returns:
+            dict: Aciertos, fallos, desalojos y tamaño actual.
+        """
+        return {'hits': self.hits, 'misses': self.misses,
+                'evictions': self.evictions, 'size': len(self._entries),
+                'maxsize': self.maxsize}
+
+    def clear(self):
+        """
+        Vacía el caché sin alterar el almacén.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def _remember(self, kind, key, record):
+        stamp = self.backend.stamp(kind, key) if self.validate else None
+        with self._lock:
+            self._entries[(kind, key)] = (dict(record), stamp)
+            self._entries.move_to_end((kind, key))
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def _lookup(self, kind, key):
+        with self._lock:
+            entry = self._entries.get((kind, key))
+            if entry is not None:
+                self._entries.move_to_end((kind, key))
+        if entry is not None and self.validate and \
+           entry[1] != self.backend.stamp(kind, key):
+            with self._lock:
+                self._entries.pop((kind, key), None)
+            entry = None
+        return entry
+
+    def put(self, kind, key, record):
+        self.backend.put(kind, key, record)
+        if kind in self.kinds:
+            self._remember(kind, key, record)
+
+    def put_many(self, kind, records):
+        records = list(records)
+        self.backend.put_many(kind, records)
+        if kind in self.kinds:
+            for key, record in records:
+                self._remember(kind, key, record)
+
+    def update(self, kind, key, changes):
+        self.backend.update(kind, key, changes)
+        with self._lock:
+            entry = self._entries.pop((kind, key), None)
+        if entry is not None:
+            self._remember(kind, key, merge_patch(dict(entry[0]), changes))
+
+    def compare_and_swap(self, kind, key, expected, changes,
+                         replace=False):
+        version = self.backend.compare_and_swap(kind, key, expected,
+                                                changes, replace)
+        with self._lock:
+            entry = self._entries.pop((kind, key), None)
+        if entry is not None:
+            record = dict(changes) if replace else \
+                merge_patch(dict(entry[0]), changes)
+            record[VERSION] = version
+            self._remember(kind, key, record)
+        return version
+
+    def get(self, kind, key):
+        if kind not in self.kinds:
+            return self.backend.get(kind, key)
+        entry = self._lookup(kind, key)
+        if entry is not None:
+            self.hits += 1
+            return dict(entry[0])
+        self.misses += 1
+        record = self.backend.get(kind, key)
+        self._remember(kind, key, record)
+        return dict(record)
+
+    def exists(self, kind, key):
+        if kind in self.kinds and self._lookup(kind, key) is not None:
+            return True
+        return self.backend.exists(kind, key)
+
+    def delete(self, kind, key):
+        with self._lock:
+            self._entries.pop((kind, key), None)
+        self.backend.delete(kind, key)
+
+    def keys(self, kind):
+        return self.backend.keys(kind)
+
+    def open_record(self, kind, key):
+        return self.backend.open_record(kind, key)
+
+    def stamp(self, kind, key):
+        return self.backend.stamp(kind, key)
+
+    def close(self):
+        self.clear()
+        self.backend.close()
@@ -0,0 +1,233 @@
+"""
+Este módulo define la clase ReservationStore, un almacén columnar en
+memoria para millones de reservas, y BookingView, una vista ligera sobre
+una de sus filas.
+
+Cada columna es un ``array`` de enteros, de modo que una reserva ocupa
+unos 17 bytes en lugar de un diccionario con tres cadenas.
+"""
+import threading
+from array import array
+
+ACTIVE = 1
+CANCELLED = 0
+
+
+class BookingView:
+    """
+    Vista de solo lectura de una fila del almacén columnar.
+    """
+
+    __slots__ = ('store', 'row')
+
+    def __init__(self, store, row):
+        """
+        Inicializa la vista.
+
+        Args:
+            store (ReservationStore): El almacén de la fila.
+            row (int): El número de fila.
+        """
+        self.store = store
+        self.row = row
+
+    @property
+    def room_number(self):
+        """
+        Número de la habitación reservada.
+        """
+        return self.store.rooms[self.store.room[self.row]]
+
+    @property
+    def guest_name(self):
+        """
+        Nombre del huésped.
+        """
+        return self.store.guests[self.store.guest[self.row]]
+
+    @property
+    def check_in(self):
+        """
+        Ordinal del día de entrada.
+        """
+        return self.store.check_in[self.row]
+
+    @property
+    def check_out(self):
+        """
+        Ordinal del día de salida.
+        """
+        return self.store.check_out[self.row]
+
+    @property
+    def active(self):
+        """
+        Indica si la reserva sigue vigente.
+        """
+        return self.store.status[self.row] == ACTIVE
+
+    def __repr__(self):
+        return (f"BookingView(room_number={self.room_number!r}, "
+                f"guest_name={self.guest_name!r}, check_in={self.check_in},"
+                f" check_out={self.check_out}, active={self.active})")
+
+
+class ReservationStore:
+    """
+    Almacén columnar de reservas.
+
+    Las columnas son paralelas: la fila ``i`` de cada una describe la
+    misma reserva. Los nombres de habitación y de huésped se guardan una
+    sola vez y las columnas solo llevan su índice. Las filas canceladas se
+    reutilizan en altas posteriores.
+
+    Attributes:
+        rooms (list): Números de habitación; ``room`` guarda su índice.
+        guests (list): Nombres de huésped; ``guest`` guarda su índice.
+        room (array): Índice de habitación por fila.
+        guest (array): Índice de huésped por fila.
+        check_in (array): Ordinal de entrada por fila.
+        check_out (array): Ordinal de salida por fila.
+        status (array): ACTIVE o CANCELLED por fila.
+    """
+
+    def __init__(self, rooms=()):
+        """
+        Inicializa un almacén vacío.
+
+        Args:
+            rooms (iterable, opcional): Números de habitación conocidos.
+        """
+        self.rooms = []
+        self._room_ids = {}
+        for room_number in rooms:
+            self.room_id(room_number)
+        self.guests = []
+        self._guest_ids = {}
+        self.room = array('i')
+        self.guest = array('i')
+        self.check_in = array('i')
+        self.check_out = array('i')
+        self.status = array('b')
+        self._free = array('i')
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.status) - len(self._free)
+
+    def room_id(self, room_number):
+        """
+        Devuelve el índice de una habitación, registrándola si es nueva.
+        """
+        room_id = self._room_ids.get(room_number)
+        if room_id is None:
+            room_id = self._room_ids[room_number] = len(self.rooms)
+            self.rooms.append(room_number)
+        return room_id
+
+    def guest_id(self, guest_name):
+        """
+        Devuelve el índice de un huésped, registrándolo si es nuevo.
+        """
+        guest_id = self._guest_ids.get(guest_name)
+        if guest_id is None:
+            guest_id = self._guest_ids[guest_name] = len(self.guests)
+            self.guests.append(guest_name)
+        return guest_id
+
+    def add(self, room_number, guest_name, check_in, check_out):
+        """
+        Registra una reserva.
+
+        Args:
+            room_number (str): El número de la habitación.
+            guest_name (str): El nombre del huésped.
+            check_in (int): Ordinal del día de entrada.
+            check_out (int): Ordinal del día de salida.
+
+        Returns:
+            int: El número de fila asignado.
+        """
+        columns = (self.room, self.guest, self.check_in, self.check_out,
+                   self.status)
+        with self._lock:
+            values = (self.room_id(room_number), self.guest_id(guest_name),
+                      check_in, check_out, ACTIVE)
+            if self._free:
+                row = self._free.pop()
+                for column, value in zip(columns, values):
+                    column[row] = value
+                return row
+            for column, value in zip(columns, values):
+                column.append(value)
+            return len(self.status) - 1
+
+    def columns(self):
+        """
+        Copia consistente de las columnas y tablas del almacén.
+
+        Returns:
+            dict: Llaves 'rooms', 'guests', 'room', 'guest', 'check_in',
+            'check_out', 'status' y 'free'.
+        """
+        with self._lock:
+            return {'rooms': list(self.rooms), 'guests': list(self.guests),
+                    'room': self.room[:], 'guest': self.guest[:],
+                    'check_in': self.check_in[:],
+                    'check_out': self.check_out[:],
+                    'status': self.status[:], 'free': self._free[:]}
+
+    @classmethod
+    def from_columns(cls, columns):
+        """
+        Reconstruye un almacén a partir del resultado de ``columns()``.
+        """
+        store = cls()
+        store.rooms = columns['rooms']
+        store.guests = columns['guests']
+        store._room_ids = {room: number
+                           for number, room in enumerate(store.rooms)}
+        store._guest_ids = {guest: number
+                            for number, guest in enumerate(store.guests)}
+        store.room = columns['room']
+        store.guest = columns['guest']
+        store.check_in = columns['check_in']
+        store.check_out = columns['check_out']
+        store.status = columns['status']
+        store._free = columns['free']
+        return store
+
+    def cancel(self, row):
+        """
+        Marca una reserva como cancelada y libera su fila.
+
+        Returns:
+            bool: True si la reserva estaba vigente.
+        """
+        with self._lock:
+            if self.status[row] != ACTIVE:
+                return False
+            self.status[row] = CANCELLED
+            self._free.append(row)
+            return True
+
+    def view(self, row):
+        """
+        Devuelve una vista de la fila.
+        """
+        return BookingView(self, row)
+
+    def active_rows(self):
+        """
+        Recorre los números de fila vigentes.
+        """
+        status = self.status
+        return (row for row in range(len(status)) if status[row] == ACTIVE)
+
+    def nbytes(self):
+        """
+        Bytes ocupados por las columnas.
+        """
+        return sum(column.itemsize * len(column)
+                   for column in (self.room, self.guest, self.check_in,
+                                  self.check_out, self.status, self._free))
@@ -3,8 +3,14 @@ Este módulo define la clase Customer para manejar las operaciones
 relacionadas con los clientes como la creación, eliminación,
 visualización y modificación de información del cliente.
 """
-import json
-import os
+from cache import CachedBackend
+from storage import DEFAULT_BACKEND, VERSION
+
+# Caché de clientes compartido por todas las instancias que usan el
+# almacén por omisión. Cada acierto compara la marca del archivo, así que
+# también se ven los cambios que otros escriben sin pasar por el caché.
+DEFAULT_STORE = CachedBackend(DEFAULT_BACKEND, maxsize=4096,
+                              validate=True)
 
 
 class Customer:
@@ -13,7 +19,8 @@ class Customer:
     los clientes como la creación, eliminación, visualización y modificación
     de información del cliente.
     """
-    def __init__(self, name, email, mobile_phone=None, address=None):
+    def __init__(self, name, email, mobile_phone=None, address=None,
+                 store=None):
         """
         Constructor de la clase Customer.
 
@@ -22,61 +29,87 @@ class Customer:
             email (str): Correo electrónico del cliente.
             mobile_phone (str, opcional): Número de teléfono móvil del cliente.
             address (str, opcional): Dirección del cliente.
+            store (StorageBackend, opcional): Almacén donde se persiste el
+            cliente. Si no se indica se usa un archivo JSON por cliente
+            con el caché compartido DEFAULT_STORE.
         """
 
         self.name = name
         self.email = email
         self.mobile_phone = mobile_phone
         self.address = address
+        self.store = DEFAULT_STORE if store is None else store
+        # Versión del registro con que se leyó o escribió por última vez;
+        # None si no se conoce.
+        self.version = None
 
-    def create_customer(self):
+    def validate(self):
         """
-        Crea un archivo JSON con la información del cliente.
+        Verifica que todos los campos del cliente estén presentes.
+
+        Raises:
+            ValueError: Si falta algún campo.
         """
         if not self.name or not self.email or not self.mobile_phone \
            or not self.address:
             raise ValueError("Todos los campos son obligatorios.")
 
-        customer_data = {
+    def to_dict(self):
+        """
+        Devuelve la información persistible del cliente.
+
+        Returns:
+            dict: Datos del cliente.
+        """
+        return {
             'name': self.name,
             'email': self.email,
             'mobile_phone': self.mobile_phone,
             'address': self.address
         }
-        with open(f"{self.name}_customer.json", 'w', encoding='utf-8') as file:
-            json.dump(customer_data, file)
+
+    def create_customer(self):
+        """
+        Guarda la información del cliente en el almacén.
+        """
+        self.validate()
+        self.version = self.store.put_versioned('customer', self.name,
+                                                self.to_dict())
 
     def delete_customer(self):
         """
-        Elimina el archivo JSON del cliente.
+        Elimina la información del cliente del almacén.
         """
         filename = f"{self.name}_customer.json"
 
-        if os.path.exists(filename):
-            os.remove(f"{self.name}_customer.json")
+        if self.store.exists('customer', self.name):
+            self.store.delete('customer', self.name)
         else:
             raise FileNotFoundError(f"{filename} not found.")
 
     def display_info(self):
         """
-        Muestra la información del cliente almacenada en el archivo JSON.
+        Muestra la información del cliente almacenada.
         """
         filename = f"{self.name}_customer.json"
-        if os.path.exists(filename):
-            with open(filename, 'r', encoding='utf-8') as file:
-                customer_data = json.load(file)
-                print("\tCustomer Information:")
-                print(f"\t\tName: {customer_data['name']}")
-                print(f"\t\tEmail: {customer_data['email']}")
-                print(f"\t\tMobile Phone: {customer_data['mobile_phone']}")
-                print(f"\t\tAddress: {customer_data['address']}")
+        if self.store.exists('customer', self.name):
+            customer_data = self.store.get('customer', self.name)
+            self.version = customer_data.get(VERSION, 0)
+            print("\tCustomer Information:")
+            print(f"\t\tName: {customer_data['name']}")
+            print(f"\t\tEmail: {customer_data['email']}")
+            print(f"\t\tMobile Phone: {customer_data['mobile_phone']}")
+            print(f"\t\tAddress: {customer_data['address']}")
         else:
             raise FileNotFoundError(f"{filename} not found.")
 
     def modify_info(self, name=None, email=None, mobile_phone=None,
                     address=None):
         """
-        Modifica la información del cliente en el archivo JSON.
+        Modifica la información del cliente en el almacén.
+
+        Si se conoce la versión con que se leyó el cliente, el cambio
+        solo se aplica si nadie más lo modificó desde entonces.
 
         Args:
             name (str, opcional): Nuevo nombre del cliente.
@@ -84,24 +117,18 @@ class Customer:
             mobile_phone (str, opcional): Nuevo número de teléfono móvil
             del cliente.
             address (str, opcional): Nueva dirección del cliente.
+
+        Raises:
+            ConflictError: Si el cliente guardado cambió desde que se
+            leyó.
         """
         if not name or not email or not mobile_phone or not address:
             raise ValueError("Todos los campos son obligatorios.")
 
-        filename = f"{self.name}_customer.json"
-        if os.path.exists(filename):
-            with open(filename, 'r+', encoding='utf-8') as file:
-                customer_data = json.load(file)
-                if name:
-                    customer_data['name'] = name
-                if email:
-                    customer_data['email'] = email
-                if mobile_phone:
-                    customer_data['mobile_phone'] = mobile_phone
-                if address:
-                    customer_data['address'] = address
-                file.seek(0)
-                json.dump(customer_data, file)
-                file.truncate()
-        else:
+        try:
+            self.version = self.store.compare_and_swap(
+                'customer', self.name, self.version,
+                {'name': name, 'email': email,
+                 'mobile_phone': mobile_phone, 'address': address})
+        except KeyError:
             print(f"Customer {self.name}_customer.json not found.")
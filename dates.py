@@ -0,0 +1,49 @@
+"""
+Este módulo convierte fechas 'YYYY-MM-DD' a ordinales de día enteros y
+viceversa. Las fechas se interpretan una sola vez en la frontera de la
+API; a partir de ahí Hotel y sus índices comparan enteros.
+"""
+from datetime import date
+from functools import lru_cache
+
+_DIGITS = frozenset("0123456789")
+
+
+@lru_cache(maxsize=8192)
+def parse_date(text):
+    """
+    Convierte una fecha ISO 'YYYY-MM-DD' a su ordinal de día.
+
+    Las fechas repetidas se resuelven desde un caché, ya que las reservas
+    de un hotel se concentran en pocos cientos de fechas distintas.
+
+    Args:
+        text (str): La fecha en formato 'YYYY-MM-DD'.
+
+    Returns:
+        int: El ordinal de la fecha (date.toordinal()).
+
+    Raises:
+        ValueError: Si el texto no es una fecha válida en ese formato.
+        TypeError: Si el valor no es una cadena.
+    """
+    if not isinstance(text, str):
+        raise TypeError(f"Se esperaba una fecha como texto: {text!r}")
+    if len(text) != 10 or text[4] != '-' or text[7] != '-' \
+       or not _DIGITS.issuperset(text[:4] + text[5:7] + text[8:]):
+        raise ValueError(f"Fecha inválida, se esperaba 'YYYY-MM-DD': "
+                         f"{text!r}")
+    return date(int(text[:4]), int(text[5:7]), int(text[8:])).toordinal()
+
+
+def format_date(ordinal):
+    """
+    Convierte un ordinal de día a su fecha 'YYYY-MM-DD'.
+
+    Args:
+        ordinal (int): El ordinal de la fecha.
+
+    Returns:
+        str: La fecha en formato ISO.
+    """
+    return date.fromordinal(ordinal).isoformat()
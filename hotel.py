@@ -3,41 +3,361 @@ Este módulo define la clase Hotel, que gestiona la información y operaciones
 relacionadas con un hotel, como crear, eliminar, modificar y mostrar
 información sobre el hotel, así como reservar y cancelar habitaciones.
 """
-import json
-import os
-from datetime import datetime
+import contextlib
+import threading
+import time
+import snapshot
+from availability import RoomSchedule
+from columnar import ReservationStore
+from dates import format_date, parse_date
+from inventory import ROOM_TYPE, RoomInventory
+from jsonstream import iter_grouped, read_members
+from occupancy import OccupancyCalendar
+from metrics import NULL_INSTRUMENTATION
+from storage import DEFAULT_BACKEND, VERSION
+from waitlist import Waitlist
+
+DEFAULT_ROOMS = ('101', '102', '103')
 
 
 class Hotel:
     """
     Clase para representar un hotel.
 
+    Es segura para usarse desde varios hilos: cada habitación pertenece a
+    una franja de candados, de modo que las reservas de habitaciones
+    distintas no compiten por un candado global.
+
     Attributes:
         name (str): El nombre del hotel.
         location (str): La ubicación del hotel.
         rooms (list): La lista de habitaciones disponibles en el hotel.
+        inventory (RoomInventory): Las habitaciones con sus atributos e
+        índices por atributo.
+        schedules (dict): Un diccionario que mapea el número de habitación
+        con su índice de estancias (RoomSchedule).
+        occupancy (OccupancyCalendar): Mapa de bits de habitaciones
+        ocupadas por noche.
+        bookings (ReservationStore): Almacén columnar con las reservas
+        vigentes; los índices de estancias guardan sus filas.
         reservations (dict): Un diccionario que mapea el número de
-        habitación con la información de reserva.
+        habitación con la lista de sus reservas ordenadas por fecha.
+        waitlist (Waitlist): Lista de espera del hotel, o None si no se
+        habilitó con enable_waitlist.
     """
 
-    def __init__(self, name, location, phone):
+    LOCK_STRIPES = 64
+    # Atributos que Hotel.load materializa en el primer acceso.
+    LAZY_ATTRIBUTES = frozenset(('rooms', 'inventory', 'schedules',
+                                 'occupancy', 'bookings'))
+
+    def __init__(self, name, location, phone, store=None, rooms=None,
+                 instrumentation=None):
         """
         Inicializa una instancia de la clase Hotel.
 
         Args:
             name (str): El nombre del hotel.
             location (str): La ubicación del hotel.
+            store (StorageBackend, opcional): Almacén donde se persiste el
+            hotel. Si no se indica se usa un archivo JSON por hotel.
+            rooms (list o dict, opcional): Números de habitación del
+            hotel, o un diccionario de número de habitación a sus
+            atributos (por ejemplo 'type', 'beds', 'floor' y
+            'accessible'). Por omisión '101', '102' y '103'.
+            instrumentation (Instrumentation, opcional): Destino de los
+            contadores, latencias y eventos. Por omisión no se registra
+            nada.
+        """
+        self._init_metadata(name, location, phone, store, instrumentation)
+        self.inventory = RoomInventory(DEFAULT_ROOMS if rooms is None
+                                       else rooms)
+        self.rooms = list(self.inventory)
+        self.schedules = {room: RoomSchedule() for room in self.rooms}
+        self.occupancy = OccupancyCalendar(self.rooms)
+        self.bookings = ReservationStore(self.rooms)
+
+    def _init_metadata(self, name, location, phone, store, instrumentation):
+        """
+        Inicializa los datos generales del hotel y sus candados.
         """
         self.name = name
         self.location = location
         self.phone = phone
-        self.rooms = ['101', '102', '103']
-        self.reservations = {}
+        self.store = DEFAULT_BACKEND if store is None else store
+        self.instrumentation = NULL_INSTRUMENTATION \
+            if instrumentation is None else instrumentation
+        self._room_locks = [threading.Lock()
+                            for _ in range(self.LOCK_STRIPES)]
+        self._source = None
+        self._window = None
+        self._load_lock = threading.Lock()
+        # Habitaciones cuyas reservas cambiaron desde el último guardado.
+        self._dirty_rooms = set()
+        self.waitlist = None
+        # Versión del registro guardado con que se leyó o escribió por
+        # última vez la información del hotel; None si no se conoce.
+        self.version = None
+
+    @classmethod
+    def load(cls, name, store=None, instrumentation=None, window=None):
+        """
+        Carga un hotel guardado con create_hotel.
+
+        Solo se leen de inmediato el nombre, la ubicación y el teléfono;
+        las habitaciones y las reservas se leen en el primer acceso. Con
+        almacenes de archivos JSON el documento se lee por bloques y se
+        detiene en cuanto se tienen los campos buscados, de modo que abrir
+        un hotel con millones de reservas no las decodifica.
+
+        Args:
+            name (str): El nombre con que se guardó el hotel.
+            store (StorageBackend, opcional): Almacén del hotel.
+            instrumentation (Instrumentation, opcional): Destino de la
+            instrumentación.
+            window (tuple, opcional): Fechas (desde, hasta). Si se indica,
+            solo se cargan las reservas que se traslapan con el rango y
+            las reservas nuevas deben caer dentro de él.
+
+        Returns:
+            Hotel: El hotel con sus habitaciones y reservas pendientes de
+            cargar.
+
+        Raises:
+            FileNotFoundError: Si el hotel no existe en el almacén.
+        """
+        hotel = cls.__new__(cls)
+        hotel._init_metadata(name, None, None, store, instrumentation)
+        hotel._source = name
+        if window is not None:
+            hotel._window = (parse_date(window[0]), parse_date(window[1]))
+        # Los registros sin versión son anteriores a ella; sus campos
+        # generales van antes de las habitaciones.
+        metadata = hotel._read_members((VERSION, 'name', 'location',
+                                        'phone'),
+                                       stop=('rooms', 'reservations'))
+        hotel.name = metadata.get('name', name)
+        hotel.location = metadata.get('location')
+        hotel.phone = metadata.get('phone')
+        hotel.version = metadata.get(VERSION, 0)
+        return hotel
+
+    def _read_members(self, names, stop=()):
+        """
+        Lee campos del registro guardado del hotel.
+        """
+        try:
+            file = self.store.open_record('hotel', self._source)
+            if file is None:
+                record = self.store.get('hotel', self._source)
+                return {name: record[name] for name in names
+                        if name in record}
+            with file:
+                return read_members(file, names, stop=stop)
+        except KeyError as exception:
+            raise FileNotFoundError(
+                f"Hotel {self._source}_hotel.json not found.") from exception
+
+    def _stored_reservations(self):
+        """
+        Recorre las reservas guardadas del hotel habitación por
+        habitación.
+
+        Yields:
+            tuple: Pares (habitación, lista de reservas).
+        """
+        try:
+            file = self.store.open_record('hotel', self._source)
+            if file is None:
+                record = self.store.get('hotel', self._source)
+        except KeyError as exception:
+            raise FileNotFoundError(
+                f"Hotel {self._source}_hotel.json not found.") from exception
+        if file is None:
+            yield from record.get('reservations', {}).items()
+            return
+        with file:
+            yield from iter_grouped(file, 'reservations')
+
+    def __getattr__(self, attribute):
+        # Solo se invoca cuando el atributo aún no existe: una vez cargado
+        # el estado, las rutas críticas no pagan nada extra.
+        if attribute not in self.LAZY_ATTRIBUTES or \
+                self.__dict__.get('_source') is None:
+            raise AttributeError(attribute)
+        self._materialize(rooms_only=attribute in ('rooms', 'inventory'))
+        return self.__dict__[attribute]
+
+    def _materialize(self, rooms_only=False):
+        """
+        Carga las habitaciones y, si se piden, las reservas guardadas.
+
+        Los índices se construyen completos antes de publicarse, de modo
+        que otros hilos nunca ven un estado a medio cargar.
+        """
+        with self._load_lock:
+            if 'rooms' not in self.__dict__:
+                members = self._read_members(('rooms', 'room_attributes'))
+                inventory = RoomInventory(members.get('rooms',
+                                                      DEFAULT_ROOMS))
+                for room, attributes in members.get('room_attributes',
+                                                    {}).items():
+                    if room in inventory:
+                        inventory.add(room, attributes)
+                self.inventory = inventory
+                self.rooms = list(inventory)
+            if rooms_only or 'bookings' in self.__dict__:
+                return
+            schedules = {room: RoomSchedule() for room in self.rooms}
+            occupancy = OccupancyCalendar(self.rooms)
+            bookings = ReservationStore(self.rooms)
+            window = self._window
+            for room, entries in self._stored_reservations():
+                schedule = schedules.get(room)
+                if schedule is None:
+                    continue
+                if isinstance(entries, dict):
+                    # Formato original: una sola reserva por habitación.
+                    entries = (entries,)
+                for entry in entries:
+                    check_in = parse_date(entry['check_in_date'])
+                    check_out = parse_date(entry['check_out_date'])
+                    if window is not None and (check_out <= window[0] or
+                                               check_in >= window[1]):
+                        continue
+                    row = bookings.add(room, entry['guest_name'],
+                                       check_in, check_out)
+                    schedule.add(check_in, check_out, row)
+                    occupancy.mark(room, check_in, check_out)
+            self.schedules = schedules
+            self.occupancy = occupancy
+            self.bookings = bookings
+
+    def _lock_for(self, room_number):
+        """
+        Devuelve el candado de la franja a la que pertenece la habitación.
+
+        Las reservas de habitaciones en franjas distintas se procesan en
+        paralelo; las de una misma habitación se serializan.
+        """
+        return self._room_locks[hash(room_number) % self.LOCK_STRIPES]
+
+    @property
+    def reservations(self):
+        """
+        Reservas vigentes agrupadas por número de habitación.
+
+        Returns:
+            dict: Número de habitación a lista de reservas ordenadas por
+            fecha de entrada.
+        """
+        return {room: self._room_reservations(room)
+                for room, schedule in self.schedules.items() if schedule}
+
+    def _room_reservations(self, room_number):
+        """
+        Reservas vigentes de una habitación en el formato persistido.
+        """
+        guests = self.bookings.guests
+        guest = self.bookings.guest
+        schedule = self.schedules[room_number]
+        return [{'guest_name': guests[guest[row]],
+                 'check_in_date': format_date(check_in),
+                 'check_out_date': format_date(check_out)}
+                for check_in, check_out, row
+                in zip(schedule.starts, schedule.ends, schedule.rows)]
+
+    def is_available(self, room_number, check_in_date, check_out_date):
+        """
+        Indica si una habitación está libre entre dos fechas.
+
+        Args:
+            room_number (str): El número de la habitación.
+            check_in_date (str): La fecha de entrada a la habitación.
+            check_out_date (str): La fecha de salida de la habitación.
+
+        Returns:
+            bool: True si la habitación existe y no tiene reservas que se
+            traslapen con el rango, False de lo contrario.
+        """
+        schedule = self.schedules.get(room_number)
+        if schedule is None:
+            return False
+        check_in = parse_date(check_in_date)
+        check_out = parse_date(check_out_date)
+        with self._lock_for(room_number):
+            return schedule.is_available(check_in, check_out)
+
+    def _free_mask(self, check_in_date, check_out_date, room_type,
+                   attributes):
+        """
+        Máscara de las habitaciones libres que cumplen los criterios.
+        """
+        check_in = parse_date(check_in_date)
+        check_out = parse_date(check_out_date)
+        if check_out <= check_in:
+            return 0
+        if room_type is not None:
+            attributes[ROOM_TYPE] = room_type
+        candidates = self.inventory.mask(**attributes) if attributes \
+            else None
+        if candidates == 0:
+            return 0
+        return self.occupancy.free_mask(check_in, check_out, candidates)
+
+    def find_free_rooms(self, check_in_date, check_out_date,
+                        room_type=None, **attributes):
+        """
+        Busca las habitaciones libres todas las noches de un rango.
+
+        Args:
+            check_in_date (str): La fecha de entrada.
+            check_out_date (str): La fecha de salida.
+            room_type (str, opcional): Solo habitaciones de este tipo.
+            **attributes: Otros atributos que deben cumplir, por ejemplo
+            ``accessible=True``.
+
+        Returns:
+            list: Números de habitación libres en el rango.
+        """
+        return self.occupancy.rooms_in(self._free_mask(
+            check_in_date, check_out_date, room_type, attributes))
+
+    def find_free_room(self, check_in_date, check_out_date,
+                       room_type=None, **attributes):
+        """
+        Busca una habitación cualquiera libre todas las noches de un
+        rango, sin construir la lista completa.
+
+        Args:
+            check_in_date (str): La fecha de entrada.
+            check_out_date (str): La fecha de salida.
+            room_type (str, opcional): Solo habitaciones de este tipo.
+            **attributes: Otros atributos que deben cumplir.
+
+        Returns:
+            str: El número de la habitación, o None si no hay ninguna.
+        """
+        mask = self._free_mask(check_in_date, check_out_date, room_type,
+                               attributes)
+        if not mask:
+            return None
+        return self.occupancy.rooms[(mask & -mask).bit_length() - 1]
 
     def create_hotel(self):
         """
-        Crea un archivo JSON con la información del hotel.
+        Guarda la información del hotel en el almacén.
+
+        Raises:
+            ValueError: Si el hotel se cargó con una ventana de fechas y
+            por lo tanto no tiene todas sus reservas.
         """
+        if self._window is not None:
+            raise ValueError("El hotel se cargó parcialmente; no se puede "
+                             "guardar.")
+        # Las habitaciones marcadas mientras se guarda quedan en el
+        # conjunto nuevo para el siguiente save.
+        dirty, self._dirty_rooms = self._dirty_rooms, set()
         hotel_data = {
             'name': self.name,
             'location': self.location,
@@ -45,16 +365,132 @@ class Hotel:
             'rooms': self.rooms,
             'reservations': self.reservations
         }
-        with open(f"{self.name}_hotel.json", 'w', encoding='utf-8') as file:
-            json.dump(hotel_data, file)
+        if self.inventory.attributes:
+            hotel_data['room_attributes'] = self.inventory.attributes
+        # Si el hotel ya existía, su versión sigue creciendo para que
+        # quien lo haya leído antes detecte el cambio.
+        try:
+            self.version = self.store.put_versioned('hotel', self.name,
+                                                    hotel_data)
+        except Exception:
+            # Sin escritura no hay nada guardado; los cambios siguen
+            # pendientes para reintentar.
+            self._dirty_rooms.update(dirty)
+            raise
+
+    def save(self):
+        """
+        Guarda solo las reservas de las habitaciones que cambiaron desde
+        el último guardado.
+
+        Si el hotel aún no existe en el almacén se guarda completo con
+        create_hotel.
+
+        Returns:
+            bool: True si había cambios por guardar.
+
+        Raises:
+            ValueError: Si el hotel se cargó con una ventana de fechas.
+        """
+        if self._window is not None:
+            raise ValueError("El hotel se cargó parcialmente; no se puede "
+                             "guardar.")
+        changes = {}
+        dirty = self._dirty_rooms
+        while dirty:
+            # set.pop es atómico, así que no se pierden las habitaciones
+            # que otros hilos marquen mientras se guarda.
+            room = dirty.pop()
+            with self._lock_for(room):
+                # Una habitación sin reservas se elimina del registro,
+                # igual que en la propiedad reservations.
+                changes[room] = self._room_reservations(room) or None
+        if not changes:
+            return False
+        try:
+            self.store.update('hotel', self.name,
+                              {'reservations': changes})
+        except KeyError:
+            self._dirty_rooms.update(changes)
+            self.create_hotel()
+        except Exception:
+            # Las habitaciones vuelven a quedar pendientes para que un
+            # save posterior las reintente.
+            self._dirty_rooms.update(changes)
+            raise
+        return True
+
+    def save_snapshot(self, path):
+        """
+        Guarda el estado completo del hotel, incluidos sus índices, en un
+        snapshot binario.
+
+        Args:
+            path (str): Ruta del archivo destino.
+        """
+        with contextlib.ExitStack() as stack:
+            # Con todos los candados tomados ninguna reserva queda a
+            # medias entre el calendario y el almacén columnar.
+            for lock in self._room_locks:
+                stack.enter_context(lock)
+            state = {
+                'name': self.name,
+                'location': self.location,
+                'phone': self.phone,
+                'rooms': list(self.rooms),
+                'bookings': self.bookings.columns(),
+                'schedules': {room: (schedule.starts[:], schedule.ends[:],
+                                     schedule.rows[:])
+                              for room, schedule in self.schedules.items()},
+                'nights': dict(self.occupancy.nights),
+                'room_attributes': {
+                    room: dict(attributes) for room, attributes
+                    in self.inventory.attributes.items()},
+            }
+        snapshot.write_hotel(path, state)
+
+    @classmethod
+    def load_snapshot(cls, path, store=None, instrumentation=None):
+        """
+        Restaura un hotel guardado con save_snapshot.
+
+        Los índices se restauran tal cual se guardaron, sin volver a
+        insertar las reservas una por una.
+
+        Args:
+            path (str): Ruta del snapshot.
+            store (StorageBackend, opcional): Almacén del hotel.
+            instrumentation (Instrumentation, opcional): Destino de la
+            instrumentación.
+
+        Returns:
+            Hotel: El hotel restaurado.
+
+        Raises:
+            ValueError: Si el archivo no es un snapshot de hotel válido.
+        """
+        state = snapshot.read_hotel(path)
+        attributes = state['room_attributes']
+        rooms = {room: attributes.get(room) for room in state['rooms']}
+        hotel = cls(state['name'], state['location'], state['phone'],
+                    store=store, rooms=rooms,
+                    instrumentation=instrumentation)
+        for room, (starts, ends, rows) in state['schedules'].items():
+            schedule = hotel.schedules[room]
+            schedule.starts = starts
+            schedule.ends = ends
+            schedule.rows = rows
+        hotel.occupancy.nights = state['nights']
+        hotel.bookings = ReservationStore.from_columns(state['bookings'])
+        return hotel
 
     def delete_hotel(self):
         """
-        Elimina el archivo JSON del hotel.
+        Elimina la información del hotel del almacén.
         """
         file_name = f"{self.name}_hotel.json"
-        if os.path.exists(file_name):
-            os.remove(file_name)
+        if self.store.exists('hotel', self.name):
+            self.store.delete('hotel', self.name)
         else:
             print(f"El archivo {file_name} no existe.")
 
@@ -69,87 +505,310 @@ class Hotel:
         for room in self.rooms:
             print(f"\t\t{room}")
 
-    def modify_hotel_info(self, name=None, location=None, phone=None):
+    def modify_hotel_info(self, name=None, location=None, phone=None,
+                          version=None):
         """
         Modifica la información del hotel.
 
+        Si se conoce la versión con que se leyó el hotel, el cambio solo
+        se aplica si nadie más lo modificó desde entonces.
+
         Args:
             name (str): El nuevo nombre del hotel (opcional).
             location (str): La nueva ubicación del hotel (opcional).
+            version (int): La versión que leyó quien pide el cambio
+            (opcional). Por omisión, la última que conoce la instancia.
+
+        Raises:
+            ConflictError: Si el hotel guardado cambió desde que se leyó;
+            en ese caso la instancia no se modifica.
         """
         if not name or not location or not phone:
             raise ValueError("Todos los campos son obligatorios.")
 
-        filename = f"{self.name}_hotel.json"
+        key = self.name
+        if version is None:
+            version = self.version
+        try:
+            self.version = self.store.compare_and_swap(
+                'hotel', key, version,
+                {'name': name, 'location': location, 'phone': phone})
+        except KeyError:
+            print(f"Hotel {key}_hotel.json not found.")
         self.name = name
         self.location = location
         self.phone = phone
 
-        if os.path.exists(filename):
-            with open(filename, 'r+', encoding='utf-8') as file:
-                hotel_data = json.load(file)
-                if name:
-                    hotel_data['name'] = name
-                if location:
-                    hotel_data['location'] = location
-                if phone:
-                    hotel_data['phone'] = phone
-                file.seek(0)
-                json.dump(hotel_data, file)
-                file.truncate()
+    def _book(self, room_number, guest_name, check_in_date, check_out_date):
+        """
+        Valida y registra una reserva sin escribir en consola, publicando
+        el resultado en la instrumentación del hotel.
+
+        Args:
+            room_number (str): El número de la habitación a reservar.
+            guest_name (str): El nombre del huésped que realiza la reserva.
+            check_in_date (str): La fecha de entrada a la habitación.
+            check_out_date (str): La fecha de salida de la habitación.
+
+        Returns:
+            str: None si la reserva se registró, o el motivo del rechazo:
+            'invalid_dates', 'unknown_room', 'room_unavailable' u
+            'outside_window'.
+        """
+        metrics = self.instrumentation
+        if not metrics.enabled:
+            return self._place(room_number, guest_name,
+                               check_in_date, check_out_date)
+        start = time.perf_counter()
+        reason = self._place(room_number, guest_name,
+                             check_in_date, check_out_date)
+        metrics.observe('reserve_seconds', time.perf_counter() - start)
+        if reason is None:
+            metrics.emit('booking_accepted', hotel=self.name,
+                         room_number=room_number, guest_name=guest_name,
+                         check_in_date=check_in_date,
+                         check_out_date=check_out_date)
         else:
-            print(f"Hotel {self.name}_hotel.json not found.")
+            metrics.emit('booking_rejected', hotel=self.name,
+                         room_number=room_number, guest_name=guest_name,
+                         check_in_date=check_in_date,
+                         check_out_date=check_out_date, reason=reason)
+        return reason
+
+    def _place(self, room_number, guest_name, check_in_date,
+               check_out_date):
+        """
+        Registra una reserva en el índice y el calendario de ocupación.
+
+        Returns:
+            str: None si la reserva se registró, o el motivo del rechazo.
+        """
+        try:
+            check_in = parse_date(check_in_date)
+            check_out = parse_date(check_out_date)
+        except (TypeError, ValueError):
+            return 'invalid_dates'
+        if check_out <= check_in:
+            return 'invalid_dates'
+        window = self._window
+        if window is not None and (check_in < window[0] or
+                                   check_out > window[1]):
+            return 'outside_window'
+        schedule = self.schedules.get(room_number)
+        if schedule is None:
+            return 'unknown_room'
+        with self._lock_for(room_number):
+            if not schedule.is_available(check_in, check_out):
+                return 'room_unavailable'
+            row = self.bookings.add(room_number, guest_name,
+                                    check_in, check_out)
+            schedule.add(check_in, check_out, row)
+            self.occupancy.mark(room_number, check_in, check_out)
+            self._dirty_rooms.add(room_number)
+        return None
 
     def reserve_room(self, room_number, guest_name,
-                     check_in_date, check_out_date):
+                     check_in_date, check_out_date, waitlist_tier=None):
         """
         Reserva una habitación en el hotel.
 
+        El resultado se publica como evento 'booking_accepted' o
+        'booking_rejected' en la instrumentación del hotel.
+
         Args:
             room_number (str): El número de la habitación a reservar.
             guest_name (str): El nombre del huésped que realiza la reserva.
             check_in_date (str): La fecha de entrada a la habitación.
             check_out_date (str): La fecha de salida de la habitación.
+            waitlist_tier (int, opcional): Si se indica, la lista de
+            espera está habilitada y la habitación está ocupada, la
+            solicitud entra a la lista de espera con ese nivel de
+            prioridad.
+
+        Returns:
+            bool: True si la habitación se reservó, False de lo contrario.
         """
-        if datetime.strptime(check_out_date, '%Y-%m-%d') <= \
-           datetime.strptime(check_in_date, '%Y-%m-%d'):
-            print(f"\tLas fechas de reservación del {check_in_date}"
-                  f" al {check_out_date} son incorrectas.")
-            return False
-        if room_number not in self.rooms:
-            print(f"No existe la habitación {room_number}.")
-            return False
-        if room_number in self.reservations:
-            print(f"\tLa habitación {room_number} ya está reservada.")
-            return False
-        self.reservations[room_number] = {
-            'guest_name': guest_name,
-            'check_in_date': check_in_date,
-            'check_out_date': check_out_date
-        }
-        print(f"\tSe ha reservado la habitación {room_number} "
-              f"para {guest_name} del {check_in_date} "
-              f"al {check_out_date}.")
+        reason = self._book(room_number, guest_name,
+                            check_in_date, check_out_date)
+        if reason == 'room_unavailable' and waitlist_tier is not None \
+                and self.waitlist is not None:
+            self.join_waitlist(room_number, guest_name, check_in_date,
+                               check_out_date, waitlist_tier)
+        return reason is None
 
-        return True
+    def enable_waitlist(self, on_promote=None):
+        """
+        Habilita la lista de espera del hotel.
+
+        Cada cancelación promueve de inmediato las solicitudes en espera
+        que caben en la estancia liberada.
+
+        Args:
+            on_promote (callable, opcional): Se llama con cada solicitud
+            promovida, un diccionario con las llaves 'waitlist_id',
+            'guest_name', 'room_number', 'check_in_date',
+            'check_out_date' y 'tier'.
+
+        Returns:
+            Waitlist: La lista de espera.
+        """
+        if self.waitlist is None:
+            self.waitlist = Waitlist(on_promote)
+        return self.waitlist
+
+    def join_waitlist(self, room_number, guest_name, check_in_date,
+                      check_out_date, tier=0):
+        """
+        Agrega una solicitud a la lista de espera.
+
+        Args:
+            room_number (str): La habitación pedida, o None para
+            cualquier habitación.
+            guest_name (str): El nombre del huésped.
+            check_in_date (str): La fecha de entrada.
+            check_out_date (str): La fecha de salida.
+            tier (int, opcional): Nivel de prioridad; los niveles menores
+            se atienden primero y, dentro de un nivel, por llegada.
+
+        Returns:
+            int: El identificador de la solicitud en espera.
+
+        Raises:
+            ValueError: Si la lista de espera no está habilitada, las
+            fechas son inválidas o la habitación no existe.
+        """
+        if self.waitlist is None:
+            raise ValueError("La lista de espera no está habilitada.")
+        check_in = parse_date(check_in_date)
+        check_out = parse_date(check_out_date)
+        if check_out <= check_in:
+            raise ValueError("Las fechas de reservación son incorrectas.")
+        if room_number is not None and room_number not in self.schedules:
+            raise ValueError(f"No existe la habitación {room_number}.")
+        return self.waitlist.add(guest_name, check_in, check_out,
+                                 room_number, tier)
 
-    def cancel_reservation(self, room_number):
+    def _guest_at(self, schedule, check_in):
+        """
+        Huésped de la estancia que inicia en ``check_in`` (o de la
+        primera estancia si es None), o None si no existe.
+        """
+        if check_in is None:
+            row = schedule.rows[0] if schedule.rows else None
+        else:
+            row = schedule.find(check_in)
+        if row is None:
+            return None
+        return self.bookings.view(row).guest_name
+
+    def _fill_from_waitlist(self, room_number, check_in, check_out):
+        """
+        Reserva, en orden de prioridad, las solicitudes en espera que
+        caben en una estancia recién liberada.
+        """
+        schedule = self.schedules[room_number]
+        while True:
+            entry = self.waitlist.pop_best(room_number, check_in,
+                                           check_out,
+                                           schedule.is_available)
+            if entry is None:
+                return
+            check_in_date = format_date(entry['check_in'])
+            check_out_date = format_date(entry['check_out'])
+            if self._book(room_number, entry['guest_name'], check_in_date,
+                          check_out_date) is not None:
+                # Otro hilo ocupó la habitación entre la consulta y la
+                # reserva: la solicitud conserva su lugar.
+                self.waitlist.restore(entry)
+                return
+            promoted = {'waitlist_id': entry['waitlist_id'],
+                        'guest_name': entry['guest_name'],
+                        'room_number': room_number,
+                        'check_in_date': check_in_date,
+                        'check_out_date': check_out_date,
+                        'tier': entry['tier']}
+            if self.instrumentation.enabled:
+                self.instrumentation.emit('waitlist_promoted',
+                                          hotel=self.name, **promoted)
+            if self.waitlist.on_promote is not None:
+                self.waitlist.on_promote(promoted)
+
+    def reserve_many(self, requests):
+        """
+        Reserva un lote de habitaciones en una sola pasada.
+
+        Cada solicitud se valida contra la disponibilidad que dejan las
+        solicitudes anteriores del mismo lote.
+
+        Args:
+            requests (iterable): Diccionarios con las llaves
+            'room_number', 'guest_name', 'check_in_date' y
+            'check_out_date'.
+
+        Returns:
+            list: Un diccionario por solicitud con las llaves 'accepted'
+            (bool) y 'reason' (None o el motivo del rechazo).
+        """
+        results = []
+        for request in requests:
+            reason = self._book(request.get('room_number'),
+                                request.get('guest_name'),
+                                request.get('check_in_date'),
+                                request.get('check_out_date'))
+            results.append({'accepted': reason is None, 'reason': reason})
+        return results
+
+    def cancel_reservation(self, room_number, check_in_date=None,
+                           guest_name=None):
         """
         Cancela una reserva existente.
 
+        El resultado se publica como evento 'booking_cancelled' o
+        'cancellation_rejected' en la instrumentación del hotel.
+
         Args:
             room_number (str): El número de la habitación de la reserva
             que se desea cancelar.
+            check_in_date (str, opcional): La fecha de entrada de la
+            reserva. Si no se indica se cancela la primera reserva de la
+            habitación.
+            guest_name (str, opcional): Si se indica, solo se cancela la
+            reserva si pertenece a este huésped.
 
         Returns:
             bool: True si la reserva fue cancelada exitosamente,
             False de lo contrario.
         """
-        print(f"Cancelando reserva {room_number}")
-        if len(self.reservations) == 0 or not self.reservations[room_number]:
-            print(f"No existe una reserva para la habitación {room_number}.")
-            return False
-        del self.reservations[room_number]
-        print(f"La reserva para la habitación {room_number} "
-              "ha sido cancelada.")
-        return True
+        metrics = self.instrumentation
+        start = time.perf_counter() if metrics.enabled else 0.0
+        schedule = self.schedules.get(room_number)
+        check_in = None
+        if check_in_date is not None:
+            check_in = parse_date(check_in_date)
+        booking = None
+        if schedule is not None:
+            with self._lock_for(room_number):
+                if guest_name is None or self._guest_at(
+                        schedule, check_in) == guest_name:
+                    booking = schedule.remove(check_in)
+                if booking is not None:
+                    self.bookings.cancel(booking[2])
+                    self.occupancy.unmark(room_number, booking[0],
+                                          booking[1])
+                    self._dirty_rooms.add(room_number)
+        if metrics.enabled:
+            metrics.observe('cancel_seconds', time.perf_counter() - start)
+            if booking is None:
+                metrics.emit('cancellation_rejected', hotel=self.name,
+                             room_number=room_number,
+                             check_in_date=check_in_date)
+            else:
+                metrics.emit('booking_cancelled', hotel=self.name,
+                             room_number=room_number,
+                             guest_name=self.bookings.view(
+                                 booking[2]).guest_name,
+                             check_in_date=format_date(booking[0]),
+                             check_out_date=format_date(booking[1]))
+        if booking is not None and self.waitlist is not None:
+            self._fill_from_waitlist(room_number, booking[0], booking[1])
+        return booking is not None
@@ -0,0 +1,197 @@
+"""
+Este módulo genera identificadores compactos ordenables por tiempo, al
+estilo de ULID, para que las reservas puedan recorrerse por fecha de
+creación con un recorrido ordenado de llaves.
+
+Un identificador es un entero de 128 bits:
+
+    milisegundos Unix (48) | nodo (16) | secuencia (64)
+
+y su forma de texto son 26 caracteres en base32 de Crockford, aptos para
+nombres de archivo. El orden de los textos coincide con el de los enteros
+y por lo tanto con el del momento de creación.
+"""
+import itertools
+import os
+import time
+
+ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+LENGTH = 26
+_VALUES = {character: value for value, character in enumerate(ALPHABET)}
+# Cada par de caracteres codifica 10 bits.
+_PAIRS = tuple(first + second for first in ALPHABET for second in ALPHABET)
+_NODE_BITS = 16
+_SEQUENCE_BITS = 64
+_TIME_SHIFT = _NODE_BITS + _SEQUENCE_BITS
+_SEQUENCE_MASK = (1 << _SEQUENCE_BITS) - 1
+_LOW_MASK = (1 << _TIME_SHIFT) - 1
+_HALF_MASK = (1 << 40) - 1
+
+
+def _encode_time(millis, pairs=_PAIRS):
+    # Los primeros 10 caracteres: 2 bits en cero y los 48 del tiempo.
+    return (pairs[millis >> 40] + pairs[(millis >> 30) & 1023] +
+            pairs[(millis >> 20) & 1023] + pairs[(millis >> 10) & 1023] +
+            pairs[millis & 1023])
+
+
+def _encode_low(low, pairs=_PAIRS):
+    # Los últimos 16 caracteres: nodo y secuencia, en dos mitades de 40
+    # bits para operar con enteros pequeños.
+    high, low = low >> 40, low & _HALF_MASK
+    return (pairs[high >> 30] + pairs[(high >> 20) & 1023] +
+            pairs[(high >> 10) & 1023] + pairs[high & 1023] +
+            pairs[low >> 30] + pairs[(low >> 20) & 1023] +
+            pairs[(low >> 10) & 1023] + pairs[low & 1023])
+
+
+def encode(value):
+    """
+    Convierte un identificador entero a su forma de texto.
+
+    Args:
+        value (int): Entero de 128 bits.
+
+    Returns:
+        str: Los 26 caracteres en base32 de Crockford.
+    """
+    return _encode_time(value >> _TIME_SHIFT) + \
+        _encode_low(value & _LOW_MASK)
+
+
+def decode(text):
+    """
+    Convierte la forma de texto de un identificador a entero.
+
+    Raises:
+        ValueError: Si el texto no es un identificador válido.
+    """
+    if len(text) != LENGTH:
+        raise ValueError(f"Identificador inválido: {text!r}")
+    value = 0
+    try:
+        for character in text.upper():
+            value = value << 5 | _VALUES[character]
+    except KeyError as exception:
+        raise ValueError(f"Identificador inválido: {text!r}") \
+            from exception
+    if value >> 128:
+        raise ValueError(f"Identificador inválido: {text!r}")
+    return value
+
+
+def _millis(moment):
+    # Acepta segundos Unix o cualquier objeto con timestamp(), como
+    # datetime.
+    if hasattr(moment, 'timestamp'):
+        moment = moment.timestamp()
+    return int(moment * 1000)
+
+
+def timestamp(identifier):
+    """
+    Momento de creación de un identificador.
+
+    Args:
+        identifier (str o int): El identificador.
+
+    Returns:
+        float: Segundos Unix.
+    """
+    if isinstance(identifier, str):
+        identifier = decode(identifier)
+    return (identifier >> _TIME_SHIFT) / 1000
+
+
+def bounds(start, end):
+    """
+    Llaves que delimitan los identificadores creados en un intervalo.
+
+    Args:
+        start (float o datetime): Inicio del intervalo.
+        end (float o datetime): Fin del intervalo, excluido.
+
+    Returns:
+        tuple: (menor, mayor) en forma de texto; un identificador creado
+        en [start, end) cumple ``menor <= id < mayor``.
+    """
+    return (encode(_millis(start) << _TIME_SHIFT),
+            encode(_millis(end) << _TIME_SHIFT))
+
+
+class IdGenerator:
+    """
+    Generador de identificadores ordenables por tiempo.
+
+    No usa candados: la secuencia es un ``itertools.count``, cuyo avance
+    es atómico en CPython, y el nodo distingue a los procesos. Dentro de
+    un proceso los identificadores son crecientes aunque el reloj
+    retroceda.
+
+    Attributes:
+        node (int): Número de nodo de 16 bits del proceso.
+    """
+
+    def __init__(self, node=None):
+        """
+        Inicializa el generador.
+
+        Args:
+            node (int, opcional): Número de nodo; por omisión se deriva
+            del pid y de bits aleatorios, y se renueva al hacer fork.
+        """
+        self._fixed_node = node
+        self._reset()
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self):
+        if self._fixed_node is None:
+            self.node = (os.getpid() ^ int.from_bytes(os.urandom(2),
+                                                      'big')) & 0xFFFF
+        else:
+            self.node = self._fixed_node & 0xFFFF
+        # Un inicio aleatorio hace improbable que dos procesos con el
+        # mismo nodo repitan una secuencia en el mismo milisegundo.
+        self._sequence = itertools.count(
+            int.from_bytes(os.urandom(8), 'big') >> 2)
+        self._last = 0
+        self._prefix = (None, "")
+
+    def next_int(self):
+        """
+        Genera un identificador entero.
+        """
+        now, low = self._next_parts()
+        return now << _TIME_SHIFT | low
+
+    def _next_parts(self):
+        sequence = next(self._sequence) & _SEQUENCE_MASK
+        now = time.time_ns() // 1_000_000
+        if now < self._last:
+            now = self._last
+        else:
+            self._last = now
+        return now, self.node << _SEQUENCE_BITS | sequence
+
+    def next(self):
+        """
+        Genera un identificador en forma de texto.
+        """
+        now, low = self._next_parts()
+        # El prefijo de tiempo solo cambia una vez por milisegundo.
+        prefix = self._prefix
+        if prefix[0] != now:
+            prefix = self._prefix = (now, _encode_time(now))
+        return prefix[1] + _encode_low(low)
+
+
+DEFAULT_GENERATOR = IdGenerator()
+
+
+def new_id():
+    """
+    Genera un identificador en forma de texto con el generador del
+    proceso.
+    """
+    return DEFAULT_GENERATOR.next()
@@ -0,0 +1,223 @@
+"""
+Este módulo define la clase ReservationIndex, un conjunto de índices
+secundarios en memoria que permiten encontrar reservas por huésped,
+correo electrónico, hotel, fecha de entrada y momento de creación sin
+recorrer el almacén.
+"""
+import threading
+from bisect import bisect_left, insort
+import ids
+from dates import format_date, parse_date
+
+
+class ReservationIndex:
+    """
+    Índices secundarios de reservas que se actualizan de forma
+    incremental al crear y cancelar reservas.
+
+    Attributes:
+        by_guest (dict): Nombre del huésped a ids de reserva.
+        by_email (dict): Correo del huésped a ids de reserva.
+        by_hotel (dict): Nombre del hotel a ids de reserva.
+        by_check_in (dict): Ordinal de entrada a ids de reserva.
+        check_in_days (list): Ordinales de entrada distintos, ordenados.
+        created (list): Ids ordenables por tiempo (ver ids), ordenados;
+        los ids con otro formato no se incluyen.
+    """
+
+    def __init__(self):
+        """
+        Inicializa índices vacíos.
+        """
+        self.by_guest = {}
+        self.by_email = {}
+        self.by_hotel = {}
+        self.by_check_in = {}
+        self.check_in_days = []
+        self.created = []
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def _link(index, key, reservation_id):
+        members = index.get(key)
+        if members is None:
+            members = index[key] = set()
+        members.add(reservation_id)
+
+    @staticmethod
+    def _unlink(index, key, reservation_id):
+        members = index.get(key)
+        if members is not None:
+            members.discard(reservation_id)
+            if not members:
+                del index[key]
+
+    @staticmethod
+    def _entry(record):
+        return (record.get('customer_name'), record.get('customer_email'),
+                record.get('hotel_name'), parse_date(record['check_in_date']),
+                record.get('room_number'), record.get('check_out_date'))
+
+    def add(self, record):
+        """
+        Indexa una reserva.
+
+        Args:
+            record (dict): Datos de la reserva como los persiste
+            Reservation.to_dict.
+        """
+        reservation_id = record['reservation_id']
+        entry = self._entry(record)
+        with self._lock:
+            if reservation_id in self._entries:
+                self._remove(reservation_id)
+            self._entries[reservation_id] = entry
+            guest, email, hotel, check_in = entry[:4]
+            self._link(self.by_guest, guest, reservation_id)
+            self._link(self.by_email, email, reservation_id)
+            self._link(self.by_hotel, hotel, reservation_id)
+            if check_in not in self.by_check_in:
+                insort(self.check_in_days, check_in)
+            self._link(self.by_check_in, check_in, reservation_id)
+            if len(reservation_id) == ids.LENGTH:
+                # Los ids nuevos son los mayores: insort los agrega al
+                # final.
+                insort(self.created, reservation_id)
+
+    def locate(self, reservation_id):
+        """
+        Ubica una reserva indexada.
+
+        Returns:
+            dict: Las llaves 'hotel_name', 'room_number', 'guest_name',
+            'check_in_date' y 'check_out_date', o None si la reserva no
+            está indexada.
+        """
+        entry = self._entries.get(reservation_id)
+        if entry is None:
+            return None
+        guest, _, hotel, check_in, room, check_out = entry
+        return {'hotel_name': hotel, 'room_number': room,
+                'guest_name': guest, 'check_in_date': format_date(check_in),
+                'check_out_date': check_out}
+
+    def remove(self, reservation_id):
+        """
+        Quita una reserva de los índices.
+
+        Returns:
+            bool: True si la reserva estaba indexada.
+        """
+        with self._lock:
+            return self._remove(reservation_id)
+
+    def _remove(self, reservation_id):
+        entry = self._entries.pop(reservation_id, None)
+        if entry is None:
+            return False
+        guest, email, hotel, check_in = entry[:4]
+        self._unlink(self.by_guest, guest, reservation_id)
+        self._unlink(self.by_email, email, reservation_id)
+        self._unlink(self.by_hotel, hotel, reservation_id)
+        self._unlink(self.by_check_in, check_in, reservation_id)
+        if check_in not in self.by_check_in:
+            del self.check_in_days[bisect_left(self.check_in_days,
+                                               check_in)]
+        if len(reservation_id) == ids.LENGTH:
+            position = bisect_left(self.created, reservation_id)
+            if position < len(self.created) and \
+                    self.created[position] == reservation_id:
+                del self.created[position]
+        return True
+
+    def rebuild(self, store):
+        """
+        Reconstruye los índices a partir de las reservas del almacén.
+
+        Args:
+            store (StorageBackend): Almacén con registros 'reservation'.
+        """
+        # Los índices nuevos se arman aparte y se intercambian de una vez
+        # bajo el mismo candado, así que find nunca ve uno a medias.
+        entries = {}
+        for _, record in store.scan('reservation'):
+            entries[record['reservation_id']] = self._entry(record)
+        indexes = ({}, {}, {}, {})
+        for reservation_id, entry in entries.items():
+            for index, key in zip(indexes, entry[:4]):
+                self._link(index, key, reservation_id)
+        with self._lock:
+            (self.by_guest, self.by_email, self.by_hotel,
+             self.by_check_in) = indexes
+            self.check_in_days = sorted(self.by_check_in)
+            self.created = sorted(reservation_id for reservation_id in entries
+                                  if len(reservation_id) == ids.LENGTH)
+            self._entries = entries
+
+    def _by_dates(self, date_range):
+        start, end = (parse_date(value) for value in date_range)
+        days = self.check_in_days
+        found = set()
+        for position in range(bisect_left(days, start),
+                              bisect_left(days, end)):
+            found.update(self.by_check_in[days[position]])
+        return found
+
+    def created_between(self, start, end):
+        """
+        Lista las reservas creadas en un intervalo, en orden de creación.
+
+        Args:
+            start (float o datetime): Inicio del intervalo.
+            end (float o datetime): Fin del intervalo, excluido.
+
+        Returns:
+            list: Ids de las reservas.
+        """
+        low, high = ids.bounds(start, end)
+        with self._lock:
+            created = self.created
+            return created[bisect_left(created, low):
+                           bisect_left(created, high)]
+
+    def find(self, customer=None, email=None, hotel=None, date_range=None,
+             created=None):
+        """
+        Busca reservas que cumplan todos los criterios indicados.
+
+        Args:
+            customer (str, opcional): Nombre del huésped.
+            email (str, opcional): Correo del huésped.
+            hotel (str, opcional): Nombre del hotel.
+            date_range (tuple, opcional): Fechas (desde, hasta) en formato
+            'YYYY-MM-DD'; se incluyen las reservas cuya entrada cae en el
+            intervalo semiabierto [desde, hasta).
+            created (tuple, opcional): Momentos (desde, hasta) en
+            segundos Unix o datetime; se incluyen las reservas creadas en
+            [desde, hasta).
+
+        Returns:
+            set: Ids de las reservas encontradas.
+        """
+        with self._lock:
+            candidates = []
+            for index, key in ((self.by_guest, customer),
+                               (self.by_email, email),
+                               (self.by_hotel, hotel)):
+                if key is not None:
+                    candidates.append(index.get(key, set()))
+            if date_range is not None:
+                candidates.append(self._by_dates(date_range))
+            if created is not None:
+                low, high = ids.bounds(*created)
+                candidates.append(set(self.created[
+                    bisect_left(self.created, low):
+                    bisect_left(self.created, high)]))
+            if not candidates:
+                return set(self._entries)
+            candidates.sort(key=len)
+            return candidates[0].intersection(*candidates[1:])
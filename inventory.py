@@ -0,0 +1,133 @@
+"""
+Este módulo define la clase RoomInventory, el inventario de habitaciones
+de un hotel con sus atributos (tipo, camas, piso, accesibilidad) e
+índices por atributo expresados como máscaras de bits compatibles con
+OccupancyCalendar.
+"""
+
+ROOM_TYPE = 'type'
+
+
+class RoomInventory:
+    """
+    Inventario de habitaciones con índices por atributo.
+
+    Cada habitación ocupa un bit, en el mismo orden que en el calendario
+    de ocupación del hotel. Por cada par (atributo, valor) se guarda la
+    máscara de las habitaciones que lo tienen, de modo que combinar un
+    filtro con la disponibilidad es un AND de enteros y no un recorrido
+    de las habitaciones.
+
+    Attributes:
+        rooms (list): Números de habitación en el orden de sus bits.
+        positions (dict): Número de habitación a su bit.
+        attributes (dict): Número de habitación a sus atributos.
+    """
+
+    def __init__(self, rooms=()):
+        """
+        Inicializa el inventario.
+
+        Args:
+            rooms (iterable o dict, opcional): Números de habitación, o
+            un diccionario de número de habitación a sus atributos.
+        """
+        self.rooms = []
+        self.positions = {}
+        self.attributes = {}
+        self._indexes = {}
+        details = rooms if isinstance(rooms, dict) else {}
+        for room_number in rooms:
+            self.add(room_number, details.get(room_number))
+
+    def __contains__(self, room_number):
+        return room_number in self.positions
+
+    def __len__(self):
+        return len(self.rooms)
+
+    def __iter__(self):
+        return iter(self.rooms)
+
+    def add(self, room_number, attributes=None):
+        """
+        Agrega una habitación, o actualiza sus atributos si ya existe.
+
+        Args:
+            room_number (str): El número de la habitación.
+            attributes (dict, opcional): Atributos con valores escalares,
+            por ejemplo ``{'type': 'king', 'beds': 1, 'floor': 3,
+            'accessible': True}``.
+
+        Returns:
+            int: El bit de la habitación.
+        """
+        position = self.positions.get(room_number)
+        if position is None:
+            position = self.positions[room_number] = len(self.rooms)
+            self.rooms.append(room_number)
+        bit = 1 << position
+        for item in self.attributes.pop(room_number, {}).items():
+            self._indexes[item] &= ~bit
+            if not self._indexes[item]:
+                del self._indexes[item]
+        if attributes:
+            self.attributes[room_number] = dict(attributes)
+            for item in attributes.items():
+                self._indexes[item] = self._indexes.get(item, 0) | bit
+        return position
+
+    def get(self, room_number):
+        """
+        Devuelve los atributos de una habitación.
+
+        Returns:
+            dict: Los atributos, vacío si la habitación no tiene.
+        """
+        return dict(self.attributes.get(room_number, {}))
+
+    def values(self, name=ROOM_TYPE):
+        """
+        Devuelve los valores distintos de un atributo.
+
+        Args:
+            name (str, opcional): El atributo; por omisión el tipo.
+
+        Returns:
+            set: Los valores presentes en el inventario.
+        """
+        return {value for attribute, value in self._indexes
+                if attribute == name}
+
+    def mask(self, **criteria):
+        """
+        Calcula la máscara de las habitaciones que cumplen los criterios.
+
+        Args:
+            **criteria: Pares atributo=valor que deben cumplirse todos.
+
+        Returns:
+            int: Máscara con un bit por habitación que los cumple; sin
+            criterios, todas las habitaciones.
+        """
+        mask = (1 << len(self.rooms)) - 1
+        for item in criteria.items():
+            mask &= self._indexes.get(item, 0)
+            if not mask:
+                break
+        return mask
+
+    def find(self, **criteria):
+        """
+        Lista las habitaciones que cumplen los criterios.
+
+        Returns:
+            list: Números de habitación en el orden del inventario.
+        """
+        rooms = []
+        mask = self.mask(**criteria)
+        while mask:
+            low = mask & -mask
+            rooms.append(self.rooms[low.bit_length() - 1])
+            mask ^= low
+        return rooms
@@ -0,0 +1,386 @@
+"""
+Este módulo define la clase Journal, una bitácora de escritura anticipada
+con confirmación en grupo, y JournaledBackend, que la coloca delante de
+cualquier StorageBackend para que ninguna modificación confirmada se
+pierda si el proceso termina a media escritura.
+
+Cada modificación se anexa a la bitácora y se sincroniza con ``fsync``
+antes de aplicarse al almacén; los escritores concurrentes comparten una
+misma sincronización. Al abrir el almacén se reaplican las entradas de la
+bitácora, lo que repara los registros que quedaron a medias.
+"""
+import contextlib
+import json
+import os
+import threading
+from storage import VERSION, StorageBackend, versioned_patch
+
+
+class Journal:
+    """
+    Bitácora de solo anexado con confirmación en grupo.
+
+    El primer escritor que encuentra la bitácora libre se vuelve líder:
+    escribe de una vez todas las entradas en espera y hace un solo
+    ``fsync``; los demás esperan a que su entrada quede cubierta.
+
+    Attributes:
+        path (str): Ruta del archivo de la bitácora.
+        sync (bool): Si se llama a ``fsync`` en cada confirmación.
+        commits (int): Confirmaciones realizadas (una por ``fsync``).
+        entries (int): Entradas confirmadas.
+    """
+
+    def __init__(self, path, sync=True):
+        """
+        Abre la bitácora, descartando una última línea incompleta.
+
+        Args:
+            path (str): Ruta del archivo de la bitácora.
+            sync (bool, opcional): Llamar a ``fsync`` en cada
+            confirmación. Sin él la bitácora protege contra caídas del
+            proceso pero no del sistema.
+        """
+        self.path = path
+        self.sync = sync
+        self.commits = 0
+        self.entries = 0
+        self._queue = []
+        self._lock = threading.Lock()
+        self._committed = threading.Condition(self._lock)
+        self._syncing = False
+        self._error = None
+        self._recovered = list(self._read_valid())
+        self._sequence = self._recovered[-1]['seq'] if self._recovered \
+            else 0
+        self._durable = self._sequence
+        # El archivo queda abierto hasta close para anexar cada grupo.
+        # pylint: disable-next=consider-using-with
+        self._file = open(path, 'ab')
+
+    def _read_valid(self):
+        """
+        Lee las entradas completas y trunca lo que quedó a medias.
+        """
+        if not os.path.exists(self.path):
+            return
+        valid = 0
+        with open(self.path, 'r+b') as file:
+            for line in file:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break
+                valid += len(line)
+                yield entry
+            file.truncate(valid)
+
+    def recovered(self):
+        """
+        Devuelve las entradas que había en la bitácora al abrirla.
+        """
+        return self._recovered
+
+    def append(self, entry):
+        """
+        Anexa una entrada y espera a que sea durable.
+
+        Args:
+            entry (dict): Entrada serializable a JSON; se le agrega su
+            número de secuencia en la llave 'seq'.
+
+        Returns:
+            int: El número de secuencia de la entrada.
+
+        Raises:
+            OSError: Si la bitácora no pudo escribirse; a partir de ese
+            momento la bitácora rechaza nuevas entradas.
+        """
+        with self._lock:
+            if self._error is not None:
+                raise OSError("La bitácora quedó inservible.") \
+                    from self._error
+            self._sequence += 1
+            sequence = entry['seq'] = self._sequence
+            self._queue.append((json.dumps(entry) + "\n").encode('utf-8'))
+            while self._durable < sequence:
+                if self._error is not None:
+                    raise OSError("La bitácora quedó inservible.") \
+                        from self._error
+                if self._syncing:
+                    self._committed.wait()
+                    continue
+                self._commit()
+            return sequence
+
+    def _commit(self):
+        """
+        Escribe y sincroniza las entradas en espera como líder del grupo.
+        Se llama con el candado tomado y lo libera durante la escritura.
+        """
+        batch, self._queue = self._queue, []
+        last = self._sequence
+        self._syncing = True
+        self._lock.release()
+        try:
+            self._file.write(b"".join(batch))
+            self._file.flush()
+            if self.sync:
+                os.fsync(self._file.fileno())
+        except OSError as exception:
+            # Tras un fallo de fsync no se sabe qué llegó al disco: la
+            # bitácora deja de aceptar escrituras.
+            self._error = exception
+            raise
+        finally:
+            # El candado es del with de append: se le devuelve tomado
+            # aunque la escritura falle. Los hilos avisados no corren
+            # hasta que append lo suelte.
+            # pylint: disable-next=consider-using-with
+            self._lock.acquire()
+            self._syncing = False
+            self._committed.notify_all()
+        self._durable = last
+        self.commits += 1
+        self.entries += len(batch)
+
+    def truncate(self):
+        """
+        Vacía la bitácora. Solo debe llamarse cuando todas sus entradas
+        ya son durables en el almacén.
+        """
+        with self._lock:
+            while self._syncing:
+                self._committed.wait()
+            self._file.truncate(0)
+            self._file.seek(0)
+            self._file.flush()
+            if self.sync:
+                os.fsync(self._file.fileno())
+            self._recovered = []
+
+    def size(self):
+        """
+        Tamaño en bytes de la bitácora.
+        """
+        with self._lock:
+            return self._file.tell()
+
+    def close(self):
+        """
+        Cierra el archivo de la bitácora.
+        """
+        with self._lock:
+            self._file.close()
+
+
+class JournaledBackend(StorageBackend):
+    """
+    Almacén que registra cada modificación en una bitácora antes de
+    aplicarla a otro almacén.
+
+    Las escrituras a un mismo registro se serializan para que el orden de
+    la bitácora coincida con el orden en que se aplican; las de registros
+    distintos comparten las confirmaciones en grupo.
+
+    Attributes:
+        backend (StorageBackend): Almacén subyacente.
+        journal (Journal): La bitácora de escritura anticipada.
+        checkpoint_size (int): Tamaño de la bitácora en bytes a partir
+        del cual se hace un punto de control.
+        replayed (int): Entradas reaplicadas al abrir el almacén.
+    """
+
+    LOCK_STRIPES = 256
+
+    def __init__(self, backend, path, sync=True,
+                 checkpoint_size=64 * 1024 * 1024):
+        """
+        Abre la bitácora y reaplica sus entradas sobre el almacén.
+
+        Args:
+            backend (StorageBackend): Almacén subyacente.
+            path (str): Ruta del archivo de la bitácora.
+            sync (bool, opcional): Llamar a ``fsync`` al confirmar.
+            checkpoint_size (int, opcional): Tamaño que dispara un punto
+            de control.
+        """
+        self.backend = backend
+        self.journal = Journal(path, sync)
+        self.checkpoint_size = checkpoint_size
+        self._locks = [threading.Lock() for _ in range(self.LOCK_STRIPES)]
+        # Escritores en curso; un punto de control espera a que terminen
+        # y bloquea a los nuevos mientras vacía la bitácora.
+        self._writers = 0
+        self._checkpointing = False
+        self._state = threading.Condition()
+        self.replayed = self.replay()
+
+    def replay(self):
+        """
+        Reaplica al almacén las entradas recuperadas de la bitácora.
+
+        Todas las operaciones son idempotentes, así que reaplicar una
+        entrada que ya había llegado al almacén no cambia el resultado.
+
+        Returns:
+            int: Número de entradas reaplicadas.
+        """
+        entries = self.journal.recovered()
+        for entry in entries:
+            self._apply(entry)
+        return len(entries)
+
+    def _apply(self, entry):
+        operation = entry['op']
+        kind = entry['kind']
+        if operation == 'put':
+            self.backend.put_many(kind, entry['records'])
+        elif operation == 'update':
+            try:
+                self.backend.update(kind, entry['key'], entry['changes'])
+            except KeyError:
+                pass
+        elif 'keys' in entry:
+            self.backend.delete_many(kind, entry['keys'])
+        else:
+            try:
+                self.backend.delete(kind, entry['key'])
+            except KeyError:
+                pass
+
+    @contextlib.contextmanager
+    def _writing(self, kind, keys):
+        """
+        Registra un escritor en curso y toma, en orden, los candados de
+        los registros que modifica.
+        """
+        with self._state:
+            while self._checkpointing:
+                self._state.wait()
+            self._writers += 1
+        try:
+            with contextlib.ExitStack() as stack:
+                for stripe in sorted({hash((kind, key)) % self.LOCK_STRIPES
+                                      for key in keys}):
+                    stack.enter_context(self._locks[stripe])
+                yield
+        finally:
+            with self._state:
+                self._writers -= 1
+                self._state.notify_all()
+        if self.journal.size() >= self.checkpoint_size:
+            self.checkpoint()
+
+    def put(self, kind, key, record):
+        self.put_many(kind, ((key, record),))
+
+    def put_many(self, kind, records):
+        records = [[key, record] for key, record in records]
+        if not records:
+            return
+        entry = {'op': 'put', 'kind': kind, 'records': records}
+        # Un lote ocupa una sola entrada y una sola confirmación.
+        with self._writing(kind, [key for key, _ in records]):
+            self.journal.append(entry)
+            self._apply(entry)
+
+    def update(self, kind, key, changes):
+        with self._writing(kind, (key,)):
+            if not self.backend.exists(kind, key):
+                raise KeyError((kind, key))
+            self.journal.append({'op': 'update', 'kind': kind,
+                                 'key': key, 'changes': changes})
+            self.backend.update(kind, key, changes)
+
+    def compare_and_swap(self, kind, key, expected, changes,
+                         replace=False):
+        # Se registra como una modificación o un alta con la versión ya
+        # resuelta, que al reaplicarse no vuelve a compararse.
+        with self._writing(kind, (key,)):
+            patch = versioned_patch(kind, key, self.backend.get(kind, key),
+                                    expected, changes)
+            if replace:
+                entry = {'op': 'put', 'kind': kind, 'records': [
+                    [key, {VERSION: patch[VERSION], **patch}]]}
+            else:
+                entry = {'op': 'update', 'kind': kind, 'key': key,
+                         'changes': patch}
+            self.journal.append(entry)
+            self._apply(entry)
+        return patch[VERSION]
+
+    def delete(self, kind, key):
+        with self._writing(kind, (key,)):
+            if not self.backend.exists(kind, key):
+                raise KeyError((kind, key))
+            self.journal.append({'op': 'delete', 'kind': kind,
+                                 'key': key})
+            self.backend.delete(kind, key)
+
+    def delete_many(self, kind, keys):
+        keys = list(keys)
+        if not keys:
+            return
+        # Un lote de bajas ocupa una sola entrada y una sola confirmación.
+        entry = {'op': 'delete', 'kind': kind, 'keys': keys}
+        with self._writing(kind, keys):
+            self.journal.append(entry)
+            self._apply(entry)
+
+    def get(self, kind, key):
+        return self.backend.get(kind, key)
+
+    def exists(self, kind, key):
+        return self.backend.exists(kind, key)
+
+    def keys(self, kind):
+        return self.backend.keys(kind)
+
+    def scan(self, kind):
+        return self.backend.scan(kind)
+
+    def scan_range(self, kind, low, high):
+        return self.backend.scan_range(kind, low, high)
+
+    def open_record(self, kind, key):
+        return self.backend.open_record(kind, key)
+
+    def stamp(self, kind, key):
+        return self.backend.stamp(kind, key)
+
+    def checkpoint(self):
+        """
+        Hace durable el almacén subyacente y vacía la bitácora.
+
+        Si el almacén tiene un búfer (``flush``) se vacía primero; luego
+        se sincronizan los sistemas de archivos para que los archivos del
+        almacén sobrevivan a una caída del sistema sin la bitácora.
+        """
+        with self._state:
+            while self._checkpointing:
+                self._state.wait()
+            self._checkpointing = True
+            while self._writers:
+                self._state.wait()
+        try:
+            flush = getattr(self.backend, 'flush', None)
+            if flush is not None:
+                flush()
+            if self.journal.sync and hasattr(os, 'sync'):
+                os.sync()
+            self.journal.truncate()
+        finally:
+            with self._state:
+                self._checkpointing = False
+                self._state.notify_all()
+
+    def close(self):
+        """
+        Hace un punto de control y cierra la bitácora y el almacén.
+        """
+        self.checkpoint()
+        self.journal.close()
+        self.backend.close()
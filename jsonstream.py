@@ -0,0 +1,217 @@
+"""
+Este módulo define JsonStream, un lector incremental de documentos JSON
+que decodifica el archivo por bloques, de modo que se pueden leer los
+primeros miembros de un objeto o recorrer un objeto grande miembro por
+miembro sin cargar el documento completo.
+"""
+import codecs
+import json
+
+WHITESPACE = " \t\n\r"
+NUMBER_CHARACTERS = frozenset("0123456789+-.eE")
+
+
+class JsonStream:
+    """
+    Lector incremental de un documento JSON.
+
+    Attributes:
+        file (file): Archivo binario del que se lee.
+        chunk_size (int): Bytes leídos por bloque.
+    """
+
+    def __init__(self, file, chunk_size=64 * 1024):
+        """
+        Inicializa el lector.
+
+        Args:
+            file (file): Archivo binario abierto en modo lectura.
+            chunk_size (int, opcional): Bytes leídos por bloque.
+        """
+        self.file = file
+        self.chunk_size = chunk_size
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+        self._json = json.JSONDecoder()
+        self._buffer = ""
+        self._position = 0
+        self._eof = False
+        # Por cada objeto o arreglo abierto, si aún no tiene elementos.
+        self._first = []
+
+    def _fill(self):
+        """
+        Agrega un bloque al búfer, descartando lo ya consumido.
+
+        Returns:
+            bool: False si el archivo ya no tiene más datos.
+        """
+        if self._eof:
+            return False
+        data = self.file.read(self.chunk_size)
+        self._eof = not data
+        self._buffer = self._buffer[self._position:] + \
+            self._decoder.decode(data, final=self._eof)
+        self._position = 0
+        return not self._eof
+
+    def _peek(self):
+        """
+        Devuelve el siguiente carácter que no es espacio, sin consumirlo.
+        """
+        while True:
+            buffer = self._buffer
+            position = self._position
+            while position < len(buffer) and buffer[position] in WHITESPACE:
+                position += 1
+            self._position = position
+            if position < len(buffer):
+                return buffer[position]
+            if not self._fill():
+                raise ValueError("Fin inesperado del documento JSON.")
+
+    def _expect(self, characters):
+        character = self._peek()
+        if character not in characters:
+            raise ValueError(f"Se esperaba {characters!r} y se encontró "
+                             f"{character!r}.")
+        self._position += 1
+        return character
+
+    def value(self):
+        """
+        Decodifica el siguiente valor completo.
+        """
+        if self._peek() in NUMBER_CHARACTERS:
+            # Un número al final del búfer puede continuar en el bloque
+            # siguiente: se lee hasta ver el carácter que lo termina.
+            end = self._position
+            while True:
+                while end < len(self._buffer) and \
+                        self._buffer[end] in NUMBER_CHARACTERS:
+                    end += 1
+                if end < len(self._buffer):
+                    break
+                end -= self._position
+                if not self._fill():
+                    break
+        while True:
+            try:
+                value, end = self._json.raw_decode(self._buffer,
+                                                   self._position)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            self._position = end
+            return value
+
+    def begin_object(self):
+        """
+        Consume la apertura de un objeto.
+        """
+        self._expect("{")
+        self._first.append(True)
+
+    def next_key(self):
+        """
+        Consume la siguiente llave del objeto actual.
+
+        Returns:
+            str: La llave, o None si el objeto terminó.
+        """
+        if self._peek() == "}":
+            self._position += 1
+            self._first.pop()
+            return None
+        if not self._first[-1]:
+            self._expect(",")
+        self._first[-1] = False
+        key = self.value()
+        self._expect(":")
+        return key
+
+    def begin_array(self):
+        """
+        Consume la apertura de un arreglo.
+        """
+        self._expect("[")
+        self._first.append(True)
+
+    def next_item(self):
+        """
+        Avanza al siguiente elemento del arreglo actual.
+
+        Returns:
+            bool: True si hay otro elemento, False si el arreglo terminó.
+        """
+        if self._peek() == "]":
+            self._position += 1
+            self._first.pop()
+            return False
+        if not self._first[-1]:
+            self._expect(",")
+        self._first[-1] = False
+        return True
+
+
+def read_members(file, names, chunk_size=4096, stop=()):
+    """
+    Lee los miembros indicados del objeto JSON del archivo, deteniéndose
+    en cuanto los encuentra todos.
+
+    Args:
+        file (file): Archivo binario con un objeto JSON.
+        names (iterable): Llaves de los miembros a leer.
+        chunk_size (int, opcional): Bytes leídos por bloque; los campos
+        buscados suelen estar al inicio del documento.
+        stop (iterable, opcional): Llaves que terminan la búsqueda al
+        aparecer, aunque falten miembros; sirven para no recorrer un
+        miembro grande cuando los buscados, si existen, van antes.
+
+    Returns:
+        dict: Los miembros encontrados.
+    """
+    pending = set(names)
+    stop = frozenset(stop)
+    members = {}
+    stream = JsonStream(file, chunk_size)
+    stream.begin_object()
+    while pending:
+        key = stream.next_key()
+        if key is None or key in stop:
+            break
+        value = stream.value()
+        if key in pending:
+            members[key] = value
+            pending.discard(key)
+    return members
+
+
+def iter_grouped(file, name, chunk_size=64 * 1024):
+    """
+    Recorre grupo por grupo un miembro con la forma ``{grupo: valor}``
+    del objeto JSON del archivo; solo un valor está en memoria a la vez.
+
+    Args:
+        file (file): Archivo binario con un objeto JSON.
+        name (str): Llave del miembro a recorrer.
+        chunk_size (int, opcional): Bytes leídos por bloque.
+
+    Yields:
+        tuple: Pares (grupo, valor).
+    """
+    stream = JsonStream(file, chunk_size)
+    stream.begin_object()
+    while True:
+        key = stream.next_key()
+        if key is None:
+            return
+        if key != name:
+            stream.value()
+            continue
+        stream.begin_object()
+        while True:
+            group = stream.next_key()
+            if group is None:
+                return
+            yield group, stream.value()
@@ -0,0 +1,271 @@
+"""
+Este módulo define la clase LogStore, un motor de almacenamiento basado en
+una bitácora segmentada de solo anexado con un índice de posiciones en
+memoria. Reemplaza el esquema de un archivo JSON por entidad: cada
+escritura se anexa al segmento activo y la compactación descarta las
+versiones obsoletas.
+"""
+import json
+import os
+import threading
+from storage import StorageBackend
+
+
+class LogStore(StorageBackend):
+    """
+    Almacén de registros en segmentos de solo anexado.
+
+    Cada registro es una línea JSON con el tipo de entidad, su llave y su
+    contenido; los borrados se anexan como lápidas. El índice en memoria
+    mapea (tipo, llave) a (segmento, posición, longitud), por lo que una
+    lectura es un solo ``seek`` y ``read``.
+
+    Attributes:
+        directory (str): Carpeta donde se guardan los segmentos.
+        segment_size (int): Tamaño en bytes a partir del cual se abre un
+        segmento nuevo.
+        compact_ratio (float): Proporción de registros obsoletos que
+        dispara una compactación automática.
+        segments (dict): Número de segmento a su archivo, o None si aún
+        no se abre; el último es el segmento activo.
+    """
+
+    SEGMENT_PREFIX = "segment_"
+    SEGMENT_SUFFIX = ".log"
+
+    def __init__(self, directory, segment_size=64 * 1024 * 1024,
+                 compact_ratio=0.5):
+        """
+        Abre el almacén y reconstruye el índice a partir de los segmentos.
+
+        Args:
+            directory (str): Carpeta donde se guardan los segmentos.
+            segment_size (int, opcional): Tamaño máximo de cada segmento.
+            compact_ratio (float, opcional): Proporción de registros
+            obsoletos que dispara la compactación; None la desactiva.
+        """
+        self.directory = directory
+        self.segment_size = segment_size
+        self.compact_ratio = compact_ratio
+        self.index = {}
+        self.dead = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self.segments = dict.fromkeys(sorted(self._segment_numbers()))
+        for number in self.segments:
+            self._load_segment(number)
+        if not self.segments:
+            self.segments[1] = None
+
+    def _segment_numbers(self):
+        for entry in os.listdir(self.directory):
+            if entry.startswith(self.SEGMENT_PREFIX) and \
+               entry.endswith(self.SEGMENT_SUFFIX):
+                yield int(entry[len(self.SEGMENT_PREFIX):
+                                -len(self.SEGMENT_SUFFIX)])
+
+    def _segment_path(self, number):
+        return os.path.join(self.directory, f"{self.SEGMENT_PREFIX}"
+                            f"{number:06d}{self.SEGMENT_SUFFIX}")
+
+    def _open(self, number):
+        # Los segmentos quedan abiertos para que cada lectura sea un seek
+        # y un read; se cierran al compactar o con close.
+        # pylint: disable-next=consider-using-with
+        return open(self._segment_path(number), 'a+b')
+
+    def _file(self, number):
+        file = self.segments[number]
+        if file is None:
+            file = self.segments[number] = self._open(number)
+        return file
+
+    def _load_segment(self, number):
+        offset = 0
+        with open(self._segment_path(number), 'r+b') as file:
+            for line in file:
+                if not line.endswith(b"\n"):
+                    # Escritura incompleta al final del segmento.
+                    break
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break
+                self._apply(entry, (number, offset, len(line)))
+                offset += len(line)
+            # Se descarta lo que quedó a medias para que la siguiente
+            # escritura empiece en una línea nueva.
+            file.truncate(offset)
+
+    def _apply(self, entry, location):
+        key = (entry['k'], entry['id'])
+        if key in self.index:
+            self.dead += 1
+        if entry.get('d'):
+            # La lápida tampoco sobrevive a la compactación.
+            self.dead += 1
+            self.index.pop(key, None)
+        else:
+            self.index[key] = location
+
+    @staticmethod
+    def _encode(kind, key, record):
+        if record is None:
+            entry = {'k': kind, 'id': key, 'd': 1}
+        else:
+            entry = {'k': kind, 'id': key, 'v': record}
+        return (json.dumps(entry) + "\n").encode('utf-8')
+
+    def _append(self, items):
+        """
+        Anexa una secuencia de (tipo, llave, registro) con una sola
+        escritura. Un registro None representa un borrado.
+        """
+        with self._lock:
+            number = next(reversed(self.segments))
+            active = self._file(number)
+            # Una lectura pudo mover la posición del archivo.
+            offset = active.seek(0, os.SEEK_END)
+            if offset >= self.segment_size:
+                number += 1
+                self.segments[number] = None
+                active = self._file(number)
+                offset = 0
+            chunks = []
+            for kind, key, record in items:
+                data = self._encode(kind, key, record)
+                chunks.append(data)
+                self._apply({'k': kind, 'id': key, 'd': record is None},
+                            (number, offset, len(data)))
+                offset += len(data)
+            active.write(b"".join(chunks))
+            active.flush()
+        self._maybe_compact()
+
+    def _maybe_compact(self):
+        if self.compact_ratio is None or self.dead < 1024:
+            return
+        if self.dead >= self.compact_ratio * (self.dead + len(self.index)):
+            self.compact()
+
+    def put(self, kind, key, record):
+        """
+        Guarda un registro, reemplazando la versión anterior.
+
+        Args:
+            kind (str): Tipo de entidad ('customer', 'hotel', ...).
+            key (str): Llave de la entidad.
+            record (dict): Contenido del registro.
+        """
+        self._append([(kind, key, record)])
+
+    def put_many(self, kind, records):
+        """
+        Guarda varios registros del mismo tipo con una sola escritura.
+
+        Args:
+            kind (str): Tipo de entidad.
+            records (iterable): Pares (llave, registro).
+        """
+        self._append([(kind, key, record) for key, record in records])
+
+    def get(self, kind, key):
+        """
+        Lee un registro.
+
+        Args:
+            kind (str): Tipo de entidad.
+            key (str): Llave de la entidad.
+
+        Returns:
+            dict: El contenido del registro.
+
+        Raises:
+            KeyError: Si el registro no existe.
+        """
+        with self._lock:
+            number, offset, length = self.index[(kind, key)]
+            file = self._file(number)
+            file.seek(offset)
+            data = file.read(length)
+        return json.loads(data)['v']
+
+    def exists(self, kind, key):
+        """
+        Indica si existe un registro sin tocar el disco.
+        """
+        return (kind, key) in self.index
+
+    def delete(self, kind, key):
+        """
+        Elimina un registro anexando una lápida.
+
+        Raises:
+            KeyError: Si el registro no existe.
+        """
+        if (kind, key) not in self.index:
+            raise KeyError((kind, key))
+        self._append([(kind, key, None)])
+
+    def stamp(self, kind, key):
+        """
+        Devuelve la posición del registro vigente, que cambia con cada
+        escritura.
+        """
+        return self.index.get((kind, key))
+
+    def keys(self, kind):
+        """
+        Lista las llaves vigentes de un tipo de entidad.
+        """
+        return [key for entry_kind, key in self.index if entry_kind == kind]
+
+    def compact(self):
+        """
+        Reescribe los registros vigentes en segmentos nuevos y elimina los
+        anteriores, descartando versiones obsoletas y lápidas.
+        """
+        with self._lock:
+            old_segments = self.segments
+            live = sorted(self.index.items(), key=lambda item: item[1])
+            number = next(reversed(old_segments)) + 1
+            new_index = {}
+            target = self._open(number)
+            new_segments = {number: target}
+            try:
+                for key, (segment, offset, length) in live:
+                    reader = self._file(segment)
+                    reader.seek(offset)
+                    data = reader.read(length)
+                    if target.tell() >= self.segment_size:
+                        number += 1
+                        target = new_segments[number] = self._open(number)
+                    new_index[key] = (number, target.tell(), length)
+                    target.write(data)
+                for file in new_segments.values():
+                    file.flush()
+                    os.fsync(file.fileno())
+            except BaseException:
+                # Los segmentos a medias se descartan; los anteriores
+                # siguen vigentes.
+                for segment, file in new_segments.items():
+                    file.close()
+                    os.remove(self._segment_path(segment))
+                raise
+            for segment, file in old_segments.items():
+                if file is not None:
+                    file.close()
+                os.remove(self._segment_path(segment))
+            self.index = new_index
+            self.segments = new_segments
+            self.dead = 0
+
+    def close(self):
+        """
+        Cierra los segmentos abiertos.
+        """
+        with self._lock:
+            for file in self.segments.values():
+                if file is not None:
+                    file.close()
+            self.segments = dict.fromkeys(self.segments)
@@ -0,0 +1,230 @@
+"""
+Este módulo define la superficie de instrumentación de las operaciones de
+reserva: contadores por operación, histogramas de latencia y eventos a
+los que se puede suscribir, con exportación en JSON o en el formato de
+texto de Prometheus.
+
+La instrumentación por omisión (NULL_INSTRUMENTATION) no hace nada; las
+rutas críticas consultan ``enabled`` antes de construir cualquier evento.
+"""
+import json
+import threading
+from bisect import bisect_left
+
+# Límites superiores en segundos de las cubetas de los histogramas.
+DEFAULT_BUCKETS = (1e-6, 5e-6, 1e-5, 5e-5, 1e-4, 5e-4, 1e-3, 5e-3,
+                   1e-2, 5e-2, 0.1, 0.5, 1.0, 5.0)
+
+
+class Instrumentation:
+    """
+    Instrumentación nula: todas las operaciones se descartan.
+
+    Attributes:
+        enabled (bool): Si la instrumentación registra algo; las rutas
+        críticas lo consultan para no construir eventos en vano.
+    """
+
+    enabled = False
+
+    def count(self, name, value=1):
+        """
+        Incrementa un contador.
+        """
+
+    def observe(self, name, seconds):
+        """
+        Registra una duración en un histograma.
+        """
+
+    def emit(self, event, **fields):
+        """
+        Publica un evento a sus suscriptores.
+        """
+
+    def subscribe(self, event, callback):
+        """
+        Suscribe una función a un evento.
+        """
+        raise NotImplementedError("La instrumentación nula no publica "
+                                  "eventos; use Metrics.")
+
+
+NULL_INSTRUMENTATION = Instrumentation()
+
+
+class Histogram:
+    """
+    Histograma acumulativo de duraciones con cubetas fijas.
+
+    Attributes:
+        buckets (tuple): Límites superiores de las cubetas en segundos.
+        counts (list): Observaciones por cubeta; la última es +Inf.
+        total (float): Suma de las observaciones.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        """
+        Inicializa un histograma vacío.
+        """
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.total = 0.0
+
+    def observe(self, seconds):
+        """
+        Registra una duración.
+        """
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.total += seconds
+
+    @property
+    def count(self):
+        """
+        Número de observaciones.
+        """
+        return sum(self.counts)
+
+    def quantile(self, fraction):
+        """
+        Estima un cuantil como el límite de la cubeta que lo contiene.
+
+        Returns:
+            float: Límite superior en segundos, o None si está vacío o
+            el cuantil cae en la cubeta +Inf.
+        """
+        target = fraction * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if count and seen >= target:
+                return bound
+        return None
+
+
+class Metrics(Instrumentation):
+    """
+    Instrumentación en memoria con contadores, histogramas y eventos.
+
+    Attributes:
+        counters (dict): Nombre del contador a su valor.
+        histograms (dict): Nombre del histograma a Histogram.
+    """
+
+    enabled = True
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        """
+        Inicializa la instrumentación.
+
+        Args:
+            buckets (tuple, opcional): Límites de los histogramas.
+        """
+        self.buckets = buckets
+        self.counters = {}
+        self.histograms = {}
+        self._subscribers = {}
+        self._lock = threading.Lock()
+
+    def count(self, name, value=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe(self, name, seconds):
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    def emit(self, event, **fields):
+        self.count(event)
+        for callback in self._subscribers.get(event, ()):
+            callback(event, fields)
+
+    def subscribe(self, event, callback):
+        """
+        Suscribe una función a un evento.
+
+        Args:
+            event (str): Nombre del evento, p. ej. 'booking_rejected'.
+            callback (callable): Función que recibe el nombre del evento
+            y un diccionario con sus campos.
+        """
+        self._subscribers.setdefault(event, []).append(callback)
+
+    def snapshot(self):
+        """
+        Devuelve el estado actual de contadores e histogramas.
+
+        Returns:
+            dict: Contadores e histogramas con sus cubetas, conteo, suma
+            y cuantiles p50/p99 estimados.
+        """
+        with self._lock:
+            histograms = {
+                name: {'buckets': list(histogram.buckets),
+                       'counts': list(histogram.counts),
+                       'count': histogram.count,
+                       'sum': histogram.total,
+                       'p50': histogram.quantile(0.50),
+                       'p99': histogram.quantile(0.99)}
+                for name, histogram in self.histograms.items()}
+            return {'counters': dict(self.counters),
+                    'histograms': histograms}
+
+    def to_json(self):
+        """
+        Exporta el estado actual como JSON.
+        """
+        return json.dumps(self.snapshot())
+
+    def to_prometheus(self, prefix='hotel_'):
+        """
+        Exporta el estado actual en el formato de texto de Prometheus.
+        """
+        snapshot = self.snapshot()
+        lines = []
+        for name, value in sorted(snapshot['counters'].items()):
+            lines.append(f"# TYPE {prefix}{name}_total counter")
+            lines.append(f"{prefix}{name}_total {value}")
+        for name, histogram in sorted(snapshot['histograms'].items()):
+            metric = f"{prefix}{name}"
+            lines.append(f"# TYPE {metric} histogram")
+            cumulative = 0
+            for bound, count in zip(histogram['buckets'],
+                                    histogram['counts']):
+                cumulative += count
+                lines.append(f'{metric}_bucket{{le="{bound:g}"}} '
+                             f'{cumulative}')
+            lines.append(f'{metric}_bucket{{le="+Inf"}} '
+                         f'{histogram["count"]}')
+            lines.append(f"{metric}_sum {histogram['sum']:g}")
+            lines.append(f"{metric}_count {histogram['count']}")
+        return "\n".join(lines) + "\n"
+
+
+def attach_console(metrics):
+    """
+    Suscribe a ``metrics`` una salida en consola equivalente a los
+    mensajes que antes imprimían las operaciones de reserva.
+    """
+    messages = {
+        'booking_accepted': "\tSe ha reservado la habitación {room_number} "
+                            "para {guest_name} del {check_in_date} al "
+                            "{check_out_date}.",
+        'booking_rejected': "\tNo se reservó la habitación {room_number} "
+                            "del {check_in_date} al {check_out_date}: "
+                            "{reason}.",
+        'booking_cancelled': "La reserva para la habitación {room_number} "
+                             "ha sido cancelada.",
+        'cancellation_rejected': "No existe una reserva para la "
+                                 "habitación {room_number}.",
+        'reservation_persisted': "Reserva {reservation_id} creada "
+                                 "correctamente.",
+        'reservation_deleted': "Reserva {reservation_id} cancelada "
+                               "correctamente.",
+    }
+    for event, message in messages.items():
+        metrics.subscribe(event, lambda _, fields, message=message:
+                          print(message.format(**fields)))
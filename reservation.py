@@ -2,70 +2,295 @@
 Módulo que contiene la clase Reservation para gestionar
 las reservas de habitaciones en un hotel.
 """
-import os
-import json
-import uuid
+import time
+import ids
+from indexes import ReservationIndex
 
 
 class Reservation:
     """
     Clase para gestionar reservas de habitaciones en un hotel.
+
+    Attributes:
+        index (ReservationIndex): Índices secundarios compartidos de las
+        reservas persistidas.
     """
 
-    def __init__(self, customer, hotel, reservation_data):
+    index = ReservationIndex()
+
+    def __init__(self, customer, hotel, reservation_data, store=None):
+        """
+        Inicializa una reserva.
 
+        Args:
+            customer (Customer): El cliente que reserva.
+            hotel (Hotel): El hotel donde se reserva.
+            reservation_data (dict): Diccionario con las llaves
+            'room_number', 'check_in_date' y 'check_out_date'.
+            store (StorageBackend, opcional): Almacén donde se persiste la
+            reserva. Si no se indica se usa el almacén del hotel.
+        """
+        self.store = hotel.store if store is None else store
         self.customer = customer
         self.hotel = hotel
         self.room_number = reservation_data['room_number']
         self.check_in_date = reservation_data['check_in_date']
         self.check_out_date = reservation_data['check_out_date']
-        # Generar un ID único para la reserva
-        self.reservation_id = str(uuid.uuid4())
+        # ID único y ordenable por momento de creación
+        self.reservation_id = ids.new_id()
 
     def create_reservation(self):
         """
-        Crea una nueva reserva y la guarda en un archivo JSON.
+        Crea una nueva reserva y la guarda en el almacén.
+
+        Solo se guarda si el hotel acepta la reserva.
 
         Returns:
-            str: Nombre del archivo de reserva creado.
+            str: Nombre del archivo de reserva creado, o None si el hotel
+            la rechazó o no se pudo guardar.
         """
-        self.hotel.reserve_room(self.room_number, self.customer.name,
-                                self.check_in_date, self.check_out_date)
+        if not self.hotel.reserve_room(self.room_number, self.customer.name,
+                                       self.check_in_date,
+                                       self.check_out_date):
+            return None
+        metrics = self.hotel.instrumentation
         try:
-            reservation_data = {
-                "reservation_id": self.reservation_id,
-                "customer_name": self.customer.name,
-                "customer_email": self.customer.email,
-                "hotel_name": self.hotel.name,
-                "room_number": self.room_number,
-                "check_in_date": self.check_in_date,
-                "check_out_date": self.check_out_date
-            }
+            reservation_data = self.to_dict()
             filename = f"reservation_{self.reservation_id}.json"
-            with open(filename, 'w', encoding='utf-8') as file:
-                json.dump(reservation_data, file)
-            print("Reserva creada correctamente.")
+            start = time.perf_counter() if metrics.enabled else 0.0
+            self.store.put('reservation', self.reservation_id,
+                           reservation_data)
+            self.index.add(reservation_data)
+            if metrics.enabled:
+                elapsed = time.perf_counter() - start
+                metrics.observe('persist_seconds', elapsed)
+                metrics.emit('reservation_persisted',
+                             reservation_id=self.reservation_id,
+                             seconds=elapsed)
             return filename
         except FileNotFoundError as exception:
+            self.hotel.cancel_reservation(self.room_number,
+                                          self.check_in_date,
+                                          self.customer.name)
             print(f"Error al crear la reserva: {exception}")
             return None
 
+    def to_dict(self):
+        """
+        Devuelve la información persistible de la reserva.
+
+        Returns:
+            dict: Datos de la reserva.
+        """
+        return {
+            "reservation_id": self.reservation_id,
+            "customer_name": self.customer.name,
+            "customer_email": self.customer.email,
+            "hotel_name": self.hotel.name,
+            "room_number": self.room_number,
+            "check_in_date": self.check_in_date,
+            "check_out_date": self.check_out_date
+        }
+
+    @classmethod
+    def create_many(cls, hotel, requests, store=None):
+        """
+        Crea un lote de reservas y las guarda con una sola llamada a
+        ``put_many`` del almacén; con archivos JSON el lote completo se
+        escribe en un solo archivo.
+
+        Args:
+            hotel (Hotel): El hotel donde se hacen las reservas.
+            requests (iterable): Pares (customer, reservation_data) con
+            el mismo formato que recibe el constructor.
+            store (StorageBackend, opcional): Almacén donde se persiste el
+            lote. Si no se indica se usa el almacén del hotel.
+
+        Returns:
+            list: Un diccionario por solicitud con las llaves
+            'reservation_id', 'accepted' y 'reason'.
+
+        Si el almacén falla, el hotel libera las estancias del lote y el
+        error se propaga.
+        """
+        reservations = [cls(customer, hotel, reservation_data, store)
+                        for customer, reservation_data in requests]
+        outcomes = hotel.reserve_many(
+            {'room_number': reservation.room_number,
+             'guest_name': reservation.customer.name,
+             'check_in_date': reservation.check_in_date,
+             'check_out_date': reservation.check_out_date}
+            for reservation in reservations)
+        results = []
+        accepted = []
+        for reservation, outcome in zip(reservations, outcomes):
+            results.append({'reservation_id': reservation.reservation_id,
+                            'accepted': outcome['accepted'],
+                            'reason': outcome['reason']})
+            if outcome['accepted']:
+                accepted.append(reservation.to_dict())
+        if accepted:
+            if store is None:
+                store = hotel.store
+            metrics = hotel.instrumentation
+            start = time.perf_counter() if metrics.enabled else 0.0
+            try:
+                store.put_many('reservation',
+                               ((item['reservation_id'], item)
+                                for item in accepted))
+            except BaseException:
+                # Sin registro no hay reserva: se liberan las estancias
+                # que el hotel ya había apartado.
+                for item in accepted:
+                    hotel.cancel_reservation(item['room_number'],
+                                             item['check_in_date'],
+                                             item['customer_name'])
+                raise
+            for item in accepted:
+                cls.index.add(item)
+            if metrics.enabled:
+                elapsed = time.perf_counter() - start
+                metrics.observe('persist_batch_seconds', elapsed)
+                metrics.count('reservations_persisted', len(accepted))
+        return results
+
+    @classmethod
+    def find_reservations(cls, customer=None, email=None, hotel=None,
+                          date_range=None, created=None):
+        """
+        Busca reservas persistidas usando los índices secundarios.
+
+        Args:
+            customer (str, opcional): Nombre del huésped.
+            email (str, opcional): Correo del huésped.
+            hotel (str, opcional): Nombre del hotel.
+            date_range (tuple, opcional): Fechas (desde, hasta); se
+            incluyen las entradas en [desde, hasta).
+            created (tuple, opcional): Momentos (desde, hasta) de
+            creación de la reserva.
+
+        Returns:
+            set: Ids de las reservas que cumplen todos los criterios.
+        """
+        return cls.index.find(customer, email, hotel, date_range, created)
+
+    @staticmethod
+    def scan_created(store, start, end):
+        """
+        Recorre en el almacén las reservas creadas en un intervalo, en
+        orden de creación, sin recorrer las demás.
+
+        Args:
+            store (StorageBackend): Almacén de las reservas.
+            start (float o datetime): Inicio del intervalo.
+            end (float o datetime): Fin del intervalo, excluido.
+
+        Yields:
+            dict: Los registros de las reservas.
+        """
+        low, high = ids.bounds(start, end)
+        for _, record in store.scan_range('reservation', low, high):
+            yield record
+
+    @classmethod
+    def rebuild_index(cls, store):
+        """
+        Reconstruye los índices secundarios a partir del almacén.
+        """
+        cls.index.rebuild(store)
+
     def cancel_reservation(self):
         """
-        Cancela la reserva del cliente en el hotel.
+        Cancela la reserva del cliente en el hotel: libera la habitación
+        y elimina el registro persistido.
 
         Returns:
             bool: True si la reserva se canceló correctamente,
             False en caso contrario.
         """
         try:
-            # Elimina el archivo de reserva si existe
-            filename = f"reservation_{self.reservation_id}.json"
-            if os.path.exists(filename):
-                os.remove(filename)
-                print("Reserva cancelada correctamente.")
+            self.hotel.cancel_reservation(self.room_number,
+                                          self.check_in_date,
+                                          self.customer.name)
+            # Elimina el registro de la reserva si existe
+            if self.store.exists('reservation', self.reservation_id):
+                self.store.delete('reservation', self.reservation_id)
+                self.index.remove(self.reservation_id)
+                metrics = self.hotel.instrumentation
+                if metrics.enabled:
+                    metrics.emit('reservation_deleted',
+                                 reservation_id=self.reservation_id)
 
             return True
         except FileNotFoundError as exception:
             print(f"Error al cancelar la reserva: {exception}")
             return False
+
+    @classmethod
+    def cancel(cls, reservation_id, hotels, store=None):
+        """
+        Cancela una reserva a partir de su id: libera la habitación en
+        el hotel y elimina el registro persistido.
+
+        Args:
+            reservation_id (str): El id de la reserva.
+            hotels (dict): Nombre del hotel a instancia de Hotel.
+            store (StorageBackend, opcional): Almacén de las reservas.
+            Por omisión el del hotel.
+
+        Returns:
+            bool: True si la reserva se canceló.
+        """
+        return cls.cancel_many((reservation_id,), hotels,
+                               store)[0]['cancelled']
+
+    @classmethod
+    def cancel_many(cls, reservation_ids, hotels, store=None):
+        """
+        Cancela un lote de reservas a partir de sus ids.
+
+        Cada reserva se ubica en los índices sin consultar el almacén,
+        se libera su habitación y los registros se eliminan con una sola
+        llamada a ``delete_many`` por almacén.
+
+        Args:
+            reservation_ids (iterable): Ids de las reservas.
+            hotels (dict): Nombre del hotel a instancia de Hotel.
+            store (StorageBackend, opcional): Almacén de las reservas.
+            Por omisión el de cada hotel.
+
+        Returns:
+            list: Un diccionario por id con las llaves 'reservation_id',
+            'cancelled' (bool) y 'reason' (None, 'unknown_reservation' o
+            'unknown_hotel').
+        """
+        results = []
+        deletions = {}
+        for reservation_id in reservation_ids:
+            location = cls.index.locate(reservation_id)
+            if location is None:
+                reason = 'unknown_reservation'
+            elif location['hotel_name'] not in hotels:
+                # Sin el hotel no se puede liberar la habitación; el
+                # registro se conserva para no dejarlos inconsistentes.
+                reason = 'unknown_hotel'
+            else:
+                reason = None
+                hotel = hotels[location['hotel_name']]
+                # Si la estancia ya no está en el hotel, el registro
+                # quedó huérfano y basta con eliminarlo.
+                hotel.cancel_reservation(location['room_number'],
+                                         location['check_in_date'],
+                                         location['guest_name'])
+                target = hotel.store if store is None else store
+                deletions.setdefault(id(target), (target, []))[1].append(
+                    reservation_id)
+                cls.index.remove(reservation_id)
+                if hotel.instrumentation.enabled:
+                    hotel.instrumentation.emit('reservation_deleted',
+                                               reservation_id=reservation_id)
+            results.append({'reservation_id': reservation_id,
+                            'cancelled': reason is None, 'reason': reason})
+        for target, keys in deletions.values():
+            target.delete_many('reservation', keys)
+        return results
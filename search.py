@@ -0,0 +1,426 @@
+"""
+Este módulo define la clase HotelSearch, una búsqueda de disponibilidad
+en muchos hoteles a la vez repartida en un grupo de procesos.
+
+Cada proceso es dueño de una partición fija de los hoteles y los mantiene
+cargados en memoria entre búsquedas, de modo que una búsqueda no vuelve a
+leer el almacén. Los candidatos se entregan en cuanto cada proceso los
+encuentra.
+
+Uso:
+    python -m search 2024-03-01 2024-03-04 --location Cancún --type king
+    python -m search 2024-03-01 2024-03-04 --sqlite hoteles.db --workers 8
+"""
+import argparse
+import functools
+import heapq
+import itertools
+import json
+import multiprocessing
+import os
+import threading
+from collections import deque, namedtuple
+from hotel import Hotel
+from storage import DEFAULT_BACKEND, ShardedFileBackend, SQLiteBackend
+
+FOUND = 'found'
+DONE = 'done'
+ERROR = 'error'
+
+
+def location_matches(location, query):
+    """
+    Indica si la ubicación de un hotel coincide con la buscada; la
+    comparación ignora mayúsculas y acepta coincidencias parciales.
+    """
+    if not query:
+        return True
+    return query.casefold() in (location or "").casefold()
+
+
+def rank(candidate):
+    """
+    Llave de orden de un candidato: primero los hoteles cuya ubicación
+    coincide, luego por número de habitación.
+    """
+    return (not candidate['location_match'], candidate['room_number'],
+            candidate['hotel'])
+
+
+# Lo que comparten el proceso principal y los de búsqueda: una cola de
+# solicitudes por proceso, la cola de resultados y el número hasta el que
+# todas las búsquedas terminaron o se abandonaron.
+_Channels = namedtuple('_Channels', 'requests results abandoned')
+# Argumentos de una búsqueda.
+_Query = namedtuple('_Query', 'check_in check_out location room_type '
+                              'per_hotel attributes')
+
+
+def _worker(index, names, store_factory, channels):
+    """
+    Ciclo de un proceso de búsqueda.
+
+    Args:
+        index (int): Número del proceso.
+        names (list): Hoteles de su partición.
+        store_factory (callable): Crea el almacén del proceso, o None
+        para usar el almacén por omisión.
+        channels (_Channels): Colas y marca de abandono compartidas; el
+        proceso lee sus solicitudes de ``channels.requests[index]``.
+    """
+    store = DEFAULT_BACKEND if store_factory is None else store_factory()
+    hotels = {}
+
+    def resident(name):
+        hotel = hotels.get(name)
+        if hotel is None:
+            try:
+                hotel = hotels[name] = Hotel.load(name, store=store)
+            except FileNotFoundError:
+                return None
+            # Se cargan de una vez las reservas para que la búsqueda
+            # solo consulte los índices en memoria.
+            hotel.bookings  # pylint: disable=pointless-statement
+        return hotel
+
+    def publish(search_id, kind, payload):
+        channels.results.put((search_id, index, kind, payload))
+
+    while True:
+        message = channels.requests[index].get()
+        if message is None:
+            break
+        operation, search_id, arguments = message
+        try:
+            if operation == 'refresh':
+                for name in arguments:
+                    hotels.pop(name, None)
+            elif operation == 'preload':
+                for name in names:
+                    resident(name)
+            else:
+                _search(search_id, _Query(*arguments),
+                        (hotel for hotel in map(resident, names)
+                         if hotel is not None),
+                        publish, channels.abandoned)
+        # pylint: disable-next=broad-exception-caught
+        except Exception as exception:
+            publish(search_id, ERROR,
+                    f"{type(exception).__name__}: {exception}")
+        else:
+            publish(search_id, DONE, None)
+
+
+def _search(search_id, query, hotels, publish, abandoned):
+    """
+    Busca en los hoteles de un proceso y publica los candidatos de cada
+    hotel en cuanto los encuentra, empezando por los de la ubicación
+    buscada.
+    """
+    deferred = []
+
+    def ordered():
+        # Los hoteles de la ubicación buscada se revisan en cuanto
+        # aparecen; los demás, al final.
+        for hotel in hotels:
+            if location_matches(hotel.location, query.location):
+                yield hotel
+            else:
+                deferred.append(hotel)
+        yield from deferred
+
+    for hotel in ordered():
+        if abandoned.value >= search_id:
+            return
+        if query.per_hotel == 1:
+            room = hotel.find_free_room(query.check_in, query.check_out,
+                                        query.room_type, **query.attributes)
+            rooms = [] if room is None else [room]
+        else:
+            rooms = hotel.find_free_rooms(
+                query.check_in, query.check_out, query.room_type,
+                **query.attributes)[:query.per_hotel]
+        if rooms:
+            publish(search_id, FOUND, [
+                {'hotel': hotel.name, 'location': hotel.location,
+                 'room_number': room,
+                 'location_match': location_matches(hotel.location,
+                                                    query.location)}
+                for room in rooms])
+
+
+class _Searches:
+    """
+    Búsquedas en curso del lado del proceso principal.
+
+    Guarda los resultados que llegan para cada búsqueda hasta que su
+    generador los entrega y avanza la marca de abandono compartida.
+    """
+
+    def __init__(self, channels):
+        self.channels = channels
+        self._ids = itertools.count(1)
+        # Resultados recibidos que aún no entrega su generador.
+        self._buffers = {}
+        # Búsquedas terminadas o abandonadas por encima de la marca.
+        self._retired = set()
+        self._lock = threading.Lock()
+        self._reader = threading.Lock()
+
+    def start(self, operation, arguments):
+        """
+        Envía una solicitud a todos los procesos.
+
+        El candado solo se toma al enviar, para que todos los procesos
+        reciban las solicitudes en el mismo orden; un generador a medio
+        consumir no bloquea a los demás.
+
+        Returns:
+            int: El número de la búsqueda.
+        """
+        with self._lock:
+            search_id = next(self._ids)
+            self._buffers[search_id] = deque()
+            for requests in self.channels.requests:
+                requests.put((operation, search_id, arguments))
+        return search_id
+
+    def receive(self, search_id):
+        """
+        Devuelve el siguiente resultado de una búsqueda.
+
+        Quien lee de la cola compartida guarda los resultados de las
+        demás búsquedas en curso para que sus generadores los entreguen.
+        """
+        while True:
+            with self._reader:
+                buffer = self._buffers[search_id]
+                if buffer:
+                    return buffer.popleft()
+                found_id, _, kind, payload = self.channels.results.get()
+                if found_id == search_id:
+                    return kind, payload
+                if found_id in self._buffers:
+                    self._buffers[found_id].append((kind, payload))
+
+    def retire(self, search_id):
+        """
+        Da por terminada o abandonada una búsqueda; sus resultados
+        pendientes se descartan.
+
+        Los procesos atienden las búsquedas en orden, así que la marca
+        solo avanza sobre números consecutivos: una búsqueda anterior que
+        sigue en curso no se detiene porque se abandone una posterior.
+        """
+        with self._reader:
+            del self._buffers[search_id]
+        with self._lock:
+            self._retired.add(search_id)
+            mark = self.channels.abandoned.value
+            while mark + 1 in self._retired:
+                mark += 1
+                self._retired.remove(mark)
+            self.channels.abandoned.value = mark
+
+
+class HotelSearch:
+    """
+    Búsqueda de disponibilidad en varios hoteles con un grupo de
+    procesos.
+
+    Los hoteles se reparten entre los procesos al crear la búsqueda y
+    cada proceso los conserva en memoria. Las reservas hechas por otros
+    procesos no se ven hasta llamar a ``refresh``. Los procesos atienden
+    las búsquedas en el orden en que se piden, aunque se consuman a la
+    vez o desde varios hilos; abandonar una búsqueda detiene a los
+    procesos.
+
+    Attributes:
+        names (list): Hoteles en los que se busca.
+        workers (int): Número de procesos.
+    """
+
+    def __init__(self, names, store_factory=None, workers=None,
+                 preload=True, context=None):
+        """
+        Inicia los procesos de búsqueda.
+
+        Args:
+            names (iterable): Nombres de los hoteles.
+            store_factory (callable, opcional): Función sin argumentos,
+            serializable con pickle, que crea el almacén en cada proceso;
+            por ejemplo ``functools.partial(SQLiteBackend, 'hotel.db')``.
+            Por omisión se usa el almacén por omisión.
+            workers (int, opcional): Número de procesos; por omisión uno
+            por núcleo.
+            preload (bool, opcional): Cargar todos los hoteles antes de
+            regresar, para que la primera búsqueda no pague la carga.
+            context (multiprocessing context, opcional): Contexto con el
+            que se crean los procesos.
+        """
+        self.names = list(names)
+        self.workers = max(1, min(workers or os.cpu_count() or 1,
+                                  len(self.names) or 1))
+        context = context or multiprocessing.get_context()
+        self._owners = {}
+        partitions = [[] for _ in range(self.workers)]
+        for number, name in enumerate(self.names):
+            self._owners[name] = number % self.workers
+            partitions[number % self.workers].append(name)
+        # SimpleQueue escribe en el proceso que publica, sin el hilo
+        # alimentador de Queue, que retrasaría cada resultado hasta que
+        # la búsqueda soltara el GIL.
+        channels = _Channels([context.Queue() for _ in range(self.workers)],
+                             context.SimpleQueue(),
+                             context.Value('q', 0, lock=False))
+        self._processes = [
+            context.Process(target=_worker, daemon=True,
+                            args=(index, partitions[index], store_factory,
+                                  channels))
+            for index in range(self.workers)]
+        for process in self._processes:
+            process.start()
+        self._searches = _Searches(channels)
+        if preload:
+            for _ in self._broadcast('preload', None):
+                pass
+
+    def _broadcast(self, operation, arguments):
+        """
+        Envía una solicitud a todos los procesos y entrega sus resultados
+        hasta que todos terminan.
+        """
+        search_id = self._searches.start(operation, arguments)
+        pending = self.workers
+        try:
+            while pending:
+                kind, payload = self._searches.receive(search_id)
+                if kind == FOUND:
+                    yield from payload
+                    continue
+                pending -= 1
+                if kind == ERROR:
+                    raise RuntimeError(payload)
+        finally:
+            # Si quedaron procesos buscando, se detienen en el siguiente
+            # hotel y los resultados que aún lleguen se descartan.
+            self._searches.retire(search_id)
+
+    def search(self, check_in_date, check_out_date, location=None,
+               room_type=None, per_hotel=None, **attributes):
+        """
+        Busca habitaciones libres en todos los hoteles.
+
+        Args:
+            check_in_date (str): La fecha de entrada.
+            check_out_date (str): La fecha de salida.
+            location (str, opcional): Ubicación preferida; sus hoteles se
+            revisan primero y sus candidatos quedan mejor clasificados.
+            room_type (str, opcional): Solo habitaciones de este tipo.
+            per_hotel (int, opcional): Máximo de habitaciones por hotel.
+            **attributes: Otros atributos que deben cumplir.
+
+        Yields:
+            dict: Candidatos con las llaves 'hotel', 'location',
+            'room_number' y 'location_match', en el orden en que se
+            encuentran.
+        """
+        return self._broadcast('search', (check_in_date, check_out_date,
+                                          location, room_type, per_hotel,
+                                          attributes))
+
+    def best(self, check_in_date, check_out_date, location=None,
+             room_type=None, limit=10, **attributes):
+        """
+        Devuelve los mejores candidatos de todos los hoteles según
+        ``rank``.
+
+        Returns:
+            list: Hasta ``limit`` candidatos ordenados.
+        """
+        return heapq.nsmallest(limit, self.search(
+            check_in_date, check_out_date, location, room_type, limit,
+            **attributes), key=rank)
+
+    def refresh(self, names):
+        """
+        Descarta la copia en memoria de los hoteles indicados para que se
+        vuelvan a leer del almacén en la siguiente búsqueda.
+        """
+        partitions = {}
+        for name in names:
+            if name in self._owners:
+                partitions.setdefault(self._owners[name], []).append(name)
+        # Cada proceso atiende sus solicitudes en orden: si hay una
+        # búsqueda en curso, la recarga aplica a partir de la siguiente.
+        requests = self._searches.channels.requests
+        for index, partition in partitions.items():
+            requests[index].put(('refresh', 0, partition))
+
+    def close(self):
+        """
+        Detiene los procesos de búsqueda.
+        """
+        channels = self._searches.channels
+        for requests in channels.requests:
+            requests.put(None)
+        for process in self._processes:
+            while process.is_alive():
+                # Un proceso puede seguir bloqueado publicando restos de
+                # una búsqueda abandonada.
+                while not channels.results.empty():
+                    channels.results.get()
+                process.join(0.05)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _store_factory(arguments):
+    if arguments.sqlite:
+        return functools.partial(SQLiteBackend, arguments.sqlite)
+    if arguments.sharded:
+        return functools.partial(ShardedFileBackend, arguments.sharded)
+    return None
+
+
+def main(argv=None):
+    """
+    Punto de entrada de la línea de comandos.
+    """
+    parser = argparse.ArgumentParser(
+        description="Búsqueda de habitaciones libres en todos los "
+                    "hoteles.")
+    parser.add_argument('check_in_date')
+    parser.add_argument('check_out_date')
+    parser.add_argument('--location', help="Ubicación preferida.")
+    parser.add_argument('--type', dest='room_type',
+                        help="Tipo de habitación.")
+    parser.add_argument('--per-hotel', type=int, default=1,
+                        help="Máximo de habitaciones por hotel.")
+    parser.add_argument('--workers', type=int,
+                        help="Número de procesos; por omisión uno por "
+                             "núcleo.")
+    parser.add_argument('--sqlite', help="Usar un almacén SQLite.")
+    parser.add_argument('--sharded',
+                        help="Usar archivos JSON repartidos en "
+                             "subdirectorios.")
+    arguments = parser.parse_args(argv)
+    factory = _store_factory(arguments)
+    store = DEFAULT_BACKEND if factory is None else factory()
+    names = list(store.keys('hotel'))
+    store.close()
+    with HotelSearch(names, factory, arguments.workers) as search:
+        for candidate in search.search(arguments.check_in_date,
+                                       arguments.check_out_date,
+                                       arguments.location,
+                                       arguments.room_type,
+                                       arguments.per_hotel):
+            print(json.dumps(candidate, ensure_ascii=False), flush=True)
+
+
+if __name__ == "__main__":
+    main()
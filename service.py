@@ -0,0 +1,321 @@
+"""
+Este módulo define un servicio local de reservas basado en asyncio que
+expone las operaciones de Hotel, Customer y Reservation mediante un
+protocolo de líneas JSON sobre TCP o un socket Unix.
+
+Las solicitudes de reserva concurrentes para un mismo hotel se agrupan en
+micro-lotes que se procesan con Reservation.create_many, y todo el acceso
+al almacén se ejecuta fuera del ciclo de eventos.
+
+Uso:
+    python -m service --port 8765
+    python -m service --unix /tmp/reservas.sock --sqlite reservas.db
+    python -m service --sqlite reservas.db --journal reservas.journal
+"""
+import argparse
+import asyncio
+import json
+import time
+from collections import ChainMap, deque
+from customer import Customer
+from hotel import Hotel
+from journal import JournaledBackend
+from reservation import Reservation
+from storage import DEFAULT_BACKEND, ConflictError, SQLiteBackend
+
+
+class ReservationService:
+    """
+    Servicio de reservas con agrupación de solicitudes por hotel.
+
+    Attributes:
+        store (StorageBackend): Almacén donde se persisten las entidades.
+        batch_window (float): Segundos que se espera para completar un
+        micro-lote después de recibir su primera solicitud.
+        max_batch (int): Tamaño máximo de un micro-lote.
+        hotels (dict): Nombre del hotel a instancia de Hotel.
+        customers (dict): Nombre del cliente a instancia de Customer.
+    """
+
+    def __init__(self, store=None, batch_window=0.002, max_batch=512):
+        """
+        Inicializa el servicio.
+
+        Args:
+            store (StorageBackend, opcional): Almacén de las entidades.
+            batch_window (float, opcional): Ventana de agrupación en
+            segundos.
+            max_batch (int, opcional): Tamaño máximo de un micro-lote.
+        """
+        self.store = DEFAULT_BACKEND if store is None else store
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.hotels = {}
+        self.customers = {}
+        # Las reservas guardan el nombre del hotel al reservar: tras un
+        # cambio de nombre se siguen ubicando por el anterior.
+        self._renamed = {}
+        self.latencies = {}
+        self._queues = {}
+        self._workers = []
+        self._handlers = {
+            'create_hotel': self._create_hotel,
+            'modify_hotel': self._modify_hotel,
+            'create_customer': self._create_customer,
+            'reserve': self._reserve,
+            'cancel': self._cancel,
+            'availability': self._availability,
+            'stats': self._stats,
+        }
+
+    async def handle(self, request):
+        """
+        Atiende una solicitud.
+
+        Args:
+            request (dict): Solicitud con la llave 'op' y los argumentos
+            de la operación.
+
+        Returns:
+            dict: Respuesta con la llave 'ok' y el resultado o el error.
+        """
+        start = time.perf_counter()
+        if not isinstance(request, dict):
+            return {'ok': False,
+                    'error': "La solicitud debe ser un objeto JSON."}
+        operation = request.get('op')
+        handler = self._handlers.get(operation)
+        try:
+            if handler is None:
+                raise ValueError(f"Operación desconocida: {operation}")
+            response = await handler(request)
+            response['ok'] = True
+        except ConflictError as exception:
+            response = {'ok': False, 'error': str(exception),
+                        'conflict': True, 'version': exception.actual}
+        except (KeyError, ValueError) as exception:
+            response = {'ok': False, 'error': str(exception)}
+        # Cualquier otra falla también se responde: el cliente nunca se
+        # queda esperando.
+        # pylint: disable-next=broad-exception-caught
+        except Exception as exception:
+            response = {'ok': False,
+                        'error': f"{type(exception).__name__}: {exception}"}
+        if 'id' in request:
+            response['id'] = request['id']
+        self.latencies.setdefault(operation, deque(maxlen=100000)).append(
+            time.perf_counter() - start)
+        return response
+
+    async def _run(self, function, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, function, *args)
+
+    def _hotel(self, name):
+        if name not in self.hotels:
+            raise KeyError(f"No existe el hotel {name}.")
+        return self.hotels[name]
+
+    async def _create_hotel(self, request):
+        hotel = Hotel(request['name'], request['location'],
+                      request['phone'], store=self.store,
+                      rooms=request.get('rooms'))
+        await self._run(hotel.create_hotel)
+        self.hotels[hotel.name] = hotel
+        return {}
+
+    async def _modify_hotel(self, request):
+        hotel = self._hotel(request['hotel'])
+        # El cliente puede indicar la versión que leyó; si otro la cambió
+        # antes, la solicitud falla con un conflicto.
+        await self._run(hotel.modify_hotel_info, request['name'],
+                        request['location'], request['phone'],
+                        request.get('version'))
+        self.hotels[hotel.name] = self.hotels.pop(request['hotel'])
+        self._renamed[request['hotel']] = hotel
+        return {'version': hotel.version}
+
+    async def _create_customer(self, request):
+        customer = Customer(request['name'], request['email'],
+                            request.get('mobile_phone'),
+                            request.get('address'), store=self.store)
+        await self._run(customer.create_customer)
+        self.customers[customer.name] = customer
+        return {}
+
+    async def _reserve(self, request):
+        hotel = self._hotel(request['hotel'])
+        if request['customer'] not in self.customers:
+            raise KeyError(f"No existe el cliente {request['customer']}.")
+        customer = self.customers[request['customer']]
+        reservation_data = {
+            'room_number': request['room_number'],
+            'check_in_date': request['check_in_date'],
+            'check_out_date': request['check_out_date']
+        }
+        future = asyncio.get_running_loop().create_future()
+        await self._queue_for(hotel).put(
+            (customer, reservation_data, future))
+        return await future
+
+    def _queue_for(self, hotel):
+        queue = self._queues.get(hotel.name)
+        if queue is None:
+            queue = asyncio.Queue()
+            self._queues[hotel.name] = queue
+            self._workers.append(
+                asyncio.create_task(self._batch_worker(hotel, queue)))
+        return queue
+
+    async def _batch_worker(self, hotel, queue):
+        """
+        Agrupa las solicitudes de reserva de un hotel en micro-lotes.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + self.batch_window
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(),
+                                                        timeout))
+                except asyncio.TimeoutError:
+                    break
+            requests = [(customer, data) for customer, data, _ in batch]
+            try:
+                results = await self._run(Reservation.create_many, hotel,
+                                          requests, self.store)
+            # Una falla del almacén solo afecta a este lote; el ciclo
+            # sigue atendiendo al hotel.
+            # pylint: disable-next=broad-exception-caught
+            except Exception as exception:
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(exception)
+                continue
+            for (_, _, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(dict(result))
+
+    async def _cancel(self, request):
+        reservation_id = request['reservation_id']
+        cancelled = await self._run(Reservation.cancel, reservation_id,
+                                    ChainMap(self.hotels, self._renamed),
+                                    self.store)
+        if not cancelled:
+            raise KeyError(f"No existe la reserva {reservation_id}.")
+        return {}
+
+    async def _availability(self, request):
+        hotel = self._hotel(request['hotel'])
+        if 'room_number' in request:
+            available = hotel.is_available(request['room_number'],
+                                           request['check_in_date'],
+                                           request['check_out_date'])
+            return {'available': available}
+        return {'free_rooms': hotel.find_free_rooms(
+            request['check_in_date'], request['check_out_date'],
+            request.get('room_type'), **request.get('attributes', {}))}
+
+    async def _stats(self, request):
+        del request
+        return {'latency': self.latency_report()}
+
+    def latency_report(self):
+        """
+        Resume la latencia observada por operación.
+
+        Returns:
+            dict: Operación a número de solicitudes y percentiles p50, p99
+            y máximo en milisegundos.
+        """
+        report = {}
+        for operation, samples in self.latencies.items():
+            ordered = sorted(samples)
+            count = len(ordered)
+            report[operation] = {
+                'count': count,
+                'p50_ms': ordered[count // 2] * 1000,
+                'p99_ms': ordered[min(count - 1, count * 99 // 100)] * 1000,
+                'max_ms': ordered[-1] * 1000,
+            }
+        return report
+
+    async def serve_client(self, reader, writer):
+        """
+        Atiende una conexión: cada línea es una solicitud JSON y cada
+        respuesta se escribe en una línea en cuanto está lista.
+        """
+        tasks = set()
+
+        async def respond(line):
+            try:
+                request = json.loads(line)
+            except ValueError:
+                response = {'ok': False, 'error': "JSON inválido."}
+            else:
+                response = await self.handle(request)
+            writer.write((json.dumps(response) + "\n").encode('utf-8'))
+
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                task = asyncio.create_task(respond(line))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def start(self, host='127.0.0.1', port=8765, unix_path=None):
+        """
+        Inicia el servidor.
+
+        Returns:
+            asyncio.AbstractServer: El servidor iniciado.
+        """
+        if unix_path is not None:
+            return await asyncio.start_unix_server(self.serve_client,
+                                                   path=unix_path)
+        return await asyncio.start_server(self.serve_client, host, port)
+
+    async def close(self):
+        """
+        Detiene los trabajadores de micro-lotes.
+        """
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers.clear()
+        self._queues.clear()
+
+
+async def _main(arguments):
+    store = SQLiteBackend(arguments.sqlite) if arguments.sqlite else None
+    if arguments.journal:
+        # Al abrirse reaplica lo que quedó en la bitácora tras una caída.
+        store = JournaledBackend(store or DEFAULT_BACKEND, arguments.journal)
+    service = ReservationService(store=store)
+    server = await service.start(arguments.host, arguments.port,
+                                 arguments.unix)
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Servicio de reservas.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', help="Ruta de un socket Unix.")
+    parser.add_argument('--sqlite', help="Usar un almacén SQLite.")
+    parser.add_argument('--journal',
+                        help="Registrar las escrituras en una bitácora "
+                             "con confirmación en grupo.")
+    asyncio.run(_main(parser.parse_args()))
@@ -0,0 +1,396 @@
+"""
+Este módulo define un formato binario versionado para guardar y restaurar
+el estado completo de un hotel (habitaciones, reservas e índices) y tablas
+de clientes sin pasar por JSON.
+
+Un archivo es un encabezado seguido de secciones con prefijo de longitud:
+
+    encabezado:  b'HSNP', versión (u16), tipo (u16)
+    sección:     etiqueta (4 bytes), longitud (u64), contenido
+
+Las cadenas se guardan una sola vez en la sección STRS y el resto del
+archivo las referencia por índice; las fechas son ordinales de 4 bytes.
+Las columnas de reservas y los índices por habitación se guardan como el
+contenido crudo de sus ``array``, de modo que restaurarlos es copiar
+bloques de memoria desde un ``mmap`` y no interpretar millones de objetos.
+Las secciones desconocidas se ignoran al leer.
+
+Uso:
+    python -m snapshot export California.snap -o California.json
+"""
+import argparse
+import contextlib
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+from array import array
+from dates import format_date
+from storage import VERSION as RECORD_VERSION
+
+MAGIC = b'HSNP'
+VERSION = 1
+HOTEL = 1
+CUSTOMERS = 2
+CUSTOMER_FIELDS = ('name', 'email', 'mobile_phone', 'address')
+BOOKING_COLUMNS = ('room', 'guest', 'check_in', 'check_out', 'status',
+                   'free')
+
+_HEADER = struct.Struct('<4sHH')
+_SECTION = struct.Struct('<4sQ')
+_COUNT = struct.Struct('<I')
+_ARRAY = struct.Struct('<cI')
+_NONE = 0xFFFFFFFF
+
+
+class StringTable:
+    """
+    Tabla de cadenas internadas: cada cadena distinta se guarda una vez.
+
+    Attributes:
+        strings (list): Cadenas en el orden de sus índices.
+    """
+
+    def __init__(self):
+        """
+        Inicializa una tabla vacía.
+        """
+        self.strings = []
+        self._ids = {}
+
+    def intern(self, text):
+        """
+        Devuelve el índice de una cadena, agregándola si es nueva.
+        None se representa con un índice reservado.
+        """
+        if text is None:
+            return _NONE
+        string_id = self._ids.get(text)
+        if string_id is None:
+            if "\0" in text:
+                raise ValueError(f"Cadena con carácter nulo: {text!r}")
+            string_id = self._ids[text] = len(self.strings)
+            self.strings.append(text)
+        return string_id
+
+    def intern_all(self, texts):
+        """
+        Devuelve un array con los índices de varias cadenas.
+        """
+        return array('I', (self.intern(text) for text in texts))
+
+    def pack(self):
+        """
+        Codifica la tabla como número de cadenas y cadenas separadas por
+        carácter nulo.
+        """
+        return _COUNT.pack(len(self.strings)) + \
+            "\0".join(self.strings).encode('utf-8')
+
+
+def _pack_array(values):
+    """
+    Codifica un array como código de tipo, número de elementos y bytes en
+    orden little-endian.
+    """
+    if sys.byteorder == 'big':
+        values = values[:]
+        values.byteswap()
+    return _ARRAY.pack(values.typecode.encode('ascii'), len(values)) + \
+        values.tobytes()
+
+
+class _Reader:
+    """
+    Lector secuencial sobre un memoryview de una sección.
+    """
+
+    def __init__(self, view):
+        self.view = view
+        self.position = 0
+
+    def count(self):
+        """
+        Lee un entero sin signo de 4 bytes.
+        """
+        value = _COUNT.unpack_from(self.view, self.position)[0]
+        self.position += _COUNT.size
+        return value
+
+    def array(self):
+        """
+        Lee un array guardado con _pack_array.
+        """
+        typecode, length = _ARRAY.unpack_from(self.view, self.position)
+        self.position += _ARRAY.size
+        values = array(typecode.decode('ascii'))
+        end = self.position + values.itemsize * length
+        # Una sola copia del mmap al array, sin objetos intermedios.
+        values.frombytes(self.view[self.position:end])
+        self.position = end
+        if sys.byteorder == 'big':
+            values.byteswap()
+        return values
+
+    def strings(self):
+        """
+        Lee una tabla de cadenas guardada con StringTable.pack.
+        """
+        if not self.count():
+            return []
+        return str(self.view[self.position:], 'utf-8').split("\0")
+
+    def rest(self):
+        """
+        Devuelve lo que queda de la sección, sin copiarlo.
+        """
+        return self.view[self.position:]
+
+
+def _write(path, kind, strings, sections):
+    """
+    Escribe un snapshot de forma atómica, como storage.write_json: una
+    caída a media escritura deja completo el snapshot anterior.
+    """
+    temporary = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(temporary, 'wb') as file:
+            file.write(_HEADER.pack(MAGIC, VERSION, kind))
+            for tag, payload in (('STRS', strings.pack()),) + \
+                    tuple(sections):
+                file.write(_SECTION.pack(tag.encode('ascii'),
+                                         len(payload)))
+                file.write(payload)
+        os.replace(temporary, path)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+
+
+@contextlib.contextmanager
+def _open(path, kind):
+    """
+    Abre un snapshot con mmap y entrega su tabla de cadenas y un lector
+    por sección; las secciones son vistas sobre el mapa, sin copias.
+
+    Raises:
+        ValueError: Si el archivo no es un snapshot del tipo esperado o
+        su versión no es compatible.
+    """
+    with open(path, 'rb') as file, \
+            mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        view = memoryview(data)
+        sections = {}
+        try:
+            magic, version, found = _HEADER.unpack_from(view, 0)
+            if magic != MAGIC:
+                raise ValueError(f"{path} no es un snapshot.")
+            if version > VERSION:
+                raise ValueError(f"Versión de snapshot no soportada: "
+                                 f"{version}")
+            if found != kind:
+                raise ValueError(f"{path} no contiene el tipo de snapshot "
+                                 f"esperado.")
+            position = _HEADER.size
+            while position < len(view):
+                tag, length = _SECTION.unpack_from(view, position)
+                position += _SECTION.size
+                sections[tag.decode('ascii')] = _Reader(
+                    view[position:position + length])
+                position += length
+            yield sections['STRS'].strings(), sections
+        finally:
+            for section in sections.values():
+                section.view.release()
+            view.release()
+
+
+def write_hotel(path, state):
+    """
+    Guarda el estado de un hotel en un snapshot binario.
+
+    Args:
+        path (str): Ruta del archivo destino.
+        state (dict): Estado con las llaves 'name', 'location', 'phone',
+        'rooms', 'bookings' (resultado de ReservationStore.columns),
+        'schedules' (habitación a (entradas, salidas, filas)), 'nights'
+        (ordinal a máscara de ocupación) y, opcionalmente,
+        'room_attributes' (habitación a sus atributos).
+    """
+    strings = StringTable()
+    meta = [_COUNT.pack(strings.intern(state[field]))
+            for field in ('name', 'location', 'phone')]
+    meta.append(_pack_array(strings.intern_all(state['rooms'])))
+    bookings = state['bookings']
+    columns = [_pack_array(strings.intern_all(bookings['rooms'])),
+               _pack_array(strings.intern_all(bookings['guests']))]
+    columns.extend(_pack_array(bookings[name]) for name in BOOKING_COLUMNS)
+    schedules = [_pack_array(column) for room in state['rooms']
+                 for column in state['schedules'][room]]
+    nights = sorted(state['nights'])
+    width = (len(state['rooms']) + 7) // 8
+    masks = b"".join(state['nights'][night].to_bytes(width, 'little')
+                     for night in nights)
+    sections = [
+        ('META', b"".join(meta)),
+        ('COLS', b"".join(columns)),
+        ('SCHD', b"".join(schedules)),
+        ('OCCU', _pack_array(array('i', nights)) + _COUNT.pack(width) +
+         masks),
+    ]
+    if state.get('room_attributes'):
+        # Pocos datos y de forma libre: basta con JSON.
+        sections.append(('ATTR', json.dumps(
+            state['room_attributes']).encode('utf-8')))
+    _write(path, HOTEL, strings, sections)
+
+
+def read_hotel(path):
+    """
+    Lee el estado de un hotel de un snapshot binario.
+
+    Returns:
+        dict: Estado con el mismo formato que recibe write_hotel.
+    """
+    with _open(path, HOTEL) as (strings, sections):
+        meta = sections['META']
+        state = {field: None if string_id == _NONE else strings[string_id]
+                 for field, string_id in (('name', meta.count()),
+                                          ('location', meta.count()),
+                                          ('phone', meta.count()))}
+        rooms = state['rooms'] = [strings[string_id]
+                                  for string_id in meta.array()]
+        columns = sections['COLS']
+        bookings = state['bookings'] = {
+            'rooms': [strings[string_id] for string_id in columns.array()],
+            'guests': [strings[string_id] for string_id in columns.array()],
+        }
+        for name in BOOKING_COLUMNS:
+            bookings[name] = columns.array()
+        schedules = sections['SCHD']
+        state['schedules'] = {room: (schedules.array(), schedules.array(),
+                                     schedules.array())
+                              for room in rooms}
+        occupancy = sections['OCCU']
+        nights = occupancy.array()
+        width = occupancy.count()
+        masks = occupancy.rest()
+        state['nights'] = {
+            night: int.from_bytes(masks[index * width:(index + 1) * width],
+                                  'little')
+            for index, night in enumerate(nights)}
+        masks.release()
+        attributes = sections.get('ATTR')
+        state['room_attributes'] = {} if attributes is None else \
+            json.loads(str(attributes.rest(), 'utf-8'))
+    return state
+
+
+def hotel_to_json(state):
+    """
+    Convierte el estado de un hotel al registro que guarda create_hotel.
+    """
+    bookings = state['bookings']
+    guests = bookings['guests']
+    guest = bookings['guest']
+    reservations = {}
+    for room in state['rooms']:
+        starts, ends, rows = state['schedules'][room]
+        if starts:
+            reservations[room] = [
+                {'guest_name': guests[guest[row]],
+                 'check_in_date': format_date(check_in),
+                 'check_out_date': format_date(check_out)}
+                for check_in, check_out, row in zip(starts, ends, rows)]
+    record = {RECORD_VERSION: 1,
+              'name': state['name'], 'location': state['location'],
+              'phone': state['phone'], 'rooms': state['rooms'],
+              'reservations': reservations}
+    if state.get('room_attributes'):
+        record['room_attributes'] = state['room_attributes']
+    return record
+
+
+def save_customers(records, path):
+    """
+    Guarda una tabla de clientes en un snapshot binario.
+
+    Args:
+        records (iterable): Registros de clientes como los de
+        Customer.to_dict.
+        path (str): Ruta del archivo destino.
+
+    Returns:
+        int: Número de clientes guardados.
+    """
+    strings = StringTable()
+    fields = array('I')
+    count = 0
+    for record in records:
+        fields.extend(strings.intern(record.get(field))
+                      for field in CUSTOMER_FIELDS)
+        count += 1
+    _write(path, CUSTOMERS, strings,
+           (('CUST', _COUNT.pack(count) + _pack_array(fields)),))
+    return count
+
+
+def load_customers(path):
+    """
+    Lee una tabla de clientes de un snapshot binario.
+
+    Returns:
+        list: Registros de clientes con las llaves de Customer.to_dict.
+    """
+    with _open(path, CUSTOMERS) as (strings, sections):
+        table = sections['CUST']
+        count = table.count()
+        fields = table.array()
+    width = len(CUSTOMER_FIELDS)
+    return [{field: None if value == _NONE else strings[value]
+             for field, value in zip(CUSTOMER_FIELDS,
+                                     fields[row * width:(row + 1) * width])}
+            for row in range(count)]
+
+
+def export_json(path, output):
+    """
+    Exporta un snapshot a JSON: un hotel con el formato de create_hotel o
+    una lista de clientes.
+
+    Args:
+        path (str): Ruta del snapshot.
+        output (file): Archivo de texto destino.
+    """
+    with open(path, 'rb') as file:
+        kind = _HEADER.unpack(file.read(_HEADER.size))[2]
+    if kind == CUSTOMERS:
+        json.dump(load_customers(path), output)
+    else:
+        json.dump(hotel_to_json(read_hotel(path)), output)
+
+
+def main(argv=None):
+    """
+    Punto de entrada de la línea de comandos.
+    """
+    parser = argparse.ArgumentParser(
+        description="Exportación de snapshots binarios a JSON.")
+    parser.add_argument('command', choices=('export',))
+    parser.add_argument('path', help="Snapshot a exportar.")
+    parser.add_argument('-o', '--output',
+                        help="Archivo JSON destino; por omisión la "
+                             "salida estándar.")
+    arguments = parser.parse_args(argv)
+    if arguments.output:
+        with open(arguments.output, 'w', encoding='utf-8') as output:
+            export_json(arguments.path, output)
+    else:
+        export_json(arguments.path, sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,992 @@
+"""
+Este módulo define la interfaz StorageBackend que usan Customer, Hotel y
+Reservation para leer, escribir y eliminar registros, junto con sus
+implementaciones: archivos JSON (el formato original), archivos JSON
+repartidos en subdirectorios, memoria y SQLite.
+
+Cada registro lleva un número de versión en el campo ``version`` que
+compare_and_swap incrementa, de modo que varios escritores pueden
+modificar el mismo registro sin un candado global y sin perder cambios.
+"""
+import contextlib
+import hashlib
+import io
+import json
+import os
+import sqlite3
+import threading
+from batchfiles import BatchFiles
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+VERSION = 'version'
+# Candados por registro para compare_and_swap dentro de un proceso.
+_SWAP_LOCKS = [threading.Lock() for _ in range(64)]
+
+
+class ConflictError(Exception):
+    """
+    Se lanza cuando un registro cambió desde la versión con que se leyó,
+    de modo que aplicar la modificación sobrescribiría la de otro
+    escritor.
+
+    Attributes:
+        kind (str): Tipo de entidad.
+        key (str): Llave de la entidad.
+        expected (int): Versión con que se leyó el registro.
+        actual (int): Versión vigente del registro.
+    """
+
+    def __init__(self, kind, key, expected, actual):
+        super().__init__(f"El registro {kind} {key} cambió: se esperaba "
+                         f"la versión {expected} y está en la {actual}.")
+        self.kind = kind
+        self.key = key
+        self.expected = expected
+        self.actual = actual
+
+
+def merge_patch(record, changes):
+    """
+    Aplica un parche de fusión JSON (RFC 7396) sobre un registro.
+
+    Los diccionarios anidados se fusionan recursivamente, un valor None
+    elimina la llave y cualquier otro valor la reemplaza.
+
+    Args:
+        record (dict): Registro a modificar; se modifica en su lugar.
+        changes (dict): Campos que cambiaron.
+
+    Returns:
+        dict: El registro modificado.
+    """
+    for name, value in changes.items():
+        if value is None:
+            record.pop(name, None)
+        elif isinstance(value, dict):
+            current = record.get(name)
+            if not isinstance(current, dict):
+                current = record[name] = {}
+            merge_patch(current, value)
+        else:
+            record[name] = value
+    return record
+
+
+def versioned_patch(kind, key, record, expected, changes):
+    """
+    Valida la versión de un registro y devuelve el parche que lo
+    modifica con la versión siguiente.
+
+    Args:
+        kind (str): Tipo de entidad.
+        key (str): Llave de la entidad.
+        record (dict): Contenido vigente del registro; los registros sin
+        versión están en la versión 0.
+        expected (int): Versión con que se leyó el registro, o None para
+        aceptar cualquiera.
+        changes (dict): Parche de fusión (ver merge_patch).
+
+    Returns:
+        dict: El parche con la nueva versión.
+
+    Raises:
+        ConflictError: Si el registro no está en la versión esperada.
+    """
+    actual = record.get(VERSION, 0)
+    if expected is not None and actual != expected:
+        raise ConflictError(kind, key, expected, actual)
+    patch = dict(changes)
+    patch[VERSION] = actual + 1
+    return patch
+
+
+def _apply_versioned(record, patch, replace=False):
+    # La versión va primero para que Hotel.load la lea sin recorrer las
+    # reservas.
+    return {VERSION: patch[VERSION],
+            **(patch if replace else merge_patch(record, patch))}
+
+
+def _swap_lock(kind, key):
+    return _SWAP_LOCKS[hash((kind, key)) % len(_SWAP_LOCKS)]
+
+
+def write_json(path, record):
+    """
+    Escribe un registro en un archivo JSON de forma atómica.
+
+    El contenido se escribe en un archivo temporal de la misma carpeta y
+    se renombra sobre el destino, de modo que una caída a media escritura
+    deja la versión anterior completa en lugar de un archivo truncado.
+    """
+    temporary = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(temporary, 'w', encoding='utf-8') as file:
+            json.dump(record, file)
+        os.replace(temporary, path)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+
+
+class StorageBackend:
+    """
+    Interfaz común de almacenamiento de registros.
+
+    Un registro es un diccionario serializable a JSON identificado por su
+    tipo de entidad ('customer', 'hotel', 'reservation', ...) y una llave.
+    """
+
+    def put(self, kind, key, record):
+        """
+        Guarda un registro, reemplazando la versión anterior.
+
+        Args:
+            kind (str): Tipo de entidad.
+            key (str): Llave de la entidad.
+            record (dict): Contenido del registro.
+        """
+        raise NotImplementedError
+
+    def put_many(self, kind, records):
+        """
+        Guarda varios registros del mismo tipo.
+
+        Args:
+            kind (str): Tipo de entidad.
+            records (iterable): Pares (llave, registro).
+        """
+        for key, record in records:
+            self.put(kind, key, record)
+
+    def update(self, kind, key, changes):
+        """
+        Modifica solo los campos indicados de un registro.
+
+        Por omisión lee, fusiona y reescribe el registro con el mismo
+        candado por registro que compare_and_swap; los almacenes que
+        pueden modificar un registro en su lugar lo sobrescriben.
+
+        Args:
+            kind (str): Tipo de entidad.
+            key (str): Llave de la entidad.
+            changes (dict): Parche de fusión (ver merge_patch).
+
+        Raises:
+            KeyError: Si el registro no existe.
+        """
+        with _swap_lock(kind, key):
+            self.put(kind, key, merge_patch(self.get(kind, key), changes))
+
+    def compare_and_swap(self, kind, key, expected, changes,
+                         replace=False):
+        """
+        Modifica un registro solo si sigue en la versión esperada e
+        incrementa su versión.
+
+        Por omisión lee y reescribe el registro con un candado por
+        registro, lo que basta dentro de un proceso; los almacenes que
+        comparten registros entre procesos lo sobrescriben.
+
+        Args:
+            kind (str): Tipo de entidad.
+            key (str): Llave de la entidad.
+            expected (int): Versión con que se leyó el registro, o None
+            para aceptar cualquiera.
+            changes (dict): Parche de fusión (ver merge_patch).
+            replace (bool, opcional): Si ``changes`` es el registro
+            completo que reemplaza al vigente.
+
+        Returns:
+            int: La nueva versión del registro.
+
+        Raises:
+            KeyError: Si el registro no existe.
+            ConflictError: Si otro escritor lo modificó antes.
+        """
+        with _swap_lock(kind, key):
+            record = self.get(kind, key)
+            patch = versioned_patch(kind, key, record, expected, changes)
+            self.put(kind, key, _apply_versioned(record, patch, replace))
+        return patch[VERSION]
+
+    def put_versioned(self, kind, key, record):
+        """
+        Guarda un registro completo con una versión mayor que la del
+        registro que reemplaza, de modo que quien haya leído el anterior
+        detecte el cambio.
+
+        Args:
+            kind (str): Tipo de entidad.
+            key (str): Llave de la entidad.
+            record (dict): Contenido del registro, sin versión.
+
+        Returns:
+            int: La versión del registro guardado.
+        """
+        try:
+            return self.compare_and_swap(kind, key, None, record,
+                                         replace=True)
+        except KeyError:
+            self.put(kind, key, {VERSION: 1, **record})
+            return 1
+
+    def get(self, kind, key):
+        """
+        Lee un registro.
+
+        Args:
+            kind (str): Tipo de entidad.
+            key (str): Llave de la entidad.
+
+        Returns:
+            dict: El contenido del registro.
+
+        Raises:
+            KeyError: Si el registro no existe.
+        """
+        raise NotImplementedError
+
+    def exists(self, kind, key):
+        """
+        Indica si existe un registro.
+        """
+        raise NotImplementedError
+
+    def delete(self, kind, key):
+        """
+        Elimina un registro.
+
+        Raises:
+            KeyError: Si el registro no existe.
+        """
+        raise NotImplementedError
+
+    def delete_many(self, kind, keys):
+        """
+        Elimina varios registros del mismo tipo; los que no existen se
+        ignoran.
+
+        Args:
+            kind (str): Tipo de entidad.
+            keys (iterable): Llaves de los registros.
+        """
+        for key in keys:
+            try:
+                self.delete(kind, key)
+            except KeyError:
+                continue
+
+    def keys(self, kind):
+        """
+        Lista las llaves vigentes de un tipo de entidad.
+        """
+        raise NotImplementedError
+
+    def scan(self, kind):
+        """
+        Recorre los registros vigentes de un tipo de entidad.
+
+        Yields:
+            tuple: Pares (llave, registro).
+        """
+        for key in self.keys(kind):
+            try:
+                yield key, self.get(kind, key)
+            except KeyError:
+                continue
+
+    def scan_range(self, kind, low, high):
+        """
+        Recorre en orden los registros cuya llave cae en [low, high).
+
+        Con llaves ordenables por tiempo (ver ids.bounds) es el recorrido
+        de los registros creados en un intervalo. Por omisión ordena las
+        llaves en memoria; los almacenes con un índice ordenado lo
+        sobrescriben.
+
+        Args:
+            kind (str): Tipo de entidad.
+            low (str): Llave inicial, incluida.
+            high (str): Llave final, excluida.
+
+        Yields:
+            tuple: Pares (llave, registro) en orden de llave.
+        """
+        for key in sorted(key for key in self.keys(kind)
+                          if low <= key < high):
+            try:
+                yield key, self.get(kind, key)
+            except KeyError:
+                continue
+
+    # pylint: disable-next=unused-argument
+    def open_record(self, kind, key):
+        """
+        Abre un registro como archivo binario de JSON para leerlo por
+        partes sin cargarlo completo.
+
+        Returns:
+            file: El archivo abierto, o None si el almacén no guarda los
+            registros como documentos JSON individuales.
+
+        Raises:
+            KeyError: Si el registro no existe.
+        """
+        return None
+
+    # pylint: disable-next=unused-argument
+    def stamp(self, kind, key):
+        """
+        Devuelve una marca que cambia cada vez que cambia el registro
+        (``mtime`` del archivo, versión, posición en la bitácora...).
+
+        Returns:
+            object: La marca, o None si el almacén no puede calcularla.
+        """
+        return None
+
+    def close(self):
+        """
+        Libera los recursos del almacén.
+        """
+
+
+class JsonFileBackend(StorageBackend):
+    """
+    Almacén de un archivo JSON por entidad, con los mismos nombres de
+    archivo que usaba originalmente cada clase.
+
+    put_many guarda las llaves nuevas en un solo archivo de la carpeta
+    ``batches`` (ver BatchFiles) en lugar de un archivo por registro. El
+    archivo propio de una llave prevalece sobre los lotes: modificar un
+    registro de un lote lo copia antes a su archivo, y eliminarlo lo
+    marca como eliminado en un lote nuevo. Los lotes no se compactan.
+
+    Attributes:
+        directory (str): Carpeta donde se guardan los archivos.
+        batches (BatchFiles): Lotes guardados con put_many.
+    """
+
+    BATCHES = "batches"
+
+    PATTERNS = {
+        'customer': ("", "_customer.json"),
+        'hotel': ("", "_hotel.json"),
+        'reservation': ("reservation_", ".json"),
+    }
+
+    def __init__(self, directory="."):
+        """
+        Inicializa el almacén.
+
+        Args:
+            directory (str, opcional): Carpeta donde se guardan los
+            archivos. Por omisión el directorio de trabajo.
+        """
+        self.directory = directory
+        self.batches = BatchFiles(os.path.join(directory, self.BATCHES))
+
+    def _affixes(self, kind):
+        return self.PATTERNS.get(kind, ("", f"_{kind}.json"))
+
+    def filename(self, kind, key):
+        """
+        Devuelve la ruta del archivo de un registro.
+        """
+        prefix, suffix = self._affixes(kind)
+        return os.path.join(self.directory, f"{prefix}{key}{suffix}")
+
+    def put(self, kind, key, record):
+        write_json(self.filename(kind, key), record)
+
+    def put_many(self, kind, records):
+        # Una llave que ya tiene archivo propio o aparece en un lote se
+        # reescribe en su archivo, que prevalece sobre los lotes.
+        index = self.batches.index(kind)
+        entries = []
+        for key, record in records:
+            if key in index or os.path.exists(self.filename(kind, key)):
+                self.put(kind, key, record)
+            else:
+                entries.append((key, json.dumps(record).encode('utf-8')))
+        if entries:
+            self.batches.write(kind, entries)
+
+    def get(self, kind, key):
+        try:
+            with open(self.filename(kind, key), 'r',
+                      encoding='utf-8') as file:
+                return json.load(file)
+        except FileNotFoundError as exception:
+            data = self.batches.read(kind, key)
+            if data is None:
+                raise KeyError((kind, key)) from exception
+            return json.loads(data)
+
+    def exists(self, kind, key):
+        return os.path.exists(self.filename(kind, key)) or \
+            self.batches.index(kind).get(key) is not None
+
+    def delete(self, kind, key):
+        try:
+            os.remove(self.filename(kind, key))
+            found = True
+        except FileNotFoundError:
+            found = False
+        if self.batches.index(kind).get(key) is not None:
+            self.batches.write(kind, [(key, b"null")])
+            found = True
+        if not found:
+            raise KeyError((kind, key))
+
+    def open_record(self, kind, key):
+        try:
+            return open(self.filename(kind, key), 'rb')
+        except FileNotFoundError as exception:
+            data = self.batches.read(kind, key)
+            if data is None:
+                raise KeyError((kind, key)) from exception
+            return io.BytesIO(data)
+
+    def _extract(self, kind, key):
+        """
+        Copia un registro de un lote a su propio archivo, sin reemplazar
+        el archivo si otro escritor lo creó antes.
+
+        Returns:
+            bool: False si el registro no está en un lote.
+        """
+        data = self.batches.read(kind, key)
+        if data is None:
+            return False
+        path = self.filename(kind, key)
+        temporary = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(temporary, 'wb') as file:
+                file.write(data)
+            os.link(temporary, path)
+        except FileExistsError:
+            pass
+        finally:
+            os.remove(temporary)
+        return True
+
+    @contextlib.contextmanager
+    def _locked(self, kind, key):
+        """
+        Lee un registro con un candado exclusivo entre procesos que dura
+        hasta reescribirlo.
+
+        Yields:
+            tuple: (ruta, registro).
+        """
+        path = self.filename(kind, key)
+        while True:
+            try:
+                file = open(path, 'r', encoding='utf-8')
+            except FileNotFoundError as exception:
+                if self._extract(kind, key):
+                    continue
+                raise KeyError((kind, key)) from exception
+            with file:
+                # El candado es del archivo abierto: si mientras se
+                # esperaba otro escritor lo reemplazó o lo eliminó, se
+                # vuelve a intentar con el vigente.
+                fcntl.flock(file, fcntl.LOCK_EX)
+                try:
+                    current = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                opened = os.fstat(file.fileno())
+                if (current.st_dev, current.st_ino) != \
+                        (opened.st_dev, opened.st_ino):
+                    continue
+                yield path, json.load(file)
+                return
+
+    def update(self, kind, key, changes):
+        if fcntl is None:
+            super().update(kind, key, changes)
+            return
+        with self._locked(kind, key) as (path, record):
+            write_json(path, merge_patch(record, changes))
+
+    def compare_and_swap(self, kind, key, expected, changes,
+                         replace=False):
+        if fcntl is None:
+            return super().compare_and_swap(kind, key, expected, changes,
+                                            replace)
+        with self._locked(kind, key) as (path, record):
+            patch = versioned_patch(kind, key, record, expected, changes)
+            write_json(path, _apply_versioned(record, patch, replace))
+        return patch[VERSION]
+
+    def stamp(self, kind, key):
+        # Cada escritura renombra un archivo nuevo sobre el anterior, así
+        # que el inodo cambia aunque el mtime no avance.
+        try:
+            status = os.stat(self.filename(kind, key))
+        except FileNotFoundError:
+            # Los lotes no se reescriben: la posición identifica el
+            # contenido.
+            return self.batches.index(kind).get(key)
+        return (status.st_ino, status.st_mtime_ns, status.st_size)
+
+    def _iter_keys(self, kind):
+        prefix, suffix = self._affixes(kind)
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                name = entry.name
+                if name.startswith(prefix) and name.endswith(suffix) \
+                   and len(name) > len(prefix) + len(suffix):
+                    yield name[len(prefix):-len(suffix)]
+
+    def keys(self, kind):
+        keys = list(self._iter_keys(kind))
+        own = set(keys)
+        keys.extend(key for key, location in self.batches.index(kind).items()
+                    if location is not None and key not in own)
+        return keys
+
+    def scan(self, kind):
+        for key in self.keys(kind):
+            try:
+                yield key, self.get(kind, key)
+            except KeyError:
+                continue
+
+
+class ShardedFileBackend(JsonFileBackend):
+    """
+    Almacén de un archivo JSON por entidad repartido en subdirectorios.
+
+    Cada archivo conserva su nombre original pero vive en
+    ``<directorio>/ab/cd/``, donde ``abcd`` son los primeros dígitos
+    hexadecimales de un hash de la llave, de modo que ningún directorio
+    acumula más de unos cuantos cientos de archivos.
+
+    Las llaves vigentes se mantienen en memoria y en un manifiesto
+    (``manifest.jsonl``) al que solo se agregan altas y bajas; ``exists``,
+    ``keys`` y las lecturas de llaves inexistentes se resuelven sin tocar
+    el disco. El manifiesto supone que un solo proceso escribe en el
+    directorio.
+
+    Attributes:
+        directory (str): Carpeta raíz del almacén.
+        levels (int): Niveles de subdirectorios.
+        manifest (dict): Tipo de entidad a conjunto de llaves vigentes.
+    """
+
+    MANIFEST = "manifest.jsonl"
+
+    def __init__(self, directory=".", levels=2):
+        """
+        Abre el almacén, cargando su manifiesto o reconstruyéndolo a
+        partir de los archivos si no existe.
+
+        Args:
+            directory (str, opcional): Carpeta raíz del almacén.
+            levels (int, opcional): Niveles de subdirectorios (dos dígitos
+            hexadecimales por nivel).
+        """
+        super().__init__(directory)
+        self.levels = levels
+        self.manifest = {}
+        self._shards = set()
+        self._removed = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._manifest_path = os.path.join(directory, self.MANIFEST)
+        if os.path.exists(self._manifest_path):
+            self._load_manifest()
+        else:
+            self.rebuild_manifest()
+        self._journal = self._open_manifest()
+
+    def _open_manifest(self):
+        # El manifiesto queda abierto para anexar altas y bajas; se
+        # cierra al compactarlo o con close.
+        # pylint: disable-next=consider-using-with
+        return open(self._manifest_path, 'a', encoding='utf-8')
+
+    def _shard(self, key):
+        digest = hashlib.blake2b(key.encode('utf-8'),
+                                 digest_size=self.levels).hexdigest()
+        return os.path.join(*(digest[2 * level:2 * level + 2]
+                              for level in range(self.levels)))
+
+    def filename(self, kind, key):
+        prefix, suffix = self._affixes(kind)
+        return os.path.join(self.directory, self._shard(key),
+                            f"{prefix}{key}{suffix}")
+
+    def _load_manifest(self):
+        valid = 0
+        with open(self._manifest_path, 'r+b') as file:
+            for line in file:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    operation, kind, key = json.loads(line)
+                except ValueError:
+                    break
+                valid += len(line)
+                keys = self.manifest.setdefault(kind, set())
+                if operation == '+':
+                    keys.add(key)
+                else:
+                    keys.discard(key)
+                    self._removed += 1
+            # Una línea truncada por una caída a media escritura se
+            # descarta para que la siguiente empiece en una línea nueva.
+            file.truncate(valid)
+
+    def _kind_of(self, name):
+        for kind, (prefix, suffix) in self.PATTERNS.items():
+            if name.startswith(prefix) and name.endswith(suffix) \
+               and len(name) > len(prefix) + len(suffix):
+                return kind, name[len(prefix):-len(suffix)]
+        return None
+
+    def rebuild_manifest(self):
+        """
+        Reconstruye el manifiesto recorriendo los subdirectorios.
+
+        Solo se reconocen los tipos de PATTERNS; los registros de otros
+        tipos no pueden distinguirse por su nombre de archivo.
+        """
+        manifest = {}
+        for root, _, names in os.walk(self.directory):
+            if root == self.directory:
+                continue
+            for name in names:
+                found = self._kind_of(name)
+                if found is not None:
+                    manifest.setdefault(found[0], set()).add(found[1])
+        self.manifest = manifest
+        self._write_manifest()
+
+    def _write_manifest(self):
+        temporary = self._manifest_path + ".tmp"
+        with open(temporary, 'w', encoding='utf-8') as file:
+            for kind, keys in self.manifest.items():
+                for key in keys:
+                    file.write(json.dumps(['+', kind, key]) + "\n")
+        os.replace(temporary, self._manifest_path)
+        self._removed = 0
+
+    def _record(self, operation, kind, key):
+        self._journal.write(json.dumps([operation, kind, key]) + "\n")
+        self._journal.flush()
+
+    def compact_manifest(self):
+        """
+        Reescribe el manifiesto solo con las llaves vigentes.
+        """
+        with self._lock:
+            self._journal.close()
+            self._write_manifest()
+            self._journal = self._open_manifest()
+
+    def put(self, kind, key, record):
+        self.put_many(kind, ((key, record),))
+
+    def put_many(self, kind, records):
+        for key, record in records:
+            path = self.filename(kind, key)
+            shard = os.path.dirname(path)
+            if shard not in self._shards:
+                os.makedirs(shard, exist_ok=True)
+                self._shards.add(shard)
+            write_json(path, record)
+            with self._lock:
+                keys = self.manifest.setdefault(kind, set())
+                if key not in keys:
+                    keys.add(key)
+                    self._record('+', kind, key)
+
+    def get(self, kind, key):
+        if key not in self.manifest.get(kind, ()):
+            raise KeyError((kind, key))
+        return super().get(kind, key)
+
+    def open_record(self, kind, key):
+        if key not in self.manifest.get(kind, ()):
+            raise KeyError((kind, key))
+        return super().open_record(kind, key)
+
+    def exists(self, kind, key):
+        return key in self.manifest.get(kind, ())
+
+    def delete(self, kind, key):
+        with self._lock:
+            keys = self.manifest.get(kind, set())
+            if key not in keys:
+                raise KeyError((kind, key))
+            keys.discard(key)
+            self._record('-', kind, key)
+            self._removed += 1
+            compact = self._removed > max(1024, sum(
+                len(live) for live in self.manifest.values()))
+        try:
+            os.remove(self.filename(kind, key))
+        except FileNotFoundError:
+            pass
+        if compact:
+            self.compact_manifest()
+
+    def keys(self, kind):
+        with self._lock:
+            return list(self.manifest.get(kind, ()))
+
+    def scan(self, kind):
+        for key in self.keys(kind):
+            try:
+                yield key, self.get(kind, key)
+            except KeyError:
+                continue
+
+    def close(self):
+        with self._lock:
+            if not self._journal.closed:
+                self._journal.close()
+
+
+class MemoryBackend(StorageBackend):
+    """
+    Almacén en memoria, útil para pruebas y procesos de corta vida.
+
+    Los registros se copian al guardarse y al leerse para que las
+    modificaciones del llamador no alteren el contenido almacenado.
+    """
+
+    def __init__(self):
+        """
+        Inicializa un almacén vacío.
+        """
+        self.records = {}
+        self.versions = {}
+
+    def put(self, kind, key, record):
+        self.records[(kind, key)] = json.loads(json.dumps(record))
+        self.versions[(kind, key)] = self.versions.get((kind, key), 0) + 1
+
+    def update(self, kind, key, changes):
+        with _swap_lock(kind, key):
+            merge_patch(self.records[(kind, key)],
+                        json.loads(json.dumps(changes)))
+            self.versions[(kind, key)] += 1
+
+    def compare_and_swap(self, kind, key, expected, changes,
+                         replace=False):
+        with _swap_lock(kind, key):
+            record = self.records[(kind, key)]
+            patch = versioned_patch(kind, key, record, expected, changes)
+            self.records[(kind, key)] = json.loads(json.dumps(
+                _apply_versioned(record, patch, replace)))
+            self.versions[(kind, key)] += 1
+        return patch[VERSION]
+
+    def get(self, kind, key):
+        return json.loads(json.dumps(self.records[(kind, key)]))
+
+    def exists(self, kind, key):
+        return (kind, key) in self.records
+
+    def delete(self, kind, key):
+        del self.records[(kind, key)]
+        self.versions[(kind, key)] += 1
+
+    def stamp(self, kind, key):
+        if (kind, key) not in self.records:
+            return None
+        return self.versions[(kind, key)]
+
+    def keys(self, kind):
+        return [key for entry_kind, key in self.records if entry_kind == kind]
+
+
+class SQLiteBackend(StorageBackend):
+    """
+    Almacén en una base de datos SQLite en modo WAL.
+
+    Los registros viven en una tabla sin rowid cuya llave primaria es
+    (kind, key), de modo que las búsquedas y los recorridos por tipo usan
+    el índice de la llave primaria.
+
+    Attributes:
+        path (str): Ruta del archivo de la base de datos.
+    """
+
+    def __init__(self, path):
+        """
+        Abre o crea la base de datos.
+
+        Args:
+            path (str): Ruta del archivo de la base de datos.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        # Escrituras hechas por esta conexión; ver stamp.
+        self._writes = 0
+        self._connection = sqlite3.connect(path, check_same_thread=False,
+                                           isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS records ("
+            " kind TEXT NOT NULL,"
+            " key TEXT NOT NULL,"
+            " data TEXT NOT NULL,"
+            " PRIMARY KEY (kind, key)"
+            ") WITHOUT ROWID")
+
+    def put(self, kind, key, record):
+        with self._lock:
+            self._writes += 1
+            self._connection.execute(
+                "INSERT OR REPLACE INTO records (kind, key, data) "
+                "VALUES (?, ?, ?)", (kind, key, json.dumps(record)))
+
+    def put_many(self, kind, records):
+        rows = [(kind, key, json.dumps(record)) for key, record in records]
+        with self._lock:
+            self._writes += 1
+            self._connection.execute("BEGIN")
+            try:
+                self._connection.executemany(
+                    "INSERT OR REPLACE INTO records (kind, key, data) "
+                    "VALUES (?, ?, ?)", rows)
+            except sqlite3.Error:
+                self._connection.execute("ROLLBACK")
+                raise
+            self._connection.execute("COMMIT")
+
+    def update(self, kind, key, changes):
+        # json_patch implementa RFC 7396 dentro de SQLite, sin que el
+        # registro completo cruce a Python.
+        with self._lock:
+            self._writes += 1
+            cursor = self._connection.execute(
+                "UPDATE records SET data = json_patch(data, ?) "
+                "WHERE kind = ? AND key = ?",
+                (json.dumps(changes), kind, key))
+        if cursor.rowcount == 0:
+            raise KeyError((kind, key))
+
+    def compare_and_swap(self, kind, key, expected, changes,
+                         replace=False):
+        # BEGIN IMMEDIATE toma el candado de escritura de la base antes
+        # de leer, así que ningún otro proceso cambia el registro entre
+        # la comparación y la escritura.
+        with self._lock:
+            self._writes += 1
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._connection.execute(
+                    "SELECT data FROM records WHERE kind = ? AND key = ?",
+                    (kind, key)).fetchone()
+                if row is None:
+                    raise KeyError((kind, key))
+                record = json.loads(row[0])
+                patch = versioned_patch(kind, key, record, expected,
+                                        changes)
+                data = json.dumps(_apply_versioned(record, patch,
+                                                   replace))
+                self._connection.execute(
+                    "UPDATE records SET data = ? WHERE kind = ? AND "
+                    "key = ?", (data, kind, key))
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+            self._connection.execute("COMMIT")
+        return patch[VERSION]
+
+    def get(self, kind, key):
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT data FROM records WHERE kind = ? AND key = ?",
+                (kind, key)).fetchone()
+        if row is None:
+            raise KeyError((kind, key))
+        return json.loads(row[0])
+
+    def exists(self, kind, key):
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT 1 FROM records WHERE kind = ? AND key = ?",
+                (kind, key)).fetchone()
+        return row is not None
+
+    def delete(self, kind, key):
+        with self._lock:
+            self._writes += 1
+            cursor = self._connection.execute(
+                "DELETE FROM records WHERE kind = ? AND key = ?",
+                (kind, key))
+        if cursor.rowcount == 0:
+            raise KeyError((kind, key))
+
+    def delete_many(self, kind, keys):
+        rows = [(kind, key) for key in keys]
+        with self._lock:
+            self._writes += 1
+            self._connection.execute("BEGIN")
+            try:
+                self._connection.executemany(
+                    "DELETE FROM records WHERE kind = ? AND key = ?", rows)
+            except sqlite3.Error:
+                self._connection.execute("ROLLBACK")
+                raise
+            self._connection.execute("COMMIT")
+
+    def stamp(self, kind, key):
+        # La marca es de toda la base: cambia con las escrituras de esta
+        # conexión y, según data_version, con las que otra conexión
+        # confirme. Invalida de más, pero nunca deja pasar un cambio.
+        with self._lock:
+            changes = self._connection.execute(
+                "PRAGMA data_version").fetchone()[0]
+            return (changes, self._writes)
+
+    def keys(self, kind):
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT key FROM records WHERE kind = ? ORDER BY key",
+                (kind,)).fetchall()
+        return [row[0] for row in rows]
+
+    def scan(self, kind):
+        # Un cursor propio para recorrer la tabla sin cargarla completa.
+        cursor = sqlite3.connect(self.path).execute(
+            "SELECT key, data FROM records WHERE kind = ? ORDER BY key",
+            (kind,))
+        try:
+            for key, data in cursor:
+                yield key, json.loads(data)
+        finally:
+            cursor.connection.close()
+
+    def scan_range(self, kind, low, high):
+        # Recorre solo el tramo del índice de la llave primaria.
+        cursor = sqlite3.connect(self.path).execute(
+            "SELECT key, data FROM records WHERE kind = ? AND key >= ? "
+            "AND key < ? ORDER BY key", (kind, low, high))
+        try:
+            for key, data in cursor:
+                yield key, json.loads(data)
+        finally:
+            cursor.connection.close()
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+DEFAULT_BACKEND = JsonFileBackend()
@@ -0,0 +1,59 @@
+"""
+Este módulo contiene pruebas unitarias para la clase RoomSchedule.
+"""
+import unittest
+from availability import RoomSchedule
+
+
+class TestRoomSchedule(unittest.TestCase):
+    """
+    Pruebas unitarias para la clase RoomSchedule.
+    """
+
+    def setUp(self):
+        """
+        Prepara el contexto necesario para las pruebas.
+        """
+        self.schedule = RoomSchedule()
+
+    def test_add_keeps_intervals_sorted(self):
+        """
+        Verifica que las estancias se mantengan ordenadas por entrada.
+        """
+        print("\nPrueba de índice de estancias: Verificando que las "
+              "estancias se mantengan ordenadas.")
+        self.assertTrue(self.schedule.add(20, 25, 2))
+        self.assertTrue(self.schedule.add(10, 15, 1))
+        self.assertTrue(self.schedule.add(15, 20, 3))
+        self.assertEqual(list(self.schedule.starts), [10, 15, 20])
+        self.assertEqual(list(self.schedule.ends), [15, 20, 25])
+        self.assertEqual(list(self.schedule.rows), [1, 3, 2])
+
+    def test_overlapping_interval_is_rejected(self):
+        """
+        Verifica que no se acepten estancias traslapadas.
+        """
+        print("Prueba de índice de estancias: Verificando que NO se "
+              "acepten estancias traslapadas.")
+        self.schedule.add(10, 15, 1)
+        self.assertFalse(self.schedule.add(14, 16, 2))
+        self.assertFalse(self.schedule.add(8, 11, 2))
+        self.assertFalse(self.schedule.add(5, 30, 2))
+        self.assertEqual(len(self.schedule), 1)
+
+    def test_remove(self):
+        """
+        Verifica que se puedan eliminar estancias por fecha de entrada.
+        """
+        print("Prueba de índice de estancias: Verificando que se puedan "
+              "eliminar estancias.")
+        self.schedule.add(10, 15, 1)
+        self.assertIsNone(self.schedule.remove(11))
+        self.assertEqual(self.schedule.remove(10),
+                         (10, 15, 1))
+        self.assertIsNone(self.schedule.remove())
+        self.assertTrue(self.schedule.is_available(10, 15))
+
+
+if __name__ == "__main__":
+    unittest.main()
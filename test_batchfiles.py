@@ -0,0 +1,64 @@
+"""
+Este módulo contiene pruebas unitarias para la clase BatchFiles.
+"""
+import os
+import shutil
+import tempfile
+import unittest
+from batchfiles import BatchFiles
+
+
+class TestBatchFiles(unittest.TestCase):
+    """
+    Pruebas unitarias para la clase BatchFiles.
+    """
+
+    def setUp(self):
+        """
+        Prepara el contexto necesario para las pruebas.
+        """
+        self.directory = tempfile.mkdtemp()
+        self.folder = os.path.join(self.directory, "batches")
+
+    def test_write_and_read(self):
+        """
+        Verifica que los registros de un lote se lean por su llave.
+        """
+        print("\\nPrueba de lotes: Verificando la lectura por llave.")
+        batches = BatchFiles(self.folder)
+        self.assertEqual(batches.index('reservation'), {})
+        batches.write('reservation', [('a', b'{"n": 1}'),
+                                      ('b\\tc', b'{"n": 2}')])
+        batches.write('hotel', [('a', b'{}')])
+        self.assertEqual(batches.read('reservation', 'a'), b'{"n": 1}')
+        self.assertEqual(batches.read('reservation', 'b\\tc'), b'{"n": 2}')
+        self.assertEqual(batches.read('hotel', 'a'), b'{}')
+        self.assertIsNone(batches.read('reservation', 'x'))
+        self.assertEqual(len(os.listdir(self.folder)), 2)
+
+    def test_deletions_and_other_processes(self):
+        """
+        Verifica que las eliminaciones prevalezcan y que se lean los
+        lotes que escribe otra instancia.
+        """
+        print("Prueba de lotes: Verificando las eliminaciones y los "
+              "lotes de otros procesos.")
+        first = BatchFiles(self.folder)
+        second = BatchFiles(self.folder)
+        first.write('reservation', [('a', b'1'), ('b', b'2')])
+        self.assertEqual(second.read('reservation', 'b'), b'2')
+        second.write('reservation', [('a', b'null')])
+        first.write('reservation', [('a', b'3')])
+        for batches in (first, second, BatchFiles(self.folder)):
+            self.assertIsNone(batches.read('reservation', 'a'))
+            self.assertIsNone(batches.index('reservation')['a'])
+
+    def tearDown(self):
+        """
+        Limpiar después de las pruebas.
+        """
+        shutil.rmtree(self.directory)
+
+
+if __name__ == "__main__":
+    unittest.main()
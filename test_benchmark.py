@@ -0,0 +1,86 @@
+"""
+Este módulo contiene pruebas unitarias para la suite de benchmarks.
+"""
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from benchmark import (SCENARIOS, compare, generate_stays, main,
+                       run_scenario, run_writers)
+
+
+class TestBenchmark(unittest.TestCase):
+    """
+    Pruebas unitarias para el módulo benchmark.
+    """
+
+    def test_generated_stays_do_not_overlap(self):
+        """
+        Verifica que las estancias generadas se puedan reservar todas.
+        """
+        print("\nPrueba de benchmark: Verificando que las estancias "
+              "generadas no se traslapen.")
+        stays = generate_stays(30, ['101', '102', '103'])
+        self.assertEqual(len(stays), 30)
+        self.assertEqual(len(set(stays)), 30)
+        result = run_scenario('reserve_room', 30, 3, measure_memory=False)
+        self.assertEqual(result['operations'], 30)
+
+    def test_every_scenario_reports_metrics(self):
+        """
+        Verifica que cada escenario reporte ops/s, latencias y memoria.
+        """
+        print("Prueba de benchmark: Verificando que cada escenario "
+              "reporte sus métricas.")
+        for name in SCENARIOS:
+            with self.subTest(scenario=name):
+                result = run_scenario(name, 20, 3)
+                self.assertGreater(result['ops_per_second'], 0)
+                self.assertLessEqual(result['p50_us'], result['p99_us'])
+                self.assertGreater(result['peak_memory_bytes'], 0)
+
+    def test_compare_flags_regressions(self):
+        """
+        Verifica que se detecten las caídas de desempeño.
+        """
+        print("Prueba de benchmark: Verificando que se detecten "
+              "regresiones.")
+        baseline = [{'scenario': 'reserve_room', 'bookings': 10, 'rooms': 3,
+                     'ops_per_second': 1000.0}]
+        current = [dict(baseline[0], ops_per_second=800.0)]
+        self.assertEqual(len(compare(current, baseline)), 1)
+        self.assertEqual(compare(baseline, baseline), [])
+
+    def test_journal_writers(self):
+        """
+        Verifica la medición de la bitácora con escritores concurrentes.
+        """
+        print("Prueba de benchmark: Verificando la medición de la "
+              "bitácora.")
+        result = run_writers(8, 200, sync=False)
+        self.assertEqual(result['operations'], 200)
+        self.assertLessEqual(result['fsyncs'], 200)
+        self.assertGreaterEqual(result['entries_per_fsync'], 1)
+
+    def test_results_go_to_output_dir(self):
+        """
+        Verifica que los resultados se guarden solo en la carpeta
+        indicada.
+        """
+        print("Prueba de benchmark: Verificando la carpeta de "
+              "resultados.")
+        with tempfile.TemporaryDirectory() as directory, \
+                contextlib.redirect_stdout(io.StringIO()):
+            before = set(os.listdir())
+            output = os.path.join(directory, "resultados")
+            self.assertEqual(main(['--bookings', '10', '--rooms', '3',
+                                   '--scenarios', 'reserve_room',
+                                   '--no-memory', '--output-dir', output]),
+                             0)
+            self.assertEqual(len(os.listdir(output)), 1)
+            self.assertEqual(set(os.listdir()), before)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+"""
+Este módulo contiene pruebas unitarias para la importación y exportación
+masiva.
+"""
+import io
+import json
+import os
+import tempfile
+import unittest
+from bulk import export_records, import_records, main
+from storage import MemoryBackend, SQLiteBackend
+
+
+class TestBulk(unittest.TestCase):
+    """
+    Pruebas unitarias para el módulo bulk.
+    """
+
+    def setUp(self):
+        """
+        Prepara el contexto necesario para las pruebas.
+        """
+        self.lines = [
+            json.dumps({'name': "EdBaldwin", 'email': "ed@nasa.gov.us",
+                        'mobile_phone': "1234567890",
+                        'address': "Happy Valley 123"}),
+            json.dumps({'name': "Gordo", 'email': "", 'mobile_phone': "1",
+                        'address': "x"}),
+            "no es json",
+            "",
+            json.dumps({'name': "Karen", 'email': "karen@nasa.gov.us",
+                        'mobile_phone': "0987654321",
+                        'address': "Calle Nueva 456"}),
+        ]
+
+    def test_import_validates_like_create_customer(self):
+        """
+        Verifica que la importación rechace los mismos registros que
+        create_customer.
+        """
+        print("\nPrueba de importación: Verificando que se validen los "
+              "clientes importados.")
+        store = MemoryBackend()
+        rejected = []
+        report = import_records(store, 'customer', iter(self.lines),
+                                batch_size=1,
+                                on_error=lambda *error: rejected.append(
+                                    error[0]))
+        self.assertEqual(report['imported'], 2)
+        self.assertEqual(report['rejected'], 2)
+        self.assertEqual(rejected, [2, 3])
+        self.assertEqual(sorted(store.keys('customer')),
+                         ["EdBaldwin", "Karen"])
+
+    def test_export_round_trip(self):
+        """
+        Verifica que lo exportado se pueda volver a importar.
+        """
+        print("Prueba de exportación: Verificando que se exporten los "
+              "registros como JSONL.")
+        with tempfile.TemporaryDirectory() as directory:
+            database = os.path.join(directory, "hotel.db")
+            source = os.path.join(directory, "customers.jsonl")
+            with open(source, 'w', encoding='utf-8') as file:
+                file.write("\n".join(self.lines))
+            main(['import', 'customers', source, '--sqlite', database])
+            output = io.StringIO()
+            store = SQLiteBackend(database)
+            report = export_records(store, 'customer', output)
+            store.close()
+        self.assertEqual(report['exported'], 2)
+        names = [json.loads(line)['name']
+                 for line in output.getvalue().splitlines()]
+        self.assertEqual(names, ["EdBaldwin", "Karen"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+"""
+Este módulo contiene pruebas unitarias para la clase CachedBackend.
+"""
+import os
+import tempfile
+import unittest
+from unittest import mock
+from cache import CachedBackend
+from customer import DEFAULT_STORE, Customer
+from storage import (DEFAULT_BACKEND, JsonFileBackend, MemoryBackend,
+                     SQLiteBackend)
+
+
+class TestCachedBackend(unittest.TestCase):
+    """
+    Pruebas unitarias para la clase CachedBackend.
+    """
+
+    def setUp(self):
+        """
+        Prepara el contexto necesario para las pruebas.
+        """
+        self.backend = MemoryBackend()
+        self.cache = CachedBackend(self.backend, maxsize=2)
+
+    def test_repeated_reads_hit_cache(self):
+        """
+        Verifica que las lecturas repetidas no lleguen al almacén.
+        """
+        print("\nPrueba de caché: Verificando que las lecturas repetidas "
+              "se resuelvan desde el caché.")
+        customer = Customer("EdBaldwin", "ed.baldwin@nasa.gov.us",
+                            "1234567890", "Happy Valley 123",
+                            store=self.cache)
+        customer.create_customer()
+        with mock.patch.object(self.backend, 'get') as get, \
+             mock.patch.object(self.backend, 'exists') as exists:
+            customer.display_info()
+            customer.display_info()
+            get.assert_not_called()
+            exists.assert_not_called()
+        self.assertEqual(self.cache.stats()['hits'], 2)
+        self.assertEqual(self.cache.stats()['misses'], 0)
+
+    def test_modify_and_delete_update_cache(self):
+        """
+        Verifica que modificar y eliminar actualicen el caché.
+        """
+        print("Prueba de caché: Verificando que modificar y eliminar "
+              "actualicen el caché.")
+        customer = Customer("EdBaldwin", "ed.baldwin@nasa.gov.us",
+                            "1234567890", "Happy Valley 123",
+                            store=self.cache)
+        customer.create_customer()
+        customer.modify_info(name="GordoStevens", email="g@example.com",
+                             mobile_phone="0987654321", address="Nueva 456")
+        self.assertEqual(self.cache.get('customer', 'EdBaldwin')['email'],
+                         "g@example.com")
+        self.assertEqual(self.cache.misses, 0)
+        customer.delete_customer()
+        with self.assertRaises(FileNotFoundError):
+            customer.display_info()
+
+    def test_lru_eviction(self):
+        """
+        Verifica que se desaloje el registro usado hace más tiempo.
+        """
+        print("Prueba de caché: Verificando el desalojo LRU.")
+        for name in ("a", "b"):
+            self.cache.put('customer', name, {'name': name})
+        self.cache.get('customer', 'a')
+        self.cache.put('customer', 'c', {'name': 'c'})
+        self.assertEqual(self.cache.stats()['evictions'], 1)
+        self.cache.get('customer', 'a')
+        self.cache.get('customer', 'b')
+        self.assertEqual(self.cache.stats()['misses'], 1)
+
+    def test_validate_detects_external_changes(self):
+        """
+        Verifica que la validación por mtime detecte cambios externos.
+        """
+        print("Prueba de caché: Verificando que se detecten cambios "
+              "hechos fuera del caché.")
+        with tempfile.TemporaryDirectory() as directory:
+            backend = JsonFileBackend(directory)
+            cache = CachedBackend(backend, validate=True)
+            cache.put('customer', 'EdBaldwin', {'name': 'EdBaldwin'})
+            backend.put('customer', 'EdBaldwin', {'name': 'Gordo'})
+            filename = backend.filename('customer', 'EdBaldwin')
+            stat = os.stat(filename)
+            os.utime(filename, ns=(stat.st_atime_ns,
+                                   stat.st_mtime_ns + 1000))
+            self.assertEqual(cache.get('customer', 'EdBaldwin'),
+                             {'name': 'Gordo'})
+            self.assertEqual(cache.stats()['misses'], 1)
+
+    def test_validate_on_sqlite(self):
+        """
+        Verifica que la validación detecte los cambios que otra conexión
+        hace en la base SQLite.
+        """
+        print("Prueba de caché: Verificando la validación sobre SQLite.")
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "hotel.db")
+            backend = SQLiteBackend(path)
+            other = SQLiteBackend(path)
+            cache = CachedBackend(backend, validate=True)
+            cache.put('customer', 'EdBaldwin', {'name': 'EdBaldwin'})
+            self.assertEqual(cache.get('customer', 'EdBaldwin'),
+                             {'name': 'EdBaldwin'})
+            other.put('customer', 'EdBaldwin', {'name': 'Gordo'})
+            self.assertEqual(cache.get('customer', 'EdBaldwin'),
+                             {'name': 'Gordo'})
+            backend.update('customer', 'EdBaldwin', {'name': 'Ed'})
+            self.assertEqual(cache.get('customer', 'EdBaldwin'),
+                             {'name': 'Ed'})
+            self.assertEqual(cache.stats()['misses'], 2)
+            other.close()
+            cache.close()
+
+    def test_default_store_sees_direct_writes(self):
+        """
+        Verifica que el caché por omisión de los clientes vea lo que se
+        escribe directamente en el almacén por omisión.
+        """
+        print("Prueba de caché: Verificando que el caché por omisión vea "
+              "las escrituras directas.")
+        customer = Customer("CacheAna", "ana@example.com", "1234567890",
+                            "Happy Valley 123")
+        customer.create_customer()
+        try:
+            self.assertEqual(
+                DEFAULT_STORE.get('customer', "CacheAna")['email'],
+                "ana@example.com")
+            DEFAULT_BACKEND.put('customer', "CacheAna",
+                                dict(customer.to_dict(),
+                                     email="nueva@example.com"))
+            self.assertEqual(
+                DEFAULT_STORE.get('customer', "CacheAna")['email'],
+                "nueva@example.com")
+        finally:
+            customer.delete_customer()
+
+
+if __name__ == "__main__":
+    unittest.main()
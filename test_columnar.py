@@ -0,0 +1,62 @@
+"""
+Este módulo contiene pruebas unitarias para la clase ReservationStore.
+"""
+import unittest
+from columnar import ReservationStore
+
+
+class TestReservationStore(unittest.TestCase):
+    """
+    Pruebas unitarias para la clase ReservationStore.
+    """
+
+    def setUp(self):
+        """
+        Prepara el contexto necesario para las pruebas.
+        """
+        self.store = ReservationStore(['101', '102', '103'])
+
+    def test_add_and_view(self):
+        """
+        Verifica que las reservas se lean a través de sus vistas.
+        """
+        print("\nPrueba de almacén columnar: Verificando que se puedan "
+              "leer las reservas.")
+        row = self.store.add('102', "Roberto Avelar", 738931, 738936)
+        view = self.store.view(row)
+        self.assertEqual(view.room_number, '102')
+        self.assertEqual(view.guest_name, "Roberto Avelar")
+        self.assertEqual((view.check_in, view.check_out), (738931, 738936))
+        self.assertTrue(view.active)
+        with self.assertRaises(AttributeError):
+            setattr(view, 'extra', 1)
+
+    def test_cancel_reuses_rows(self):
+        """
+        Verifica que las filas canceladas se reutilicen.
+        """
+        print("Prueba de almacén columnar: Verificando que se reutilicen "
+              "las filas canceladas.")
+        first = self.store.add('101', "Jane Doe", 1, 2)
+        self.store.add('101', "Jane Doe", 2, 3)
+        self.assertTrue(self.store.cancel(first))
+        self.assertFalse(self.store.cancel(first))
+        self.assertEqual(list(self.store.active_rows()), [1])
+        self.assertEqual(self.store.add('103', "John Doe", 5, 6), first)
+        self.assertEqual(len(self.store), 2)
+        self.assertEqual(self.store.guests, ["Jane Doe", "John Doe"])
+
+    def test_compact_footprint(self):
+        """
+        Verifica que cada reserva ocupe pocos bytes en las columnas.
+        """
+        print("Prueba de almacén columnar: Verificando el tamaño por "
+              "reserva.")
+        for number in range(10000):
+            self.store.add('101', f"Guest {number % 100}", number,
+                           number + 1)
+        self.assertLessEqual(self.store.nbytes() / len(self.store), 17)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -6,6 +6,7 @@ import os
 import json
 # Importación relativa hacia arriba y dentro de la carpeta reservations
 from customer import Customer
+from storage import ConflictError, MemoryBackend
 
 
 class TestCustomer(unittest.TestCase):
@@ -135,6 +136,32 @@ class TestCustomer(unittest.TestCase):
                                              mobile_phone="1234567890",
                                              address="New Address")
 
+    def test_modify_conflict(self):
+        """
+        Verificar que no se pueda modificar un cliente con una versión
+        obsoleta.
+        """
+        print("Prueba de modificar un customer: Verificando que se "
+              "detecten las modificaciones concurrentes.")
+        store = MemoryBackend()
+        first = Customer("EdBaldwin", "ed.baldwin@nasa.gov.us",
+                         "1234567890", "Happy Valley 123", store=store)
+        first.create_customer()
+        second = Customer("EdBaldwin", "", store=store)
+        second.display_info()
+        first.modify_info(name="EdBaldwin", email="ed@example.com",
+                          mobile_phone="1234567890",
+                          address="Happy Valley 123")
+        with self.assertRaises(ConflictError):
+            second.modify_info(name="EdBaldwin", email="otro@example.com",
+                               mobile_phone="1", address="Otra")
+        self.assertEqual(store.get('customer', "EdBaldwin")['email'],
+                         "ed@example.com")
+        second.display_info()
+        second.modify_info(name="EdBaldwin", email="otro@example.com",
+                           mobile_phone="1", address="Otra")
+        self.assertEqual(second.version, 3)
+
     def tearDown(self):
         # Limpiar después de las pruebas
         if os.path.exists("EdBaldwin_customer.json"):
@@ -154,6 +181,7 @@ if __name__ == "__main__":
     suite.addTest(TestCustomer('test_modify_info'))
     suite.addTest(TestCustomer('test_create_customer_with_invalid_data'))
     suite.addTest(TestCustomer('test_modify_info_with_invalid_data'))
+    suite.addTest(TestCustomer('test_modify_conflict'))
     suite.addTest(TestCustomer('test_delete_nonexistent_customer'))
     suite.addTest(TestCustomer('test_display_nonexistent_customer_info'))
     suite.addTest(TestCustomer('test_delete_customer'))
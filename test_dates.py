@@ -0,0 +1,50 @@
+"""
+Este módulo contiene pruebas unitarias para el módulo dates.
+"""
+import unittest
+from datetime import date
+from dates import format_date, parse_date
+
+
+class TestDates(unittest.TestCase):
+    """
+    Pruebas unitarias para parse_date y format_date.
+    """
+
+    def test_parse_and_format(self):
+        """
+        Verifica la conversión entre texto ISO y ordinales.
+        """
+        print("\nPrueba de fechas: Verificando la conversión a ordinales.")
+        ordinal = parse_date("2024-02-29")
+        self.assertEqual(ordinal, date(2024, 2, 29).toordinal())
+        self.assertEqual(format_date(ordinal), "2024-02-29")
+        self.assertEqual(parse_date("2024-03-01") - ordinal, 1)
+
+    def test_invalid_dates(self):
+        """
+        Verifica que se rechacen fechas inválidas o mal formadas.
+        """
+        print("Prueba de fechas: Verificando que se rechacen fechas "
+              "inválidas.")
+        for text in ("2023-02-29", "2024-2-15", "2024/02/15", "15-02-2024",
+                     "2024-02-1x", ""):
+            with self.subTest(text=text):
+                with self.assertRaises(ValueError):
+                    parse_date(text)
+        with self.assertRaises(TypeError):
+            parse_date(None)
+
+    def test_repeated_dates_are_memoized(self):
+        """
+        Verifica que las fechas repetidas se resuelvan desde el caché.
+        """
+        print("Prueba de fechas: Verificando el caché de fechas.")
+        parse_date("2031-07-04")
+        hits = parse_date.cache_info().hits
+        parse_date("2031-07-04")
+        self.assertEqual(parse_date.cache_info().hits, hits + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
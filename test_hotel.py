@@ -2,8 +2,14 @@
 Este módulo contiene pruebas unitarias para la clase Hotel.
 """
 import unittest
+import json
 import os
+import random
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
 from hotel import Hotel
+from storage import ConflictError, JsonFileBackend, MemoryBackend
 
 
 class TestHotel(unittest.TestCase):
@@ -116,6 +122,266 @@ class TestHotel(unittest.TestCase):
               "existente.")
         self.assertFalse(self.hotel.cancel_reservation("102"))
 
+    def test_reserve_non_overlapping_stays(self):
+        """
+        Verificar que una habitación acepte estancias que no se traslapan.
+        """
+        print("Prueba de reservar una habitación: Verificando que se pueda "
+              "reservar la misma habitación en fechas distintas.")
+        self.assertTrue(self.hotel.reserve_room("101", "Roberto Avelar",
+                                                "2024-02-15", "2024-02-20"))
+        self.assertTrue(self.hotel.reserve_room("101", "Jane Doe",
+                                                "2024-03-01", "2024-03-05"))
+        self.assertTrue(self.hotel.reserve_room("101", "John Doe",
+                                                "2024-02-20", "2024-03-01"))
+        self.assertFalse(self.hotel.reserve_room("101", "Jane Doe",
+                                                 "2024-02-28", "2024-03-02"))
+        self.assertEqual(len(self.hotel.reservations["101"]), 3)
+
+    def test_is_available(self):
+        """
+        Verificar la consulta de disponibilidad por rango de fechas.
+        """
+        print("Prueba de disponibilidad: Verificando que se pueda consultar "
+              "si una habitación está libre entre dos fechas.")
+        self.hotel.reserve_room("102", "Roberto Avelar",
+                                "2024-02-15", "2024-02-20")
+        self.assertFalse(self.hotel.is_available("102", "2024-02-19",
+                                                 "2024-02-22"))
+        self.assertTrue(self.hotel.is_available("102", "2024-02-20",
+                                                "2024-02-22"))
+        self.assertFalse(self.hotel.is_available("999", "2024-02-20",
+                                                 "2024-02-22"))
+        self.assertTrue(self.hotel.cancel_reservation("102", "2024-02-15"))
+        self.assertTrue(self.hotel.is_available("102", "2024-02-19",
+                                                "2024-02-22"))
+
+    def test_find_free_rooms(self):
+        """
+        Verificar la búsqueda de habitaciones libres en un rango.
+        """
+        print("Prueba de búsqueda: Verificando que se encuentren las "
+              "habitaciones libres entre dos fechas.")
+        self.hotel.reserve_room("101", "Roberto Avelar",
+                                "2024-02-15", "2024-02-20")
+        self.hotel.reserve_room("103", "Jane Doe",
+                                "2024-02-19", "2024-02-21")
+        self.assertEqual(self.hotel.find_free_rooms("2024-02-16",
+                                                    "2024-02-18"),
+                         ["102", "103"])
+        self.assertEqual(self.hotel.find_free_rooms("2024-02-18",
+                                                    "2024-02-20"),
+                         ["102"])
+        self.assertEqual(self.hotel.find_free_rooms("2024-02-20",
+                                                    "2024-02-15"), [])
+        self.hotel.cancel_reservation("101")
+        self.assertEqual(self.hotel.find_free_rooms("2024-02-16",
+                                                    "2024-02-18"),
+                         ["101", "102", "103"])
+
+    def test_find_free_rooms_by_type(self):
+        """
+        Verificar la búsqueda de habitaciones libres filtrada por tipo y
+        atributos, también en un hotel cargado del almacén.
+        """
+        print("Prueba de búsqueda por tipo: Verificando que se filtren "
+              "las habitaciones libres por tipo y atributos.")
+        store = MemoryBackend()
+        hotel = Hotel("Tipos", "123 Main St", "1234567890", store=store,
+                      rooms={'101': {'type': "king", 'floor': 1,
+                                     'accessible': True},
+                             '102': {'type': "double", 'floor': 1},
+                             '201': {'type': "king", 'floor': 2},
+                             '202': None})
+        hotel.reserve_room("101", "Jane Doe", "2024-02-15", "2024-02-20")
+        self.assertEqual(hotel.find_free_rooms("2024-02-16", "2024-02-18",
+                                               "king"), ["201"])
+        self.assertEqual(hotel.find_free_room("2024-02-16", "2024-02-18",
+                                              "king"), "201")
+        self.assertIsNone(hotel.find_free_room("2024-02-16", "2024-02-18",
+                                               "king", accessible=True))
+        self.assertEqual(hotel.find_free_rooms("2024-02-20", "2024-02-21",
+                                               floor=1), ["101", "102"])
+        self.assertEqual(hotel.find_free_rooms("2024-02-16", "2024-02-18",
+                                               "suite"), [])
+        self.assertEqual(hotel.find_free_rooms("2024-02-16", "2024-02-18"),
+                         ["102", "201", "202"])
+
+        hotel.create_hotel()
+        loaded = Hotel.load("Tipos", store=store)
+        self.assertEqual(loaded.inventory.get('201'),
+                         {'type': "king", 'floor': 2})
+        self.assertEqual(loaded.find_free_rooms("2024-02-16", "2024-02-18",
+                                                "king"), ["201"])
+
+    def test_reserve_many(self):
+        """
+        Verificar que se pueda reservar un lote de habitaciones.
+        """
+        print("Prueba de reservas en lote: Verificando que se acepten y "
+              "rechacen las solicitudes con su motivo.")
+        results = self.hotel.reserve_many([
+            {'room_number': "101", 'guest_name': "Roberto Avelar",
+             'check_in_date': "2024-02-15", 'check_out_date': "2024-02-20"},
+            {'room_number': "101", 'guest_name': "Jane Doe",
+             'check_in_date': "2024-02-18", 'check_out_date': "2024-02-22"},
+            {'room_number': "999", 'guest_name': "Jane Doe",
+             'check_in_date': "2024-02-18", 'check_out_date': "2024-02-22"},
+            {'room_number': "102", 'guest_name': "Jane Doe",
+             'check_in_date': "2024-02-22", 'check_out_date': "2024-02-18"},
+        ])
+        self.assertEqual([result['accepted'] for result in results],
+                         [True, False, False, False])
+        self.assertEqual([result['reason'] for result in results],
+                         [None, 'room_unavailable', 'unknown_room',
+                          'invalid_dates'])
+
+    def test_concurrent_reservations(self):
+        """
+        Verificar que reservar desde varios hilos nunca duplique una
+        habitación.
+        """
+        print("Prueba de concurrencia: Verificando que no haya reservas "
+              "duplicadas al reservar desde varios hilos.")
+        rng = random.Random(7)
+        requests = []
+        for _ in range(3000):
+            day = rng.randint(1, 25)
+            requests.append([{
+                'room_number': rng.choice(self.hotel.rooms),
+                'guest_name': "Guest",
+                'check_in_date': f"2024-02-{day:02d}",
+                'check_out_date': f"2024-02-{day + rng.randint(1, 3):02d}"
+            }])
+        for workers in (1, 4, 16):
+            hotel = Hotel("California", "123 Main St", "1234567890")
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                outcomes = list(pool.map(hotel.reserve_many, requests))
+            elapsed = time.perf_counter() - start
+            print(f"\t{workers} hilos: {len(requests) / elapsed:,.0f} "
+                  "solicitudes/s")
+            accepted = sum(outcome[0]['accepted'] for outcome in outcomes)
+            self.assertEqual(accepted,
+                             sum(len(bookings) for bookings
+                                 in hotel.reservations.values()))
+            for schedule in hotel.schedules.values():
+                for end, start_next in zip(schedule.ends,
+                                           schedule.starts[1:]):
+                    self.assertLessEqual(end, start_next)
+            booked_nights = sum(
+                end - start for schedule in hotel.schedules.values()
+                for start, end in zip(schedule.starts, schedule.ends))
+            self.assertEqual(booked_nights,
+                             sum(bin(mask).count("1") for mask
+                                 in hotel.occupancy.nights.values()))
+
+    def test_load_hotel(self):
+        """
+        Verificar que un hotel guardado se cargue de forma perezosa.
+        """
+        print("Prueba de carga de hotel: Verificando que las reservas se "
+              "lean solo al usarse.")
+        with tempfile.TemporaryDirectory() as directory:
+            for store in (JsonFileBackend(directory), MemoryBackend()):
+                with self.subTest(store=type(store).__name__):
+                    hotel = Hotel("Cargado", "123 Main St", "1234567890",
+                                  store=store, rooms=['101', '102'])
+                    hotel.reserve_room("101", "Jane Doe",
+                                       "2024-02-15", "2024-02-20")
+                    hotel.reserve_room("102", "Ed", "2024-03-01",
+                                       "2024-03-04")
+                    hotel.create_hotel()
+
+                    loaded = Hotel.load("Cargado", store=store)
+                    self.assertEqual(loaded.phone, "1234567890")
+                    self.assertNotIn('bookings', loaded.__dict__)
+                    self.assertEqual(loaded.rooms, ['101', '102'])
+                    self.assertNotIn('bookings', loaded.__dict__)
+                    self.assertEqual(loaded.reservations,
+                                     hotel.reservations)
+                    self.assertFalse(loaded.is_available(
+                        "101", "2024-02-16", "2024-02-17"))
+                    self.assertTrue(loaded.reserve_room(
+                        "101", "Ed", "2024-02-20", "2024-02-22"))
+
+                    partial = Hotel.load("Cargado", store=store,
+                                         window=("2024-03-01",
+                                                 "2024-04-01"))
+                    self.assertEqual(len(partial.bookings), 1)
+                    self.assertEqual(partial.reserve_many([
+                        {'room_number': "101", 'guest_name': "Ed",
+                         'check_in_date': "2024-02-01",
+                         'check_out_date': "2024-02-03"}])[0]['reason'],
+                        'outside_window')
+                    with self.assertRaises(ValueError):
+                        partial.create_hotel()
+                    with self.assertRaises(FileNotFoundError):
+                        Hotel.load("Inexistente", store=store)
+
+    def test_load_legacy_hotel(self):
+        """
+        Verificar que se carguen los archivos del formato original, con
+        una sola reserva por habitación.
+        """
+        print("Prueba de carga de hotel: Verificando el formato original "
+              "de las reservas.")
+        with tempfile.TemporaryDirectory() as directory:
+            with open(os.path.join(directory, "Antiguo_hotel.json"), 'w',
+                      encoding='utf-8') as file:
+                json.dump({'name': "Antiguo", 'location': "123 Main St",
+                           'phone': "1234567890",
+                           'rooms': ['101', '102', '103'],
+                           'reservations': {'101': {
+                               'guest_name': "Jane Doe",
+                               'check_in_date': "2024-02-15",
+                               'check_out_date': "2024-02-20"}}}, file)
+            hotel = Hotel.load("Antiguo", store=JsonFileBackend(directory))
+            self.assertFalse(hotel.is_available("101", "2024-02-16",
+                                                "2024-02-17"))
+            self.assertTrue(hotel.is_available("102", "2024-02-16",
+                                               "2024-02-17"))
+            self.assertEqual(hotel.reservations["101"][0]['guest_name'],
+                             "Jane Doe")
+
+    def test_modify_conflict(self):
+        """
+        Verifica que una modificación hecha con una versión obsoleta se
+        rechace sin perder la anterior.
+        """
+        print("Prueba de modificar información: Verificando que se "
+              "detecten las modificaciones concurrentes.")
+        with tempfile.TemporaryDirectory() as directory:
+            store = JsonFileBackend(directory)
+            hotel = Hotel("Versionado", "123 Main St", "1234567890",
+                          store=store)
+            hotel.reserve_room("101", "Jane", "2024-02-15", "2024-02-20")
+            hotel.create_hotel()
+            first = Hotel.load("Versionado", store=store)
+            second = Hotel.load("Versionado", store=store)
+            self.assertEqual(first.version, 1)
+            first.modify_hotel_info(name="Versionado",
+                                    location="250 Reforma St",
+                                    phone="0987654321")
+            self.assertEqual(first.version, 2)
+            with self.assertRaises(ConflictError):
+                second.modify_hotel_info(name="Versionado",
+                                         location="Otro", phone="1")
+            self.assertEqual((second.location, second.phone),
+                             ("123 Main St", "1234567890"))
+
+            reloaded = Hotel.load("Versionado", store=store)
+            self.assertEqual((reloaded.version, reloaded.location),
+                             (2, "250 Reforma St"))
+            self.assertEqual(reloaded.reservations, hotel.reservations)
+
+            # Volver a crear el hotel no reinicia su versión.
+            hotel.create_hotel()
+            self.assertEqual(hotel.version, 3)
+            with self.assertRaises(ConflictError):
+                reloaded.modify_hotel_info(name="Versionado",
+                                           location="Otro", phone="1")
+
     def tearDown(self):
         """
         Limpiar después de las pruebas.
@@ -138,8 +404,17 @@ if __name__ == "__main__":
     suite.addTest(TestHotel('test_create_hotel'))
     suite.addTest(TestHotel('test_display_hotel_info'))
     suite.addTest(TestHotel('test_modify_info'))
+    suite.addTest(TestHotel('test_modify_conflict'))
     suite.addTest(TestHotel('test_reserve_room'))
     suite.addTest(TestHotel('test_cancel_reservation'))
+    suite.addTest(TestHotel('test_reserve_non_overlapping_stays'))
+    suite.addTest(TestHotel('test_is_available'))
+    suite.addTest(TestHotel('test_find_free_rooms'))
+    suite.addTest(TestHotel('test_find_free_rooms_by_type'))
+    suite.addTest(TestHotel('test_reserve_many'))
+    suite.addTest(TestHotel('test_concurrent_reservations'))
+    suite.addTest(TestHotel('test_load_hotel'))
+    suite.addTest(TestHotel('test_load_legacy_hotel'))
     suite.addTest(TestHotel('test_delete_hotel'))
 
     # Crear un TextTestRunner personalizado
@@ -0,0 +1,110 @@
+"""
+Este módulo contiene pruebas unitarias para los identificadores
+ordenables por tiempo.
+"""
+import threading
+import time
+import unittest
+from datetime import datetime, timezone
+import ids
+from customer import Customer
+from hotel import Hotel
+from reservation import Reservation
+from storage import MemoryBackend
+
+
+class TestIds(unittest.TestCase):
+    """
+    Pruebas unitarias para el módulo ids.
+    """
+
+    def test_encode_decode(self):
+        """
+        Verifica la conversión entre enteros y texto y que el orden de
+        los textos sea el de los enteros.
+        """
+        print("\nPrueba de identificadores: Verificando la codificación.")
+        values = [0, 1, 31, 32, (1 << 128) - 1, 12345678901234567890 << 40]
+        for value in values:
+            text = ids.encode(value)
+            self.assertEqual(len(text), ids.LENGTH)
+            self.assertEqual(ids.decode(text), value)
+            self.assertEqual(ids.decode(text.lower()), value)
+        texts = [ids.encode(value) for value in sorted(values)]
+        self.assertEqual(texts, sorted(texts))
+        for invalid in ("corto", "U" * ids.LENGTH, "Z" * ids.LENGTH):
+            with self.assertRaises(ValueError):
+                ids.decode(invalid)
+
+    def test_monotonic_and_unique(self):
+        """
+        Verifica que los ids sean crecientes en un hilo y únicos entre
+        hilos.
+        """
+        print("Prueba de identificadores: Verificando el orden y la "
+              "unicidad.")
+        generator = ids.IdGenerator()
+        generated = [generator.next() for _ in range(1000)]
+        self.assertEqual(generated, sorted(generated))
+        self.assertEqual(ids.timestamp(generated[0]) // 60,
+                         time.time() // 60)
+
+        results = []
+
+        def work():
+            results.append([generator.next() for _ in range(2000)])
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len({value for batch in results
+                              for value in batch}), 8000)
+
+    def test_bounds(self):
+        """
+        Verifica que los límites de un intervalo contengan exactamente
+        los ids creados en él.
+        """
+        print("Prueba de identificadores: Verificando los límites por "
+              "tiempo.")
+        moment = datetime(2024, 3, 1, tzinfo=timezone.utc)
+        value = ids.encode(int(moment.timestamp() * 1000) << 80 | 99)
+        low, high = ids.bounds(moment, moment.timestamp() + 1)
+        self.assertTrue(low <= value < high)
+        low, high = ids.bounds(moment.timestamp() + 0.001,
+                               moment.timestamp() + 1)
+        self.assertFalse(low <= value < high)
+        self.assertEqual(ids.timestamp(value), moment.timestamp())
+
+    def test_reservations_created(self):
+        """
+        Verifica que las reservas usen ids ordenables y puedan recorrerse
+        por momento de creación.
+        """
+        print("Prueba de identificadores: Verificando el recorrido de "
+              "reservas por momento de creación.")
+        store = MemoryBackend()
+        hotel = Hotel("Ordenado", "123 Main St", "1234567890", store=store)
+        customer = Customer("Ana", "ana@x.com", store=store)
+        start = time.time()
+        created = []
+        for room in ('101', '102', '103'):
+            reservation = Reservation(customer, hotel, {
+                'room_number': room, 'check_in_date': '2024-05-01',
+                'check_out_date': '2024-05-03'})
+            reservation.create_reservation()
+            created.append(reservation.reservation_id)
+        self.assertEqual(len(created[0]), ids.LENGTH)
+        self.assertEqual(
+            [record['reservation_id'] for record in
+             Reservation.scan_created(store, start - 1, time.time() + 1)],
+            created)
+        self.assertEqual(
+            list(Reservation.scan_created(store, start - 3600, start - 1)),
+            [])
+
+
+if __name__ == "__main__":
+    unittest.main()
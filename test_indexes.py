@@ -0,0 +1,148 @@
+"""
+Este módulo contiene pruebas unitarias para la clase ReservationIndex.
+"""
+import unittest
+from customer import Customer
+from hotel import Hotel
+from ids import encode
+from indexes import ReservationIndex
+from reservation import Reservation
+from storage import MemoryBackend
+
+
+def _record(reservation_id, name, email, hotel, check_in):
+    return {'reservation_id': reservation_id, 'customer_name': name,
+            'customer_email': email, 'hotel_name': hotel,
+            'room_number': '101', 'check_in_date': check_in,
+            'check_out_date': '2024-12-31'}
+
+
+class TestReservationIndex(unittest.TestCase):
+    """
+    Pruebas unitarias para la clase ReservationIndex.
+    """
+
+    def setUp(self):
+        """
+        Prepara el contexto necesario para las pruebas.
+        """
+        self.index = ReservationIndex()
+        self.index.add(_record('a', "Jane", "jane@x.com", "Sol", '2024-03-01'))
+        self.index.add(_record('b', "Jane", "jane@x.com", "Mar", '2024-03-05'))
+        self.index.add(_record('c', "Ed", "ed@x.com", "Sol", '2024-03-10'))
+
+    def test_find_by_fields(self):
+        """
+        Verifica las búsquedas por huésped, correo, hotel y fechas.
+        """
+        print("\nPrueba de índices: Verificando búsquedas por campo.")
+        self.assertEqual(self.index.find(customer="Jane"), {'a', 'b'})
+        self.assertEqual(self.index.find(email="ed@x.com"), {'c'})
+        self.assertEqual(self.index.find(hotel="Sol"), {'a', 'c'})
+        self.assertEqual(
+            self.index.find(date_range=('2024-03-01', '2024-03-10')),
+            {'a', 'b'})
+        self.assertEqual(
+            self.index.find(customer="Jane", hotel="Sol",
+                            date_range=('2024-02-01', '2024-04-01')),
+            {'a'})
+        self.assertEqual(self.index.find(customer="Nadie"), set())
+
+    def test_remove(self):
+        """
+        Verifica que las reservas eliminadas dejen de encontrarse.
+        """
+        print("Prueba de índices: Verificando la eliminación.")
+        self.assertTrue(self.index.remove('a'))
+        self.assertFalse(self.index.remove('a'))
+        self.assertEqual(self.index.find(customer="Jane"), {'b'})
+        self.assertEqual(self.index.check_in_days,
+                         sorted(self.index.by_check_in))
+        self.assertEqual(len(self.index), 2)
+
+    def test_created_range(self):
+        """
+        Verifica la búsqueda por momento de creación con ids ordenables
+        por tiempo.
+        """
+        print("Prueba de índices: Verificando la búsqueda por momento de "
+              "creación.")
+        index = ReservationIndex()
+        early = encode(1000 << 80)
+        late = encode(5000 << 80 | 7)
+        index.add(_record(late, "Jane", "jane@x.com", "Sol", '2024-03-01'))
+        index.add(_record(early, "Ed", "ed@x.com", "Sol", '2024-03-01'))
+        self.assertEqual(index.created_between(0, 10), [early, late])
+        self.assertEqual(index.created_between(2, 5), [])
+        self.assertEqual(index.find(hotel="Sol", created=(5, 6)), {late})
+        index.remove(early)
+        self.assertEqual(index.created, [late])
+        # Los ids de otro formato se indexan pero no por creación.
+        index.add(_record('a', "Jane", "jane@x.com", "Sol", '2024-03-01'))
+        self.assertEqual(index.created, [late])
+
+    def test_rebuild_replaces_in_place(self):
+        """
+        Verifica que la reconstrucción reemplace los índices sin cambiar
+        el candado que comparten los hilos.
+        """
+        print("Prueba de índices: Verificando la reconstrucción sobre "
+              "índices existentes.")
+        store = MemoryBackend()
+        created = encode(1000 << 80)
+        for record in (_record('b', "Jane", "jane@x.com", "Mar",
+                               '2024-03-05'),
+                       _record(created, "Ana", "ana@x.com", "Sol",
+                               '2024-03-02')):
+            store.put('reservation', record['reservation_id'], record)
+        lock = getattr(self.index, '_lock')
+        self.index.rebuild(store)
+        self.assertIs(getattr(self.index, '_lock'), lock)
+        self.assertEqual(len(self.index), 2)
+        self.assertEqual(self.index.find(hotel="Sol"), {created})
+        self.assertEqual(self.index.find(customer="Jane"), {'b'})
+        self.assertEqual(self.index.check_in_days,
+                         sorted(self.index.by_check_in))
+        self.assertEqual(self.index.created, [created])
+
+    def test_incremental_and_rebuild(self):
+        """
+        Verifica que Reservation mantenga los índices y que puedan
+        reconstruirse desde el almacén.
+        """
+        print("Prueba de índices: Verificando la actualización incremental "
+              "y la reconstrucción.")
+        store = MemoryBackend()
+        hotel = Hotel("Indexado", "123 Main St", "1234567890", store=store)
+        customer = Customer("Ana", "ana@x.com", store=store)
+        previous = Reservation.index
+        Reservation.index = ReservationIndex()
+        try:
+            reservation = Reservation(customer, hotel, {
+                'room_number': '101', 'check_in_date': '2024-05-01',
+                'check_out_date': '2024-05-03'})
+            reservation.create_reservation()
+            Reservation.create_many(hotel, [(customer, {
+                'room_number': '102', 'check_in_date': '2024-05-02',
+                'check_out_date': '2024-05-04'})])
+            found = Reservation.find_reservations(customer="Ana")
+            self.assertEqual(len(found), 2)
+            self.assertEqual(set(Reservation.index.created), found)
+            self.assertIn(reservation.reservation_id, found)
+
+            reservation.cancel_reservation()
+            self.assertEqual(
+                Reservation.find_reservations(email="ana@x.com"),
+                found - {reservation.reservation_id})
+
+            Reservation.index = ReservationIndex()
+            Reservation.rebuild_index(store)
+            self.assertEqual(
+                Reservation.find_reservations(hotel="Indexado"),
+                found - {reservation.reservation_id})
+        finally:
+            Reservation.index = previous
+
+
+if __name__ == "__main__":
+    unittest.main()
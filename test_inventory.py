@@ -0,0 +1,70 @@
+"""
+Este módulo contiene pruebas unitarias para la clase RoomInventory.
+"""
+import unittest
+from inventory import RoomInventory
+from occupancy import OccupancyCalendar
+
+
+class TestRoomInventory(unittest.TestCase):
+    """
+    Pruebas unitarias para la clase RoomInventory.
+    """
+
+    def setUp(self):
+        """
+        Prepara el contexto necesario para las pruebas.
+        """
+        self.inventory = RoomInventory({
+            '101': {'type': "king", 'beds': 1, 'accessible': True},
+            '102': {'type': "double", 'beds': 2},
+            '103': {'type': "king", 'beds': 1},
+            '104': None})
+
+    def test_membership_and_find(self):
+        """
+        Verifica la pertenencia y la búsqueda por atributos.
+        """
+        print("\nPrueba de inventario: Verificando la búsqueda por "
+              "atributos.")
+        self.assertIn('104', self.inventory)
+        self.assertNotIn('999', self.inventory)
+        self.assertEqual(len(self.inventory), 4)
+        self.assertEqual(self.inventory.find(type="king"), ['101', '103'])
+        self.assertEqual(self.inventory.find(type="king", accessible=True),
+                         ['101'])
+        self.assertEqual(self.inventory.find(type="suite"), [])
+        self.assertEqual(self.inventory.find(), ['101', '102', '103', '104'])
+        self.assertEqual(self.inventory.values(), {"king", "double"})
+
+    def test_update_attributes(self):
+        """
+        Verifica que cambiar los atributos actualice los índices.
+        """
+        print("Prueba de inventario: Verificando la actualización de "
+              "atributos.")
+        self.inventory.add('103', {'type': "suite"})
+        self.assertEqual(self.inventory.find(type="king"), ['101'])
+        self.assertEqual(self.inventory.find(beds=1), ['101'])
+        self.assertEqual(self.inventory.get('103'), {'type': "suite"})
+        self.assertEqual(self.inventory.add('105', {'type': "king"}), 4)
+        self.assertEqual(self.inventory.find(type="king"), ['101', '105'])
+
+    def test_combined_with_occupancy(self):
+        """
+        Verifica que las máscaras coincidan con el calendario y que la
+        búsqueda de libres se limite a las candidatas.
+        """
+        print("Prueba de inventario: Verificando la combinación con el "
+              "calendario de ocupación.")
+        calendar = OccupancyCalendar(self.inventory.rooms)
+        calendar.mark('101', 10, 12)
+        kings = self.inventory.mask(type="king")
+        self.assertEqual(calendar.free_rooms(10, 11, kings), ['103'])
+        calendar.mark('103', 11, 12)
+        self.assertEqual(calendar.free_mask(10, 12, kings), 0)
+        self.assertEqual(calendar.free_rooms(12, 13, kings), ['101', '103'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,152 @@
+"""
+Este módulo contiene pruebas unitarias para la bitácora de escritura
+anticipada.
+"""
+import os
+import tempfile
+import threading
+import unittest
+from journal import Journal, JournaledBackend
+from storage import ConflictError, JsonFileBackend, MemoryBackend
+
+
+class TestJournal(unittest.TestCase):
+    """
+    Pruebas unitarias para Journal y JournaledBackend.
+    """
+
+    def setUp(self):
+        """
+        Prepara el contexto necesario para las pruebas.
+        """
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "journal.log")
+
+    def test_group_commit(self):
+        """
+        Verifica que los escritores concurrentes compartan confirmaciones.
+        """
+        print("\nPrueba de bitácora: Verificando la confirmación en "
+              "grupo.")
+        journal = Journal(self.path)
+        barrier = threading.Barrier(16)
+
+        def write(number):
+            barrier.wait()
+            for sequence in range(50):
+                journal.append({'writer': number, 'n': sequence})
+
+        threads = [threading.Thread(target=write, args=(number,))
+                   for number in range(16)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(journal.entries, 800)
+        self.assertLess(journal.commits, 800)
+        journal.close()
+        recovered = Journal(self.path).recovered()
+        self.assertEqual([entry['seq'] for entry in recovered],
+                         list(range(1, 801)))
+
+    def test_replay_after_crash(self):
+        """
+        Verifica que al reabrir se reapliquen las entradas y se descarte
+        una última línea incompleta.
+        """
+        print("Prueba de bitácora: Verificando la recuperación tras una "
+              "caída.")
+        store = JournaledBackend(MemoryBackend(), self.path)
+        store.put('customer', 'Ed', {'name': 'Ed', 'phone': '1'})
+        store.update('customer', 'Ed', {'phone': '2'})
+        store.put_many('reservation', [('a', {}), ('b', {})])
+        store.delete('reservation', 'a')
+        with self.assertRaises(KeyError):
+            store.delete('reservation', 'a')
+        # Simula una caída: la bitácora queda con una línea a medias y el
+        # almacén en memoria se pierde.
+        store.journal.close()
+        with open(self.path, 'ab') as file:
+            file.write(b'{"op": "put", "kind": "cus')
+
+        recovered = JournaledBackend(MemoryBackend(), self.path)
+        self.assertEqual(recovered.replayed, 4)
+        self.assertEqual(recovered.get('customer', 'Ed'),
+                         {'name': 'Ed', 'phone': '2'})
+        self.assertEqual(recovered.keys('reservation'), ['b'])
+        recovered.close()
+
+    def test_replay_delete_many(self):
+        """
+        Verifica que una eliminación en lote ocupe una sola entrada y se
+        reaplique al reabrir.
+        """
+        print("Prueba de bitácora: Verificando la eliminación en lote.")
+        store = JournaledBackend(MemoryBackend(), self.path)
+        store.put_many('reservation', [(key, {}) for key in 'abc'])
+        store.delete_many('reservation', ['a', 'c', 'x'])
+        store.journal.close()
+
+        recovered = JournaledBackend(MemoryBackend(), self.path)
+        self.assertEqual(recovered.replayed, 2)
+        self.assertEqual(recovered.keys('reservation'), ['b'])
+        recovered.close()
+
+    def test_replay_compare_and_swap(self):
+        """
+        Verifica que las modificaciones con versión se registren con la
+        versión resultante y las rechazadas no se registren.
+        """
+        print("Prueba de bitácora: Verificando las modificaciones con "
+              "versión.")
+        store = JournaledBackend(MemoryBackend(), self.path)
+        store.put('customer', 'Ed', {'name': 'Ed', 'phone': '1'})
+        self.assertEqual(store.compare_and_swap('customer', 'Ed', 0,
+                                                {'phone': '2'}), 1)
+        with self.assertRaises(ConflictError):
+            store.compare_and_swap('customer', 'Ed', 0, {'phone': '3'})
+        store.journal.close()
+
+        recovered = JournaledBackend(MemoryBackend(), self.path)
+        self.assertEqual(recovered.replayed, 2)
+        self.assertEqual(recovered.get('customer', 'Ed'),
+                         {'name': 'Ed', 'phone': '2', 'version': 1})
+        recovered.close()
+
+    def test_checkpoint_repairs_files(self):
+        """
+        Verifica que el punto de control vacíe la bitácora y que la
+        reaplicación repare un archivo truncado.
+        """
+        print("Prueba de bitácora: Verificando el punto de control y la "
+              "reparación de archivos.")
+        directory = os.path.join(self.tmpdir.name, "datos")
+        os.mkdir(directory)
+        backend = JsonFileBackend(directory)
+        store = JournaledBackend(backend, self.path, checkpoint_size=10**9)
+        store.put('hotel', 'Sol', {'name': 'Sol', 'phone': '1'})
+        store.journal.close()
+        with open(backend.filename('hotel', 'Sol'), 'w',
+                  encoding='utf-8') as file:
+            file.write('{"name": "S')
+        store = JournaledBackend(backend, self.path)
+        self.assertEqual(store.get('hotel', 'Sol'),
+                         {'name': 'Sol', 'phone': '1'})
+        store.checkpoint()
+        self.assertEqual(store.journal.size(), 0)
+        store.put('hotel', 'Luna', {})
+        self.assertGreater(store.journal.size(), 0)
+        store.close()
+        reopened = JournaledBackend(backend, self.path)
+        self.assertEqual(reopened.replayed, 0)
+        reopened.close()
+
+    def tearDown(self):
+        """
+        Limpiar después de las pruebas.
+        """
+        self.tmpdir.cleanup()
+
+
+if __name__ == "__main__":
+    unittest.main()
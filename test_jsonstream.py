@@ -0,0 +1,84 @@
+"""
+Este módulo contiene pruebas unitarias para el lector incremental de JSON.
+"""
+import io
+import json
+import unittest
+from jsonstream import JsonStream, iter_grouped, read_members
+
+DOCUMENT = {'name': "California", 'phone': 1234567890,
+            'rooms': ['101', '102', '103'],
+            'reservations': {'101': [], '102': [{'guest_name': "Jane"}],
+                             '103': [{'guest_name': "Ed"},
+                                     {'guest_name': "Ñandú"}]},
+            'rating': 4.5}
+
+
+class TestJsonStream(unittest.TestCase):
+    """
+    Pruebas unitarias para JsonStream.
+    """
+
+    def setUp(self):
+        """
+        Prepara el contexto necesario para las pruebas.
+        """
+        self.data = json.dumps(DOCUMENT, ensure_ascii=False,
+                               indent=1).encode('utf-8')
+
+    def test_read_members(self):
+        """
+        Verifica que se lean solo los miembros pedidos, con bloques de
+        cualquier tamaño.
+        """
+        print("\nPrueba de JSON incremental: Verificando la lectura de "
+              "miembros.")
+        for chunk_size in (1, 3, 4096):
+            with self.subTest(chunk_size=chunk_size):
+                self.assertEqual(
+                    read_members(io.BytesIO(self.data),
+                                 ['phone', 'rating'], chunk_size),
+                    {'phone': 1234567890, 'rating': 4.5})
+
+    def test_stops_early(self):
+        """
+        Verifica que la lectura se detenga al encontrar los miembros.
+        """
+        print("Prueba de JSON incremental: Verificando que no se lea el "
+              "documento completo.")
+        file = io.BytesIO(json.dumps(DOCUMENT).encode('utf-8') + b"x" * 10**6)
+        self.assertEqual(read_members(file, ['name']),
+                         {'name': "California"})
+        self.assertLess(file.tell(), 10**5)
+
+    def test_iter_grouped(self):
+        """
+        Verifica el recorrido grupo por grupo.
+        """
+        print("Prueba de JSON incremental: Verificando el recorrido por "
+              "grupos.")
+        for chunk_size in (1, 7, 65536):
+            with self.subTest(chunk_size=chunk_size):
+                self.assertEqual(
+                    dict(iter_grouped(io.BytesIO(self.data),
+                                      'reservations', chunk_size)),
+                    DOCUMENT['reservations'])
+
+    def test_rejects_malformed(self):
+        """
+        Verifica que un documento truncado produzca un error.
+        """
+        print("Prueba de JSON incremental: Verificando documentos "
+              "truncados.")
+        with self.assertRaises(ValueError):
+            read_members(io.BytesIO(self.data[:40]), ['rating'])
+        stream = JsonStream(io.BytesIO(b'[1 2]'))
+        stream.begin_array()
+        self.assertTrue(stream.next_item())
+        self.assertEqual(stream.value(), 1)
+        with self.assertRaises(ValueError):
+            stream.next_item()
+
+
+if __name__ == "__main__":
+    unittest.main()
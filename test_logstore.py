@@ -0,0 +1,151 @@
+"""
+Este módulo contiene pruebas unitarias para la clase LogStore.
+"""
+import os
+import tempfile
+import unittest
+from unittest import mock
+from customer import Customer
+from hotel import Hotel
+from logstore import LogStore
+from reservation import Reservation
+
+
+class TestLogStore(unittest.TestCase):
+    """
+    Pruebas unitarias para la clase LogStore.
+    """
+
+    def setUp(self):
+        """
+        Prepara el contexto necesario para las pruebas.
+        """
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.store = LogStore(self.tmpdir.name)
+
+    def test_put_get_delete(self):
+        """
+        Verifica que se puedan guardar, leer y eliminar registros.
+        """
+        print("\nPrueba de almacén: Verificando que se puedan guardar, "
+              "leer y eliminar registros.")
+        self.store.put('customer', 'EdBaldwin', {'name': 'EdBaldwin'})
+        self.store.put('customer', 'EdBaldwin', {'name': 'Gordo'})
+        self.assertEqual(self.store.get('customer', 'EdBaldwin'),
+                         {'name': 'Gordo'})
+        self.store.delete('customer', 'EdBaldwin')
+        self.assertFalse(self.store.exists('customer', 'EdBaldwin'))
+        with self.assertRaises(KeyError):
+            self.store.get('customer', 'EdBaldwin')
+
+    def test_reopen_rebuilds_index(self):
+        """
+        Verifica que el índice se reconstruya al reabrir el almacén.
+        """
+        print("Prueba de almacén: Verificando que se reconstruya el "
+              "índice al reabrir.")
+        self.store.put_many('reservation', [('a', {'n': 1}), ('b', {'n': 2})])
+        self.store.delete('reservation', 'a')
+        self.store.close()
+        reopened = LogStore(self.tmpdir.name)
+        self.assertEqual(reopened.keys('reservation'), ['b'])
+        self.assertEqual(reopened.get('reservation', 'b'), {'n': 2})
+        reopened.close()
+
+    def test_reopen_after_torn_write(self):
+        """
+        Verifica que una escritura incompleta se descarte al reabrir y no
+        corrompa las siguientes.
+        """
+        print("Prueba de almacén: Verificando la recuperación de una "
+              "escritura incompleta.")
+        self.store.put('reservation', 'a', {'n': 1})
+        self.store.close()
+        segment = os.path.join(self.tmpdir.name, f"{LogStore.SEGMENT_PREFIX}"
+                               f"000001{LogStore.SEGMENT_SUFFIX}")
+        with open(segment, 'ab') as file:
+            file.write(b'{"k": "reservation", "id": "b", "v"')
+        reopened = LogStore(self.tmpdir.name)
+        reopened.put('reservation', 'c', {'n': 3})
+        reopened.close()
+        again = LogStore(self.tmpdir.name)
+        self.assertEqual(sorted(again.keys('reservation')), ['a', 'c'])
+        self.assertEqual(again.get('reservation', 'c'), {'n': 3})
+        again.close()
+
+    def test_reads_reuse_open_segments(self):
+        """
+        Verifica que las lecturas reutilicen el archivo abierto de cada
+        segmento.
+        """
+        print("Prueba de almacén: Verificando que las lecturas no "
+              "reabran los segmentos.")
+        store = LogStore(os.path.join(self.tmpdir.name, 'small'),
+                         segment_size=64, compact_ratio=None)
+        for number in range(4):
+            store.put('hotel', str(number), {'number': number})
+        with mock.patch('builtins.open',
+                        side_effect=AssertionError("reabierto")):
+            for _ in range(2):
+                for number in range(4):
+                    self.assertEqual(store.get('hotel', str(number)),
+                                     {'number': number})
+        store.close()
+
+    def test_compact(self):
+        """
+        Verifica que la compactación conserve solo registros vigentes.
+        """
+        print("Prueba de almacén: Verificando que la compactación "
+              "descarte versiones obsoletas.")
+        store = LogStore(os.path.join(self.tmpdir.name, 'small'),
+                         segment_size=256, compact_ratio=None)
+        for number in range(50):
+            store.put('hotel', 'California', {'version': number})
+        store.put('hotel', 'Marriot', {'version': 0})
+        self.assertGreater(len(store.segments), 1)
+        store.compact()
+        self.assertEqual(len(store.segments), 1)
+        self.assertEqual(store.dead, 0)
+        self.assertEqual(store.get('hotel', 'California'), {'version': 49})
+        self.assertEqual(store.get('hotel', 'Marriot'), {'version': 0})
+        store.close()
+
+    def test_entities_use_store(self):
+        """
+        Verifica que Customer, Hotel y Reservation persistan en el almacén.
+        """
+        print("Prueba de almacén: Verificando que las entidades se "
+              "persistan en el almacén.")
+        customer = Customer("EdBaldwin", "ed.baldwin@nasa.gov.us",
+                            "1234567890", "Happy Valley 123",
+                            store=self.store)
+        customer.create_customer()
+        customer.modify_info(name="GordoStevens", email="g@example.com",
+                             mobile_phone="0987654321", address="Nueva 456")
+        self.assertEqual(self.store.get('customer', 'EdBaldwin')['name'],
+                         "GordoStevens")
+        hotel = Hotel("California", "123 Main St", "1234567890",
+                      store=self.store)
+        hotel.create_hotel()
+        reservation = Reservation(customer, hotel, {
+            'room_number': "101", 'check_in_date': "2024-02-15",
+            'check_out_date': "2024-02-20"}, store=self.store)
+        reservation.create_reservation()
+        self.assertTrue(self.store.exists('reservation',
+                                          reservation.reservation_id))
+        reservation.cancel_reservation()
+        customer.delete_customer()
+        hotel.delete_hotel()
+        self.assertEqual(self.store.index, {})
+
+    def tearDown(self):
+        """
+        Limpiar después de las pruebas.
+        """
+        self.store.close()
+        self.tmpdir.cleanup()
+
+
+if __name__ == "__main__":
+    unittest.main()
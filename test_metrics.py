@@ -0,0 +1,108 @@
+"""
+Este módulo contiene pruebas unitarias para la instrumentación.
+"""
+import io
+import json
+import unittest
+from contextlib import redirect_stdout
+from customer import Customer
+from hotel import Hotel
+from metrics import NULL_INSTRUMENTATION, Metrics, attach_console
+from reservation import Reservation
+from storage import MemoryBackend
+
+
+class TestMetrics(unittest.TestCase):
+    """
+    Pruebas unitarias para la clase Metrics.
+    """
+
+    def setUp(self):
+        """
+        Prepara el contexto necesario para las pruebas.
+        """
+        self.metrics = Metrics()
+        self.hotel = Hotel("California", "123 Main St", "1234567890",
+                           store=MemoryBackend(),
+                           instrumentation=self.metrics)
+
+    def test_booking_events(self):
+        """
+        Verifica que las reservas publiquen eventos con su motivo.
+        """
+        print("\nPrueba de instrumentación: Verificando que las reservas "
+              "publiquen eventos.")
+        events = []
+        self.metrics.subscribe('booking_rejected',
+                               lambda event, fields: events.append(fields))
+        self.hotel.reserve_room("101", "Roberto Avelar",
+                                "2024-02-15", "2024-02-20")
+        self.hotel.reserve_room("101", "Jane Doe",
+                                "2024-02-16", "2024-02-18")
+        self.hotel.cancel_reservation("101")
+        self.hotel.cancel_reservation("101")
+        self.assertEqual([event['reason'] for event in events],
+                         ['room_unavailable'])
+        counters = self.metrics.snapshot()['counters']
+        self.assertEqual(counters['booking_accepted'], 1)
+        self.assertEqual(counters['booking_rejected'], 1)
+        self.assertEqual(counters['booking_cancelled'], 1)
+        self.assertEqual(counters['cancellation_rejected'], 1)
+        self.assertEqual(
+            self.metrics.snapshot()['histograms']['reserve_seconds']['count'],
+            2)
+
+    def test_no_console_output(self):
+        """
+        Verifica que las reservas no escriban en consola por omisión.
+        """
+        print("Prueba de instrumentación: Verificando que no haya salida "
+              "en consola en la ruta de reserva.")
+        hotel = Hotel("California", "123 Main St", "1234567890",
+                      store=MemoryBackend())
+        customer = Customer("EdBaldwin", "ed.baldwin@nasa.gov.us",
+                            "1234567890", "Happy Valley 123")
+        output = io.StringIO()
+        with redirect_stdout(output):
+            reservation = Reservation(customer, hotel, {
+                'room_number': "101", 'check_in_date': "2024-02-15",
+                'check_out_date': "2024-02-20"})
+            reservation.create_reservation()
+            reservation.cancel_reservation()
+            hotel.cancel_reservation("101")
+        self.assertEqual(output.getvalue(), "")
+        self.assertIs(hotel.instrumentation, NULL_INSTRUMENTATION)
+
+    def test_exporters(self):
+        """
+        Verifica los exportadores JSON y Prometheus.
+        """
+        print("Prueba de instrumentación: Verificando los exportadores.")
+        customer = Customer("EdBaldwin", "ed.baldwin@nasa.gov.us",
+                            "1234567890", "Happy Valley 123")
+        Reservation(customer, self.hotel, {
+            'room_number': "102", 'check_in_date': "2024-02-15",
+            'check_out_date': "2024-02-20"}).create_reservation()
+        snapshot = json.loads(self.metrics.to_json())
+        self.assertEqual(snapshot['counters']['reservation_persisted'], 1)
+        text = self.metrics.to_prometheus()
+        self.assertIn("hotel_booking_accepted_total 1", text)
+        self.assertIn('hotel_persist_seconds_bucket{le="+Inf"} 1', text)
+        self.assertIn("hotel_reserve_seconds_count 1", text)
+
+    def test_attach_console(self):
+        """
+        Verifica que se pueda recuperar la salida en consola.
+        """
+        print("Prueba de instrumentación: Verificando la salida opcional "
+              "en consola.")
+        attach_console(self.metrics)
+        output = io.StringIO()
+        with redirect_stdout(output):
+            self.hotel.reserve_room("103", "Carlos Sigüenza",
+                                    "2024-02-15", "2024-02-20")
+        self.assertIn("Se ha reservado la habitación 103", output.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
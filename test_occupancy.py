@@ -0,0 +1,45 @@
+"""
+Este módulo contiene pruebas unitarias para la clase OccupancyCalendar.
+"""
+import unittest
+from occupancy import OccupancyCalendar
+
+
+class TestOccupancyCalendar(unittest.TestCase):
+    """
+    Pruebas unitarias para la clase OccupancyCalendar.
+    """
+
+    def setUp(self):
+        """
+        Prepara el contexto necesario para las pruebas.
+        """
+        self.calendar = OccupancyCalendar(['101', '102', '103'])
+
+    def test_mark_and_free_rooms(self):
+        """
+        Verifica que las habitaciones marcadas no aparezcan como libres.
+        """
+        print("\nPrueba de calendario: Verificando que las habitaciones "
+              "ocupadas no aparezcan como libres.")
+        self.calendar.mark('102', 10, 13)
+        self.assertEqual(self.calendar.free_rooms(12, 14), ['101', '103'])
+        self.assertEqual(self.calendar.free_rooms(13, 14),
+                         ['101', '102', '103'])
+        self.assertEqual(len(self.calendar.nights), 3)
+
+    def test_unmark_releases_nights(self):
+        """
+        Verifica que liberar una habitación elimine las noches vacías.
+        """
+        print("Prueba de calendario: Verificando que se liberen las "
+              "noches de una habitación.")
+        self.calendar.mark('101', 10, 12)
+        self.calendar.mark('103', 11, 12)
+        self.calendar.unmark('101', 10, 12)
+        self.assertEqual(self.calendar.nights, {11: 0b100})
+        self.assertEqual(self.calendar.free_rooms(10, 12), ['101', '102'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -6,6 +6,7 @@ import os
 from customer import Customer
 from hotel import Hotel
 from reservation import Reservation
+from storage import MemoryBackend
 
 
 class TestReservation(unittest.TestCase):
@@ -30,7 +31,7 @@ class TestReservation(unittest.TestCase):
               "pueda crear una reservación correctamente")
 
         reservation_data = {
-            'room_number': "203",
+            'room_number': "101",
             'check_in_date': "2024-02-15",
             'check_out_date': "2024-02-20"
         }
@@ -43,7 +44,7 @@ class TestReservation(unittest.TestCase):
         self.assertIsInstance(reservation, Reservation)
         self.assertEqual(reservation.customer, self.customer)
         self.assertEqual(reservation.hotel, self.hotel)
-        self.assertEqual(reservation.room_number, "203")
+        self.assertEqual(reservation.room_number, "101")
         self.assertEqual(reservation.check_in_date, "2024-02-15")
         self.assertEqual(reservation.check_out_date, "2024-02-20")
 
@@ -66,7 +67,9 @@ class TestReservation(unittest.TestCase):
 
         # Crear una instancia de Reservation
         reservation = Reservation(self.customer, self.hotel, reservation_data)
-        reservation.create_reservation()
+        self.assertIsNone(reservation.create_reservation())
+        self.assertFalse(os.path.exists(
+            f"reservation_{reservation.reservation_id}.json"))
 
         print("Prueba de crear una reservación: Verificando que NO se "
               "pueda crear una reservación con fechas inválidas.")
@@ -80,7 +83,7 @@ class TestReservation(unittest.TestCase):
 
         # Crear una instancia de Reservation
         reservation = Reservation(self.customer, self.hotel, reservation_data)
-        reservation.create_reservation()
+        self.assertIsNone(reservation.create_reservation())
 
     def test_cancel_reservation(self):
         """
@@ -103,6 +106,98 @@ class TestReservation(unittest.TestCase):
         self.assertTrue(reservation.cancel_reservation())
         # Agregar más aserciones según sea necesario
 
+    def test_create_many(self):
+        """
+        Verifica que se pueda crear un lote de reservas con una sola
+        escritura al almacén.
+        """
+        print("Prueba de crear reservaciones en lote: Verificando que el "
+              "lote se guarde en el almacén.")
+        store = MemoryBackend()
+        hotel = Hotel("California", "123 Main St", "1234567890", store=store)
+        requests = [
+            (self.customer, {'room_number': "101",
+                             'check_in_date': "2024-02-15",
+                             'check_out_date': "2024-02-20"}),
+            (self.customer, {'room_number': "101",
+                             'check_in_date': "2024-02-16",
+                             'check_out_date': "2024-02-18"}),
+            (self.customer, {'room_number': "102",
+                             'check_in_date': "2024-02-15",
+                             'check_out_date': "2024-02-20"}),
+        ]
+        results = Reservation.create_many(hotel, requests)
+        self.assertEqual([result['accepted'] for result in results],
+                         [True, False, True])
+        self.assertEqual(sorted(store.keys('reservation')),
+                         sorted([results[0]['reservation_id'],
+                                 results[2]['reservation_id']]))
+
+    def test_cancel_by_id(self):
+        """
+        Verifica que cancelar por id libere la habitación y elimine el
+        registro, también en lote y entre varios hoteles.
+        """
+        print("Prueba de cancelar por id: Verificando que se liberen la "
+              "habitación y el registro.")
+        store = MemoryBackend()
+        hotels = {name: Hotel(name, "123 Main St", "1234567890",
+                              store=store)
+                  for name in ("California", "Nevada")}
+        stay = {'room_number': "101", 'check_in_date': "2024-02-15",
+                'check_out_date': "2024-02-20"}
+        single = Reservation(self.customer, hotels["California"], stay)
+        single.create_reservation()
+        batch = [result['reservation_id'] for name in hotels
+                 for result in Reservation.create_many(
+                     hotels[name], [(self.customer, dict(
+                         stay, room_number=room)) for room in
+                                    ("102", "103")])]
+
+        self.assertTrue(Reservation.cancel(single.reservation_id, hotels))
+        self.assertTrue(hotels["California"].is_available(
+            "101", "2024-02-15", "2024-02-20"))
+        self.assertFalse(store.exists('reservation',
+                                      single.reservation_id))
+        self.assertFalse(Reservation.cancel(single.reservation_id, hotels))
+
+        results = Reservation.cancel_many(
+            batch[:3] + ["inexistente"], {"California":
+                                          hotels["California"]})
+        self.assertEqual([result['reason'] for result in results],
+                         [None, None, 'unknown_hotel',
+                          'unknown_reservation'])
+        self.assertEqual(store.keys('reservation'), batch[2:])
+        self.assertEqual(hotels["California"].reservations, {})
+        self.assertEqual(len(hotels["Nevada"].bookings), 2)
+
+    def test_cancel_releases_room(self):
+        """
+        Verifica que una reserva rechazada no se guarde y que cancelar
+        una reserva libere su habitación sin tocar la de otro huésped.
+        """
+        print("Prueba de cancelar una reservación: Verificando que se "
+              "libere la habitación en el hotel.")
+        hotel = Hotel("California", "123 Main St", "1234567890",
+                      store=MemoryBackend())
+        stay = {'room_number': "101", 'check_in_date': "2024-02-15",
+                'check_out_date': "2024-02-20"}
+        other = Customer("Jane Doe", "jane@x.com")
+        reservation = Reservation(self.customer, hotel, stay)
+        reservation.create_reservation()
+        rejected = Reservation(other, hotel, stay)
+        self.assertIsNone(rejected.create_reservation())
+        self.assertEqual(hotel.store.keys('reservation'),
+                         [reservation.reservation_id])
+        self.assertEqual(Reservation.find_reservations(customer="Jane Doe"),
+                         set())
+        rejected.cancel_reservation()
+        self.assertFalse(hotel.is_available("101", "2024-02-15",
+                                            "2024-02-20"))
+        self.assertTrue(reservation.cancel_reservation())
+        self.assertTrue(hotel.is_available("101", "2024-02-15",
+                                           "2024-02-20"))
+
 
 if __name__ == "__main__":
     # Crear una instancia de TestSuite
@@ -111,6 +206,9 @@ if __name__ == "__main__":
     # Agregar los métodos de prueba a la suite en el orden deseado
     suite.addTest(TestReservation('test_create_reservation'))
     suite.addTest(TestReservation('test_cancel_reservation'))
+    suite.addTest(TestReservation('test_cancel_by_id'))
+    suite.addTest(TestReservation('test_cancel_releases_room'))
+    suite.addTest(TestReservation('test_create_many'))
 
     # Crear un TextTestRunner personalizado
     runner = unittest.TextTestRunner()
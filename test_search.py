@@ -0,0 +1,137 @@
+"""
+Este módulo contiene pruebas unitarias para la búsqueda en varios hoteles.
+"""
+import functools
+import queue
+import tempfile
+import types
+import unittest
+from hotel import Hotel
+from search import HotelSearch, _Channels, _Searches, rank
+from storage import JsonFileBackend
+
+
+class TestHotelSearch(unittest.TestCase):
+    """
+    Pruebas unitarias para la clase HotelSearch.
+    """
+
+    def setUp(self):
+        """
+        Prepara el contexto necesario para las pruebas.
+        """
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = JsonFileBackend(self.directory.name)
+        self.names = []
+        for number in range(6):
+            location = "Cancún" if number % 3 == 0 else "Monterrey"
+            hotel = Hotel(f"Hotel{number}", location, "1234567890",
+                          store=self.store,
+                          rooms={'101': {'type': "king"},
+                                 '102': {'type': "double"}})
+            if number % 2:
+                hotel.reserve_room('101', "Jane", '2024-03-01',
+                                   '2024-03-05')
+            hotel.create_hotel()
+            self.names.append(hotel.name)
+        self.search = HotelSearch(
+            self.names + ["Inexistente"],
+            functools.partial(JsonFileBackend, self.directory.name),
+            workers=2)
+
+    def tearDown(self):
+        """
+        Detiene los procesos y elimina los archivos de las pruebas.
+        """
+        self.search.close()
+        self.directory.cleanup()
+
+    def test_search_all_hotels(self):
+        """
+        Verifica que se encuentren las habitaciones libres de todos los
+        hoteles y que se respeten los filtros.
+        """
+        print("\nPrueba de búsqueda múltiple: Verificando los candidatos "
+              "de todos los hoteles.")
+        found = list(self.search.search('2024-03-02', '2024-03-03',
+                                        room_type="king"))
+        self.assertEqual(sorted(candidate['hotel'] for candidate in found),
+                         ["Hotel0", "Hotel2", "Hotel4"])
+        everything = list(self.search.search('2024-03-02', '2024-03-03'))
+        self.assertEqual(len(everything), 9)
+        per_hotel = list(self.search.search('2024-03-02', '2024-03-03',
+                                            per_hotel=1))
+        self.assertEqual(len(per_hotel), 6)
+
+    def test_ranking(self):
+        """
+        Verifica que los mejores candidatos prefieran la ubicación
+        buscada y luego el número de habitación.
+        """
+        print("Prueba de búsqueda múltiple: Verificando la clasificación "
+              "de candidatos.")
+        best = self.search.best('2024-03-02', '2024-03-03',
+                                location="cancún", limit=3)
+        self.assertEqual([(candidate['hotel'], candidate['room_number'])
+                          for candidate in best],
+                         [("Hotel0", '101'), ("Hotel0", '102'),
+                          ("Hotel3", '102')])
+        self.assertEqual(best, sorted(best, key=rank))
+
+    def test_interleaved_searches(self):
+        """
+        Verifica que una búsqueda a medio consumir no bloquee a otra
+        hecha desde el mismo hilo y que ambas entreguen todo.
+        """
+        print("Prueba de búsqueda múltiple: Verificando búsquedas "
+              "intercaladas.")
+        first = self.search.search('2024-03-02', '2024-03-03')
+        seen = [next(first)]
+        best = self.search.best('2024-03-02', '2024-03-03', limit=2)
+        self.assertEqual(len(best), 2)
+        seen.extend(first)
+        self.assertEqual(len(seen), 9)
+
+    def test_abandon_and_refresh(self):
+        """
+        Verifica que abandonar una búsqueda no afecte a la siguiente y
+        que refresh lea de nuevo los hoteles del almacén.
+        """
+        print("Prueba de búsqueda múltiple: Verificando el abandono de "
+              "búsquedas y la recarga de hoteles.")
+        results = self.search.search('2024-03-02', '2024-03-03')
+        next(results)
+        results.close()
+
+        hotel = Hotel.load("Hotel0", store=self.store)
+        hotel.reserve_room('101', "Ed", '2024-03-01', '2024-03-04')
+        hotel.reserve_room('102', "Ed", '2024-03-01', '2024-03-04')
+        hotel.save()
+        self.search.refresh(["Hotel0"])
+        found = {candidate['hotel'] for candidate
+                 in self.search.search('2024-03-02', '2024-03-03')}
+        self.assertEqual(found, {"Hotel1", "Hotel2", "Hotel3", "Hotel4",
+                                 "Hotel5"})
+
+    def test_abandoned_mark(self):
+        """
+        Verifica que la marca de abandono cubra las búsquedas
+        abandonadas seguidas sin detener una anterior que sigue en curso.
+        """
+        print("Prueba de búsqueda múltiple: Verificando la marca de "
+              "búsquedas abandonadas.")
+        channels = _Channels([queue.SimpleQueue()], queue.SimpleQueue(),
+                             types.SimpleNamespace(value=0))
+        searches = _Searches(channels)
+        first, second, third = (searches.start('search', None)
+                                for _ in range(3))
+        searches.retire(second)
+        self.assertEqual(channels.abandoned.value, 0)
+        searches.retire(first)
+        self.assertEqual(channels.abandoned.value, second)
+        searches.retire(third)
+        self.assertEqual(channels.abandoned.value, third)
+
+
+if __name__ == "__main__":
+    unittest.main()
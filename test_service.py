@@ -0,0 +1,169 @@
+"""
+Este módulo contiene pruebas unitarias para la clase ReservationService.
+"""
+import asyncio
+import json
+import sqlite3
+import unittest
+from unittest import mock
+from service import ReservationService
+from storage import MemoryBackend
+
+
+class TestReservationService(unittest.TestCase):
+    """
+    Pruebas unitarias para la clase ReservationService.
+    """
+
+    def setUp(self):
+        """
+        Prepara el contexto necesario para las pruebas.
+        """
+        self.store = MemoryBackend()
+        self.service = ReservationService(store=self.store)
+
+    async def _prepare(self):
+        await self.service.handle({'op': 'create_hotel',
+                                   'name': "California",
+                                   'location': "123 Main St",
+                                   'phone': "1234567890"})
+        await self.service.handle({'op': 'create_customer',
+                                   'name': "EdBaldwin",
+                                   'email': "ed.baldwin@nasa.gov.us",
+                                   'mobile_phone': "1234567890",
+                                   'address': "Happy Valley 123"})
+
+    def test_concurrent_reservations_are_batched(self):
+        """
+        Verifica que las reservas concurrentes se agrupen y que solo una
+        gane la misma habitación.
+        """
+        print("\nPrueba de servicio: Verificando que las reservas "
+              "concurrentes se procesen en micro-lotes.")
+
+        async def scenario():
+            await self._prepare()
+            request = {'op': 'reserve', 'hotel': "California",
+                       'customer': "EdBaldwin", 'room_number': "101",
+                       'check_in_date': "2024-02-15",
+                       'check_out_date': "2024-02-20"}
+            responses = await asyncio.gather(
+                *(self.service.handle(dict(request, id=number))
+                  for number in range(20)))
+            availability = await self.service.handle(
+                {'op': 'availability', 'hotel': "California",
+                 'check_in_date': "2024-02-16",
+                 'check_out_date': "2024-02-17"})
+            winner = [response for response in responses
+                      if response['accepted']]
+            cancel = await self.service.handle(
+                {'op': 'cancel',
+                 'reservation_id': winner[0]['reservation_id']})
+            await self.service.close()
+            return responses, winner, availability, cancel
+
+        responses, winner, availability, cancel = asyncio.run(scenario())
+        self.assertEqual(len(winner), 1)
+        self.assertEqual(sorted(response['id'] for response in responses),
+                         list(range(20)))
+        self.assertEqual(availability['free_rooms'], ["102", "103"])
+        self.assertTrue(cancel['ok'])
+        self.assertEqual(self.store.keys('reservation'), [])
+        self.assertEqual(self.service.latency_report()['reserve']['count'],
+                         20)
+
+    def test_line_protocol(self):
+        """
+        Verifica el protocolo de líneas JSON sobre TCP.
+        """
+        print("Prueba de servicio: Verificando el protocolo de líneas "
+              "JSON sobre TCP.")
+
+        async def scenario():
+            await self._prepare()
+            server = await self.service.start(port=0)
+            port = server.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection('127.0.0.1',
+                                                           port)
+            writer.write(b'{"op": "availability", "hotel": "California",'
+                         b' "room_number": "101",'
+                         b' "check_in_date": "2024-02-15",'
+                         b' "check_out_date": "2024-02-20"}\n'
+                         b'not json\n')
+            writer.write_eof()
+            lines = [json.loads(await reader.readline()) for _ in range(2)]
+            writer.close()
+            server.close()
+            await server.wait_closed()
+            await self.service.close()
+            return lines
+
+        lines = asyncio.run(scenario())
+        self.assertIn({'ok': True, 'available': True}, lines)
+        self.assertIn({'ok': False, 'error': "JSON inválido."}, lines)
+
+    def test_failures_always_answer(self):
+        """
+        Verifica que toda falla reciba respuesta y que una falla del
+        almacén no detenga al hotel ni deje habitaciones apartadas.
+        """
+        print("Prueba de servicio: Verificando que toda falla reciba "
+              "respuesta.")
+        request = {'op': 'reserve', 'hotel': "California",
+                   'customer': "EdBaldwin", 'room_number': "101",
+                   'check_in_date': "2024-02-15",
+                   'check_out_date': "2024-02-20"}
+
+        async def scenario():
+            await self._prepare()
+            invalid = [await self.service.handle([1, 2]),
+                       await self.service.handle(
+                           {'op': 'create_hotel', 'name': "Nevada",
+                            'location': "x", 'phone': "1", 'rooms': 5})]
+            with mock.patch.object(
+                    self.store, 'put_many',
+                    side_effect=sqlite3.OperationalError(
+                        "database is locked")):
+                invalid.append(await asyncio.wait_for(
+                    self.service.handle(request), 5))
+            retried = await asyncio.wait_for(self.service.handle(request), 5)
+            await self.service.close()
+            return invalid, retried
+
+        invalid, retried = asyncio.run(scenario())
+        self.assertEqual([response['ok'] for response in invalid],
+                         [False, False, False])
+        self.assertIn("TypeError", invalid[1]['error'])
+        self.assertIn("database is locked", invalid[2]['error'])
+        self.assertTrue(retried['accepted'])
+        self.assertEqual(len(self.store.keys('reservation')), 1)
+
+    def test_stale_version_is_rejected_once(self):
+        """
+        Verifica que una versión obsoleta se rechace sin afectar a las
+        solicitudes siguientes.
+        """
+        print("Prueba de servicio: Verificando que un conflicto de "
+              "versión no afecte a las solicitudes siguientes.")
+        request = {'op': 'modify_hotel', 'hotel': "California",
+                   'name': "California", 'location': "250 Reforma St",
+                   'phone': "0987654321"}
+
+        async def scenario():
+            await self._prepare()
+            stale = await self.service.handle(dict(request, version=99))
+            plain = await self.service.handle(request)
+            current = await self.service.handle(
+                dict(request, version=plain['version']))
+            await self.service.close()
+            return stale, plain, current
+
+        stale, plain, current = asyncio.run(scenario())
+        self.assertFalse(stale['ok'])
+        self.assertIn("versión 99", stale['error'])
+        self.assertTrue(plain['ok'])
+        self.assertEqual(current['version'], plain['version'] + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+"""
+Este módulo contiene pruebas unitarias para el formato binario de
+snapshots.
+"""
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+import snapshot
+from hotel import Hotel
+from storage import MemoryBackend
+
+
+class TestSnapshot(unittest.TestCase):
+    """
+    Pruebas unitarias para los snapshots de hoteles y clientes.
+    """
+
+    def setUp(self):
+        """
+        Prepara el contexto necesario para las pruebas.
+        """
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "hotel.snap")
+        self.hotel = Hotel("Binario", "123 Main St", "1234567890",
+                           store=MemoryBackend(),
+                           rooms={'101': {'type': "king"},
+                                  '102': {'type': "double"}, '103': None})
+        self.hotel.reserve_room('101', "Jane", '2024-03-01', '2024-03-04')
+        self.hotel.reserve_room('101', "Ñandú", '2024-03-04', '2024-03-06')
+        self.hotel.reserve_room('103', "Jane", '2024-03-02', '2024-03-03')
+        self.hotel.reserve_room('102', "Ed", '2024-04-01', '2024-04-02')
+        self.hotel.cancel_reservation('102')
+
+    def tearDown(self):
+        """
+        Elimina los archivos creados por las pruebas.
+        """
+        shutil.rmtree(self.directory)
+
+    def test_hotel_round_trip(self):
+        """
+        Verifica que un hotel restaurado conserve sus reservas e índices.
+        """
+        print("\nPrueba de snapshots: Verificando el guardado y la "
+              "restauración de un hotel.")
+        self.hotel.save_snapshot(self.path)
+        restored = Hotel.load_snapshot(self.path, store=MemoryBackend())
+        self.assertEqual(restored.name, "Binario")
+        self.assertEqual(restored.phone, "1234567890")
+        self.assertEqual(restored.rooms, self.hotel.rooms)
+        self.assertEqual(restored.inventory.attributes,
+                         self.hotel.inventory.attributes)
+        self.assertEqual(restored.reservations, self.hotel.reservations)
+        self.assertEqual(restored.occupancy.nights,
+                         self.hotel.occupancy.nights)
+        self.assertFalse(restored.is_available('101', '2024-03-03',
+                                               '2024-03-05'))
+        self.assertEqual(restored.find_free_rooms('2024-03-02',
+                                                  '2024-03-03'), ['102'])
+
+        # El hotel restaurado sigue aceptando reservas y cancelaciones,
+        # reutilizando la fila liberada antes del guardado.
+        self.assertTrue(restored.reserve_room('102', "Ana", '2024-03-01',
+                                              '2024-03-02'))
+        self.assertEqual(len(restored.bookings.status),
+                         len(self.hotel.bookings.status))
+        self.assertTrue(restored.cancel_reservation('101', '2024-03-01'))
+        self.assertTrue(restored.is_available('101', '2024-03-01',
+                                              '2024-03-04'))
+
+    def test_customers_round_trip(self):
+        """
+        Verifica el guardado y la lectura de una tabla de clientes.
+        """
+        print("Prueba de snapshots: Verificando una tabla de clientes.")
+        records = [{'name': "Jane", 'email': "jane@x.com",
+                    'mobile_phone': "555", 'address': None},
+                   {'name': "Ñandú", 'email': "n@x.com",
+                    'mobile_phone': None, 'address': "Calle 1"}]
+        self.assertEqual(snapshot.save_customers(records, self.path), 2)
+        self.assertEqual(snapshot.load_customers(self.path), records)
+        snapshot.save_customers([], self.path)
+        self.assertEqual(snapshot.load_customers(self.path), [])
+
+    def test_failed_write_keeps_previous(self):
+        """
+        Verifica que un guardado interrumpido conserve el snapshot
+        anterior completo.
+        """
+        print("Prueba de snapshots: Verificando que un guardado fallido "
+              "no trunque el snapshot anterior.")
+        records = [{'name': "Jane", 'email': "jane@x.com",
+                    'mobile_phone': "555", 'address': None}]
+        snapshot.save_customers(records, self.path)
+        with mock.patch.object(snapshot.StringTable, 'pack',
+                               side_effect=OSError("disco lleno")), \
+                self.assertRaises(OSError):
+            snapshot.save_customers(records, self.path)
+        self.assertEqual(snapshot.load_customers(self.path), records)
+        self.assertEqual(os.listdir(self.directory), ["hotel.snap"])
+
+    def test_export_json(self):
+        """
+        Verifica que la exportación produzca el registro de create_hotel.
+        """
+        print("Prueba de snapshots: Verificando la exportación a JSON.")
+        self.hotel.save_snapshot(self.path)
+        output = io.StringIO()
+        snapshot.export_json(self.path, output)
+        self.hotel.create_hotel()
+        self.assertEqual(json.loads(output.getvalue()),
+                         self.hotel.store.get('hotel', "Binario"))
+
+    def test_invalid_files(self):
+        """
+        Verifica que se rechacen archivos ajenos, de otro tipo o de una
+        versión posterior.
+        """
+        print("Prueba de snapshots: Verificando la validación del "
+              "encabezado.")
+        with open(self.path, 'wb') as file:
+            file.write(b"{}" * 8)
+        with self.assertRaises(ValueError):
+            Hotel.load_snapshot(self.path)
+
+        snapshot.save_customers([], self.path)
+        with self.assertRaises(ValueError):
+            Hotel.load_snapshot(self.path)
+
+        self.hotel.save_snapshot(self.path)
+        with open(self.path, 'r+b') as file:
+            file.seek(4)
+            file.write((snapshot.VERSION + 1).to_bytes(2, 'little'))
+        with self.assertRaises(ValueError):
+            Hotel.load_snapshot(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
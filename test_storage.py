@@ -0,0 +1,386 @@
+"""
+Este módulo contiene pruebas unitarias para los almacenes de storage.
+"""
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+from customer import Customer
+from hotel import Hotel
+from storage import (ConflictError, JsonFileBackend, MemoryBackend,
+                     ShardedFileBackend, SQLiteBackend)
+
+
+class TestStorageBackends(unittest.TestCase):
+    """
+    Pruebas unitarias comunes a todos los almacenes.
+    """
+
+    def setUp(self):
+        """
+        Prepara el contexto necesario para las pruebas.
+        """
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.json_dir = os.path.join(self.tmpdir.name, "json")
+        os.mkdir(self.json_dir)
+        self.backends = [
+            JsonFileBackend(self.json_dir),
+            MemoryBackend(),
+            SQLiteBackend(os.path.join(self.tmpdir.name, "hotel.db")),
+            ShardedFileBackend(os.path.join(self.tmpdir.name, "shards")),
+        ]
+
+    def test_put_get_delete(self):
+        """
+        Verifica que cada almacén guarde, lea y elimine registros.
+        """
+        print("\nPrueba de almacenes: Verificando que se puedan guardar, "
+              "leer y eliminar registros.")
+        for backend in self.backends:
+            with self.subTest(backend=type(backend).__name__):
+                backend.put('customer', 'EdBaldwin', {'name': 'EdBaldwin'})
+                self.assertTrue(backend.exists('customer', 'EdBaldwin'))
+                self.assertEqual(backend.get('customer', 'EdBaldwin'),
+                                 {'name': 'EdBaldwin'})
+                backend.delete('customer', 'EdBaldwin')
+                self.assertFalse(backend.exists('customer', 'EdBaldwin'))
+                with self.assertRaises(KeyError):
+                    backend.get('customer', 'EdBaldwin')
+                with self.assertRaises(KeyError):
+                    backend.delete('customer', 'EdBaldwin')
+
+    def test_put_many_and_keys(self):
+        """
+        Verifica que cada almacén guarde lotes y liste sus llaves.
+        """
+        print("Prueba de almacenes: Verificando que se puedan guardar "
+              "lotes de registros.")
+        for backend in self.backends:
+            with self.subTest(backend=type(backend).__name__):
+                backend.put_many('reservation',
+                                 [('a', {'n': 1}), ('b', {'n': 2})])
+                backend.put('hotel', 'California', {'name': 'California'})
+                self.assertEqual(sorted(backend.keys('reservation')),
+                                 ['a', 'b'])
+                self.assertEqual(backend.keys('hotel'), ['California'])
+
+    def test_update(self):
+        """
+        Verifica que cada almacén modifique solo los campos indicados.
+        """
+        print("Prueba de almacenes: Verificando las modificaciones "
+              "parciales.")
+        for backend in self.backends:
+            with self.subTest(backend=type(backend).__name__):
+                backend.put('hotel', 'California',
+                            {'name': 'California', 'phone': '1',
+                             'reservations': {'101': [1], '102': [2]}})
+                backend.update('hotel', 'California',
+                               {'phone': '2',
+                                'reservations': {'101': None,
+                                                 '103': [3]}})
+                self.assertEqual(backend.get('hotel', 'California'),
+                                 {'name': 'California', 'phone': '2',
+                                  'reservations': {'102': [2],
+                                                   '103': [3]}})
+                with self.assertRaises(KeyError):
+                    backend.update('hotel', 'Marriot', {'phone': '3'})
+
+    def test_scan_range(self):
+        """
+        Verifica que cada almacén recorra en orden un rango de llaves.
+        """
+        print("Prueba de almacenes: Verificando los recorridos por rango "
+              "de llaves.")
+        for backend in self.backends:
+            with self.subTest(backend=type(backend).__name__):
+                backend.put_many('reservation',
+                                 [(key, {'key': key})
+                                  for key in ('d', 'a', 'c', 'b', 'e')])
+                backend.put('hotel', 'c', {'name': 'c'})
+                self.assertEqual(
+                    [key for key, _ in backend.scan_range('reservation',
+                                                          'b', 'e')],
+                    ['b', 'c', 'd'])
+                self.assertEqual(
+                    list(backend.scan_range('reservation', 'x', 'z')), [])
+
+    def test_delete_many(self):
+        """
+        Verifica que cada almacén elimine lotes ignorando las llaves que
+        no existen.
+        """
+        print("Prueba de almacenes: Verificando la eliminación en lote.")
+        for backend in self.backends:
+            with self.subTest(backend=type(backend).__name__):
+                backend.put_many('reservation',
+                                 [(key, {}) for key in ('a', 'b', 'c')])
+                backend.delete_many('reservation', ['a', 'c', 'x'])
+                self.assertEqual(backend.keys('reservation'), ['b'])
+
+    def test_json_backend_keeps_file_names(self):
+        """
+        Verifica que el almacén JSON use los nombres de archivo originales.
+        """
+        print("Prueba de almacenes: Verificando los nombres de archivo "
+              "del almacén JSON.")
+        backend = self.backends[0]
+        backend.put('customer', 'EdBaldwin', {})
+        backend.put('hotel', 'California', {})
+        backend.put('reservation', 'abc', {})
+        self.assertEqual(sorted(os.listdir(self.json_dir)),
+                         ['California_hotel.json', 'EdBaldwin_customer.json',
+                          'reservation_abc.json'])
+
+    def test_json_backend_batches(self):
+        """
+        Verifica que el almacén JSON guarde cada lote en un solo archivo
+        y que sus registros se lean, modifiquen y eliminen uno por uno.
+        """
+        print("Prueba de almacenes: Verificando los lotes del almacén "
+              "JSON.")
+        backend = self.backends[0]
+        backend.put('reservation', 'a', {'n': 0})
+        backend.put_many('reservation', [('a', {'n': 1}), ('b', {'n': 2}),
+                                         ('c', {'n': 3})])
+        self.assertEqual(sorted(os.listdir(self.json_dir)),
+                         ['batches', 'reservation_a.json'])
+        self.assertEqual(len(os.listdir(backend.batches.folder)), 1)
+        self.assertEqual(backend.get('reservation', 'a'), {'n': 1})
+        with backend.open_record('reservation', 'b') as file:
+            self.assertEqual(file.read(), b'{"n": 2}')
+
+        backend.update('reservation', 'b', {'m': 1})
+        stamp = backend.stamp('reservation', 'c')
+        backend.delete('reservation', 'c')
+        self.assertNotEqual(backend.stamp('reservation', 'c'), stamp)
+        reopened = JsonFileBackend(self.json_dir)
+        self.assertEqual(dict(reopened.scan('reservation')),
+                         {'a': {'n': 1}, 'b': {'n': 2, 'm': 1}})
+        self.assertFalse(reopened.exists('reservation', 'c'))
+        with self.assertRaises(KeyError):
+            reopened.delete('reservation', 'c')
+        reopened.put_many('reservation', [('c', {'n': 4})])
+        self.assertEqual(backend.get('reservation', 'c'), {'n': 4})
+
+    def test_entities_in_memory(self):
+        """
+        Verifica que las entidades funcionen sin tocar el disco.
+        """
+        print("Prueba de almacenes: Verificando que las entidades se "
+              "puedan usar en memoria.")
+        store = self.backends[1]
+        customer = Customer("EdBaldwin", "ed.baldwin@nasa.gov.us",
+                            "1234567890", "Happy Valley 123", store=store)
+        customer.create_customer()
+        customer.display_info()
+        customer.modify_info(name="GordoStevens", email="g@example.com",
+                             mobile_phone="0987654321", address="Nueva 456")
+        self.assertEqual(store.get('customer', 'EdBaldwin')['email'],
+                         "g@example.com")
+        customer.delete_customer()
+        with self.assertRaises(FileNotFoundError):
+            customer.display_info()
+        hotel = Hotel("California", "123 Main St", "1234567890", store=store)
+        hotel.create_hotel()
+        hotel.modify_hotel_info(name="Marriot", location="250 Reforma St",
+                                phone="0987654321")
+        self.assertEqual(store.get('hotel', 'California')['name'], "Marriot")
+
+    def test_compare_and_swap(self):
+        """
+        Verifica que cada almacén aplique un cambio solo sobre la versión
+        esperada e incremente la versión.
+        """
+        print("Prueba de almacenes: Verificando la modificación con "
+              "versión.")
+        for backend in self.backends:
+            with self.subTest(backend=type(backend).__name__):
+                backend.put('hotel', 'h', {'name': 'h', 'phone': '1'})
+                self.assertEqual(
+                    backend.compare_and_swap('hotel', 'h', 0,
+                                             {'phone': '2'}), 1)
+                with self.assertRaises(ConflictError) as context:
+                    backend.compare_and_swap('hotel', 'h', 0,
+                                             {'phone': '3'})
+                self.assertEqual(context.exception.actual, 1)
+                self.assertEqual(
+                    backend.compare_and_swap('hotel', 'h', None,
+                                             {'name': 'g'}), 2)
+                self.assertEqual(backend.get('hotel', 'h'),
+                                 {'version': 2, 'name': 'g', 'phone': '2'})
+                with self.assertRaises(KeyError):
+                    backend.compare_and_swap('hotel', 'x', 0, {})
+
+    def test_put_versioned(self):
+        """
+        Verifica que reemplazar un registro completo siga incrementando
+        su versión en lugar de reiniciarla.
+        """
+        print("Prueba de almacenes: Verificando el reemplazo con "
+              "versión.")
+        for backend in self.backends:
+            with self.subTest(backend=type(backend).__name__):
+                self.assertEqual(backend.put_versioned(
+                    'hotel', 'v', {'name': 'v', 'rooms': {'101': 1}}), 1)
+                backend.compare_and_swap('hotel', 'v', 1, {'phone': '2'})
+                self.assertEqual(backend.put_versioned(
+                    'hotel', 'v', {'name': 'w', 'rooms': {'102': 1}}), 3)
+                self.assertEqual(backend.get('hotel', 'v'),
+                                 {'version': 3, 'name': 'w',
+                                  'rooms': {'102': 1}})
+                with self.assertRaises(ConflictError):
+                    backend.compare_and_swap('hotel', 'v', 1, {})
+
+    def test_concurrent_compare_and_swap(self):
+        """
+        Verifica que los escritores concurrentes, cada uno con su propio
+        almacén, no pierdan ningún cambio, tampoco frente a update.
+        """
+        print("Prueba de almacenes: Verificando que no se pierdan "
+              "cambios concurrentes.")
+        factories = [
+            lambda: JsonFileBackend(self.json_dir),
+            lambda: SQLiteBackend(os.path.join(self.tmpdir.name,
+                                               "hotel.db")),
+        ]
+        for factory in factories:
+            stores = [factory() for _ in range(4)]
+            stores[0].put('counter', 'c', {'value': 0})
+
+            def increment(store):
+                for _ in range(25):
+                    while True:
+                        record = store.get('counter', 'c')
+                        try:
+                            store.compare_and_swap(
+                                'counter', 'c', record.get('version', 0),
+                                {'value': record['value'] + 1})
+                            break
+                        except ConflictError:
+                            continue
+
+            def touch(store):
+                for number in range(25):
+                    store.update('counter', 'c', {'touched': number})
+
+            threads = [threading.Thread(target=increment, args=(store,))
+                       for store in stores]
+            threads.append(threading.Thread(target=touch,
+                                            args=(factory(),)))
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            with self.subTest(backend=type(stores[0]).__name__):
+                self.assertEqual(stores[0].get('counter', 'c'),
+                                 {'version': 100, 'value': 100,
+                                  'touched': 24})
+            for store in stores:
+                store.close()
+
+    def tearDown(self):
+        """
+        Limpiar después de las pruebas.
+        """
+        for backend in self.backends:
+            backend.close()
+        self.tmpdir.cleanup()
+
+
+class TestShardedFileBackend(unittest.TestCase):
+    """
+    Pruebas unitarias para la clase ShardedFileBackend.
+    """
+
+    def setUp(self):
+        """
+        Prepara el contexto necesario para las pruebas.
+        """
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.backend = ShardedFileBackend(self.tmpdir.name)
+
+    def test_files_are_sharded(self):
+        """
+        Verifica que los archivos vivan en subdirectorios con su nombre
+        original.
+        """
+        print("Prueba de almacén repartido: Verificando los "
+              "subdirectorios.")
+        self.backend.put('customer', 'EdBaldwin', {'name': 'EdBaldwin'})
+        path = self.backend.filename('customer', 'EdBaldwin')
+        self.assertTrue(os.path.exists(path))
+        self.assertEqual(os.path.basename(path), 'EdBaldwin_customer.json')
+        relative = os.path.relpath(path, self.tmpdir.name)
+        self.assertEqual(len(relative.split(os.sep)), 3)
+
+    def test_exists_does_not_touch_disk(self):
+        """
+        Verifica que las consultas de existencia no consulten el disco.
+        """
+        print("Prueba de almacén repartido: Verificando que exists no "
+              "consulte el disco.")
+        self.backend.put('hotel', 'California', {})
+        with mock.patch('os.stat', side_effect=AssertionError), \
+                mock.patch('os.path.exists', side_effect=AssertionError):
+            self.assertTrue(self.backend.exists('hotel', 'California'))
+            self.assertFalse(self.backend.exists('hotel', 'Marriot'))
+            with self.assertRaises(KeyError):
+                self.backend.get('hotel', 'Marriot')
+            with self.assertRaises(KeyError):
+                self.backend.delete('hotel', 'Marriot')
+
+    def test_manifest_survives_reopen(self):
+        """
+        Verifica que el manifiesto se recupere al reabrir el almacén y
+        que pueda reconstruirse a partir de los archivos.
+        """
+        print("Prueba de almacén repartido: Verificando el manifiesto.")
+        self.backend.put_many('reservation',
+                              [('a', {'n': 1}), ('b', {'n': 2})])
+        self.backend.put('customer', 'EdBaldwin', {})
+        self.backend.delete('reservation', 'a')
+        self.backend.close()
+        reopened = ShardedFileBackend(self.tmpdir.name)
+        self.assertEqual(reopened.keys('reservation'), ['b'])
+        reopened.close()
+        os.remove(os.path.join(self.tmpdir.name,
+                               ShardedFileBackend.MANIFEST))
+        rebuilt = ShardedFileBackend(self.tmpdir.name)
+        self.assertEqual(rebuilt.keys('reservation'), ['b'])
+        self.assertEqual(rebuilt.keys('customer'), ['EdBaldwin'])
+        self.assertEqual(rebuilt.get('reservation', 'b'), {'n': 2})
+        rebuilt.close()
+
+    def test_manifest_torn_line(self):
+        """
+        Verifica que una línea incompleta del manifiesto se descarte al
+        reabrir y no oculte las altas siguientes.
+        """
+        print("Prueba de almacén repartido: Verificando la recuperación "
+              "de una línea incompleta del manifiesto.")
+        self.backend.put('reservation', 'a', {'n': 1})
+        self.backend.close()
+        with open(os.path.join(self.tmpdir.name,
+                               ShardedFileBackend.MANIFEST), 'a',
+                  encoding='utf-8') as file:
+            file.write('["+", "reserv')
+        reopened = ShardedFileBackend(self.tmpdir.name)
+        reopened.put('reservation', 'b', {'n': 2})
+        reopened.close()
+        again = ShardedFileBackend(self.tmpdir.name)
+        self.assertTrue(again.exists('reservation', 'b'))
+        self.assertEqual(sorted(again.keys('reservation')), ['a', 'b'])
+        again.close()
+
+    def tearDown(self):
+        """
+        Limpiar después de las pruebas.
+        """
+        self.backend.close()
+        self.tmpdir.cleanup()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+"""
+Este módulo contiene pruebas unitarias para la lista de espera.
+"""
+import unittest
+from hotel import Hotel
+from storage import MemoryBackend
+from waitlist import Waitlist
+
+
+def _always(check_in, check_out):
+    del check_in, check_out
+    return True
+
+
+class TestWaitlist(unittest.TestCase):
+    """
+    Pruebas unitarias para la clase Waitlist y su uso desde Hotel.
+    """
+
+    def setUp(self):
+        """
+        Prepara el contexto necesario para las pruebas.
+        """
+        self.promoted = []
+        self.hotel = Hotel("Espera", "123 Main St", "1234567890",
+                           store=MemoryBackend(), rooms=['101', '102'])
+        self.hotel.enable_waitlist(self.promoted.append)
+        self.hotel.reserve_room('101', "Jane", '2024-03-01', '2024-03-10')
+
+    def test_priority_order(self):
+        """
+        Verifica que se promueva primero el nivel menor y, dentro de un
+        nivel, la solicitud más antigua.
+        """
+        print("\nPrueba de lista de espera: Verificando el orden por "
+              "nivel y llegada.")
+        waitlist = Waitlist()
+        late = waitlist.add("Tarde", 10, 12, '101', tier=1)
+        first = waitlist.add("Primero", 10, 12, '101', tier=1)
+        vip = waitlist.add("Vip", 11, 13, '101', tier=0)
+        self.assertLess(late, first)
+        order = [waitlist.pop_best('101', 10, 13, _always)['guest_name']
+                 for _ in range(3)]
+        self.assertEqual(order, ["Vip", "Tarde", "Primero"])
+        self.assertIsNone(waitlist.pop_best('101', 10, 13, _always))
+        self.assertEqual(len(waitlist), 0)
+        self.assertNotEqual(vip, first)
+
+    def test_only_overlapping_requests(self):
+        """
+        Verifica que solo se consideren las solicitudes que se traslapan
+        con la estancia liberada y las retiradas se ignoren.
+        """
+        print("Prueba de lista de espera: Verificando que solo se "
+              "consideren las estancias traslapadas.")
+        waitlist = Waitlist()
+        waitlist.add("Antes", 1, 5, '101')
+        waitlist.add("Otra", 10, 12, '102')
+        removed = waitlist.add("Retirada", 10, 12, '101')
+        self.assertTrue(waitlist.remove(removed))
+        self.assertFalse(waitlist.remove(removed))
+        self.assertIsNone(waitlist.pop_best('101', 5, 20, _always))
+        self.assertEqual(waitlist.pop_best('101', 4, 6, _always)['guest_name'],
+                         "Antes")
+
+    def test_cancel_promotes(self):
+        """
+        Verifica que cancelar una reserva promueva las solicitudes en
+        espera que caben, en orden de prioridad.
+        """
+        print("Prueba de lista de espera: Verificando la promoción al "
+              "cancelar.")
+        self.assertFalse(self.hotel.reserve_room(
+            '101', "Ed", '2024-03-02', '2024-03-05', waitlist_tier=1))
+        self.hotel.join_waitlist('101', "Ana", '2024-03-03', '2024-03-06',
+                                 tier=0)
+        self.hotel.join_waitlist(None, "Luis", '2024-03-06', '2024-03-09',
+                                 tier=2)
+        self.hotel.join_waitlist('101', "Tarde", '2024-03-20',
+                                 '2024-03-22')
+        self.assertEqual(len(self.hotel.waitlist), 4)
+
+        self.assertTrue(self.hotel.cancel_reservation('101', '2024-03-01'))
+        self.assertEqual([(entry['guest_name'], entry['room_number'])
+                          for entry in self.promoted],
+                         [("Ana", '101'), ("Luis", '101')])
+        self.assertFalse(self.hotel.is_available('101', '2024-03-03',
+                                                 '2024-03-09'))
+        self.assertEqual(len(self.hotel.waitlist), 2)
+
+        # Ed sigue esperando hasta que se libere su estancia.
+        self.promoted.clear()
+        self.hotel.cancel_reservation('101', '2024-03-03')
+        self.assertEqual([entry['guest_name'] for entry in self.promoted],
+                         ["Ed"])
+
+    def test_requires_waitlist(self):
+        """
+        Verifica las validaciones de la lista de espera.
+        """
+        print("Prueba de lista de espera: Verificando las validaciones.")
+        hotel = Hotel("SinEspera", "123 Main St", "1234567890",
+                      store=MemoryBackend())
+        with self.assertRaises(ValueError):
+            hotel.join_waitlist('101', "Ed", '2024-03-02', '2024-03-05')
+        # Sin lista de espera, una reserva rechazada solo devuelve False.
+        hotel.reserve_room('101', "Jane", '2024-03-01', '2024-03-04')
+        self.assertFalse(hotel.reserve_room('101', "Ed", '2024-03-02',
+                                            '2024-03-05', waitlist_tier=1))
+        self.assertIsNone(hotel.waitlist)
+        with self.assertRaises(ValueError):
+            self.hotel.join_waitlist('999', "Ed", '2024-03-02',
+                                     '2024-03-05')
+        with self.assertRaises(ValueError):
+            self.hotel.join_waitlist('101', "Ed", '2024-03-05',
+                                     '2024-03-02')
+
+
+if __name__ == "__main__":
+    unittest.main()
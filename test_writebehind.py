@@ -0,0 +1,185 @@
+"""
+Este módulo contiene pruebas unitarias para la clase WriteBehindBackend.
+"""
+import time
+import unittest
+from hotel import Hotel
+from storage import MemoryBackend
+from writebehind import SYNC, WriteBehindBackend
+
+
+class CountingBackend(MemoryBackend):
+    """
+    Almacén en memoria que cuenta las escrituras que recibe.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def put(self, kind, key, record):
+        self.writes += 1
+        super().put(kind, key, record)
+
+    def update(self, kind, key, changes):
+        self.writes += 1
+        super().update(kind, key, changes)
+
+
+class FailingBackend(MemoryBackend):
+    """
+    Almacén en memoria cuyas escrituras fallan mientras failing sea True.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.failing = True
+
+    def put(self, kind, key, record):
+        if self.failing:
+            raise OSError("disco lleno")
+        super().put(kind, key, record)
+
+    def update(self, kind, key, changes):
+        if self.failing:
+            raise OSError("disco lleno")
+        super().update(kind, key, changes)
+
+
+class TestWriteBehindBackend(unittest.TestCase):
+    """
+    Pruebas unitarias para la clase WriteBehindBackend.
+    """
+
+    def setUp(self):
+        """
+        Prepara el contexto necesario para las pruebas.
+        """
+        self.backend = CountingBackend()
+        self.store = WriteBehindBackend(self.backend, max_pending=100,
+                                        max_delay=60)
+
+    def test_coalesces_writes(self):
+        """
+        Verifica que los cambios a un registro se combinen en una sola
+        escritura y que las lecturas los vean antes del vaciado.
+        """
+        print("\nPrueba de escritura diferida: Verificando que se "
+              "combinen los cambios.")
+        self.store.put('customer', 'Ed', {'name': 'Ed', 'phone': '1'})
+        for number in range(50):
+            self.store.update('customer', 'Ed', {'phone': str(number)})
+        self.assertEqual(self.store.get('customer', 'Ed')['phone'], '49')
+        self.assertEqual(self.backend.writes, 0)
+        self.store.flush()
+        self.assertEqual(self.backend.writes, 1)
+        self.assertEqual(self.backend.get('customer', 'Ed'),
+                         {'name': 'Ed', 'phone': '49'})
+
+    def test_pending_updates_and_deletes(self):
+        """
+        Verifica los parches y borrados pendientes sobre registros ya
+        guardados.
+        """
+        print("Prueba de escritura diferida: Verificando parches y "
+              "borrados pendientes.")
+        self.backend.put('hotel', 'Sol', {'name': 'Sol',
+                                          'reservations': {'101': [1]}})
+        self.store.update('hotel', 'Sol', {'reservations': {'102': [2]}})
+        self.store.update('hotel', 'Sol', {'reservations': {'101': None}})
+        self.assertEqual(self.store.get('hotel', 'Sol')['reservations'],
+                         {'102': [2]})
+        self.store.flush()
+        self.assertEqual(self.backend.get('hotel', 'Sol')['reservations'],
+                         {'102': [2]})
+        self.store.delete('hotel', 'Sol')
+        self.assertFalse(self.store.exists('hotel', 'Sol'))
+        self.assertEqual(self.store.keys('hotel'), [])
+        with self.assertRaises(KeyError):
+            self.store.update('hotel', 'Sol', {'name': 'Luna'})
+        self.store.flush()
+        self.assertFalse(self.backend.exists('hotel', 'Sol'))
+
+    def test_thresholds_and_durability(self):
+        """
+        Verifica el vaciado por tamaño, por tiempo y en modo SYNC.
+        """
+        print("Prueba de escritura diferida: Verificando los umbrales y "
+              "el modo de durabilidad.")
+        for number in range(100):
+            self.store.put('reservation', str(number), {})
+        self.assertEqual(self.store.pending(), 0)
+        self.assertEqual(len(self.backend.keys('reservation')), 100)
+
+        self.store.max_delay = 0.01
+        self.store.put('reservation', 'tarde', {})
+        deadline = time.monotonic() + 2
+        while self.store.pending() and time.monotonic() < deadline:
+            time.sleep(0.005)
+        self.assertTrue(self.backend.exists('reservation', 'tarde'))
+
+        self.store.set_durability(SYNC)
+        self.store.put('reservation', 'ya', {})
+        self.assertTrue(self.backend.exists('reservation', 'ya'))
+        with self.assertRaises(ValueError):
+            self.store.set_durability('nunca')
+
+    def test_hotel_saves_deltas(self):
+        """
+        Verifica que Hotel.save guarde solo las habitaciones que
+        cambiaron.
+        """
+        print("Prueba de escritura diferida: Verificando que el hotel "
+              "guarde solo sus cambios.")
+        hotel = Hotel("Sol", "123 Main St", "1234567890", store=self.store)
+        self.assertFalse(hotel.save())
+        hotel.reserve_room("101", "Jane", "2024-02-15", "2024-02-20")
+        self.assertTrue(hotel.save())
+        for day in range(1, 20, 2):
+            hotel.reserve_room("102", "Ed", f"2024-03-{day:02d}",
+                               f"2024-03-{day + 1:02d}")
+            hotel.save()
+        hotel.cancel_reservation("101")
+        hotel.save()
+        self.store.flush()
+        self.assertEqual(self.backend.writes, 1)
+        self.assertEqual(self.backend.get('hotel', 'Sol')['reservations'],
+                         hotel.reservations)
+        self.assertNotIn('101', hotel.reservations)
+
+    def test_hotel_save_keeps_failed_changes(self):
+        """
+        Verifica que los cambios de un guardado fallido se reintenten en
+        el siguiente.
+        """
+        print("Prueba de escritura diferida: Verificando que un guardado "
+              "fallido no pierda cambios.")
+        backend = FailingBackend()
+        hotel = Hotel("Luna", "123 Main St", "1234567890", store=backend)
+        hotel.reserve_room("101", "Jane", "2024-02-15", "2024-02-20")
+        with self.assertRaises(OSError):
+            hotel.create_hotel()
+        with self.assertRaises(OSError):
+            hotel.save()
+        backend.failing = False
+        hotel.create_hotel()
+        backend.failing = True
+        hotel.reserve_room("102", "Ed", "2024-03-01", "2024-03-02")
+        with self.assertRaises(OSError):
+            hotel.save()
+        backend.failing = False
+        self.assertTrue(hotel.save())
+        self.assertFalse(hotel.save())
+        self.assertEqual(backend.get('hotel', 'Luna')['reservations'],
+                         hotel.reservations)
+        self.assertIn('102', hotel.reservations)
+
+    def tearDown(self):
+        """
+        Limpiar después de las pruebas.
+        """
+        self.store.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,182 @@
+"""
+Este módulo define la clase Waitlist, una lista de espera de solicitudes
+de reserva ordenada por nivel de prioridad y luego por orden de llegada,
+que permite encontrar la mejor solicitud que cabe en una estancia recién
+liberada sin recorrer toda la lista.
+"""
+import heapq
+import itertools
+import threading
+from bisect import bisect_left, insort
+
+
+class Waitlist:
+    """
+    Lista de espera de un hotel.
+
+    Las solicitudes se agrupan por habitación (o None para cualquier
+    habitación) y por rango de fechas; cada grupo es un montículo
+    ordenado por (nivel, llegada). Al liberarse una estancia solo se
+    revisan los grupos cuyo rango se traslapa con ella, y de cada uno
+    solo su cima, así que promover una solicitud cuesta O(log n) más el
+    número de rangos distintos afectados.
+
+    Attributes:
+        on_promote (callable): Función que recibe cada solicitud
+        promovida, por ejemplo para notificar al huésped o persistir la
+        reserva.
+    """
+
+    def __init__(self, on_promote=None):
+        """
+        Inicializa una lista de espera vacía.
+
+        Args:
+            on_promote (callable, opcional): Se llama con la solicitud
+            promovida, ya con la habitación asignada.
+        """
+        self.on_promote = on_promote
+        # Habitación a {(entrada, salida): montículo de
+        # [nivel, llegada, solicitud]}.
+        self._queues = {}
+        # Habitación a la lista ordenada de sus rangos con solicitudes.
+        self._ranges = {}
+        # Habitación a la estancia más larga que espera, para acotar la
+        # búsqueda de rangos traslapados.
+        self._longest = {}
+        self._entries = {}
+        self._arrivals = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add(self, guest_name, check_in, check_out, room_number=None,
+            tier=0):
+        """
+        Agrega una solicitud a la lista de espera.
+
+        Args:
+            guest_name (str): El nombre del huésped.
+            check_in (int): Ordinal del día de entrada.
+            check_out (int): Ordinal del día de salida.
+            room_number (str, opcional): La habitación pedida; None
+            acepta cualquier habitación.
+            tier (int, opcional): Nivel de prioridad; los niveles menores
+            se atienden primero.
+
+        Returns:
+            int: El identificador de la solicitud.
+        """
+        with self._lock:
+            arrival = next(self._arrivals)
+            entry = {'waitlist_id': arrival, 'guest_name': guest_name,
+                     'room_number': room_number, 'check_in': check_in,
+                     'check_out': check_out, 'tier': tier}
+            self._push([tier, arrival, entry])
+            return arrival
+
+    def _push(self, item):
+        entry = item[2]
+        room = entry['room_number']
+        stay = (entry['check_in'], entry['check_out'])
+        queues = self._queues.setdefault(room, {})
+        heap = queues.get(stay)
+        if heap is None:
+            heap = queues[stay] = []
+            insort(self._ranges.setdefault(room, []), stay)
+            self._longest[room] = max(self._longest.get(room, 0),
+                                      stay[1] - stay[0])
+        heapq.heappush(heap, item)
+        self._entries[entry['waitlist_id']] = item
+
+    def remove(self, waitlist_id):
+        """
+        Retira una solicitud de la lista de espera.
+
+        Returns:
+            bool: True si la solicitud estaba en espera.
+        """
+        with self._lock:
+            item = self._entries.pop(waitlist_id, None)
+            if item is None:
+                return False
+            # Se marca y se descarta cuando llegue a la cima.
+            item[2] = None
+            return True
+
+    def _top(self, room, stay):
+        """
+        Cima vigente de un grupo, descartando las solicitudes retiradas y
+        eliminando el grupo si queda vacío.
+        """
+        heap = self._queues[room][stay]
+        while heap and heap[0][2] is None:
+            heapq.heappop(heap)
+        if heap:
+            return heap[0]
+        del self._queues[room][stay]
+        ranges = self._ranges[room]
+        del ranges[bisect_left(ranges, stay)]
+        return None
+
+    def pop_best(self, room_number, check_in, check_out, fits):
+        """
+        Retira la mejor solicitud que se traslapa con una estancia
+        liberada y que cabe en la habitación.
+
+        Args:
+            room_number (str): La habitación liberada.
+            check_in (int): Ordinal de entrada de la estancia liberada.
+            check_out (int): Ordinal de salida de la estancia liberada.
+            fits (callable): Recibe (entrada, salida) e indica si la
+            habitación está libre en ese rango.
+
+        Returns:
+            dict: La solicitud, o None si ninguna cabe.
+        """
+        with self._lock:
+            best = self._best(room_number, check_in, check_out, fits)
+            if best is None:
+                return None
+            room, stay = best
+            entry = heapq.heappop(self._queues[room][stay])[2]
+            self._top(room, stay)
+            del self._entries[entry['waitlist_id']]
+            return entry
+
+    def _best(self, room_number, check_in, check_out, fits):
+        """
+        Busca el grupo cuya cima es la mejor solicitud que cabe en la
+        estancia liberada. Se llama con el candado tomado.
+
+        Returns:
+            tuple: (habitación, estancia) del grupo, o None si ninguna
+            cabe.
+        """
+        best = best_key = None
+        for room in (room_number, None):
+            ranges = self._ranges.get(room)
+            if not ranges:
+                continue
+            low = bisect_left(ranges, (check_in - self._longest[room] + 1,))
+            high = bisect_left(ranges, (check_out,))
+            for stay in ranges[low:high]:
+                if stay[1] <= check_in or not fits(*stay):
+                    continue
+                top = self._top(room, stay)
+                if top is None:
+                    continue
+                # Se comparan (nivel, llegada).
+                key = (top[0], top[1])
+                if best_key is None or key < best_key:
+                    best, best_key = (room, stay), key
+        return best
+
+    def restore(self, entry):
+        """
+        Devuelve a la lista una solicitud retirada con pop_best que no se
+        pudo reservar, conservando su lugar.
+        """
+        with self._lock:
+            self._push([entry['tier'], entry['waitlist_id'], entry])
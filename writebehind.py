@@ -0,0 +1,294 @@
+"""
+Este módulo define la clase WriteBehindBackend, un búfer de escritura
+diferida que se coloca delante de cualquier StorageBackend y agrupa las
+escrituras en lotes, de modo que muchos cambios pequeños al mismo
+registro se convierten en una sola escritura.
+"""
+import copy
+import threading
+import time
+from storage import StorageBackend, merge_patch
+
+BUFFERED = 'buffered'
+SYNC = 'sync'
+
+
+class WriteBehindBackend(StorageBackend):
+    """
+    Almacén con escritura diferida sobre otro almacén.
+
+    Las escrituras se acumulan en memoria, combinadas por registro, y se
+    aplican al almacén subyacente al llegar a ``max_pending`` registros
+    pendientes, cuando el más antiguo cumple ``max_delay`` segundos o al
+    llamar a ``flush()``. Las lecturas ven siempre los cambios pendientes.
+
+    En modo SYNC cada escritura se aplica de inmediato, igual que sin el
+    búfer; en modo BUFFERED una caída del proceso pierde los cambios que
+    aún no se aplicaban.
+
+    Attributes:
+        backend (StorageBackend): Almacén subyacente.
+        max_pending (int): Registros pendientes que disparan un vaciado.
+        max_delay (float): Segundos máximos que un cambio espera.
+        durability (str): BUFFERED o SYNC.
+        flushes (int): Vaciados realizados.
+        last_error (Exception): Último error del vaciado periódico.
+    """
+
+    def __init__(self, backend, max_pending=1000, max_delay=0.05,
+                 durability=BUFFERED):
+        """
+        Inicializa el búfer.
+
+        Args:
+            backend (StorageBackend): Almacén subyacente.
+            max_pending (int, opcional): Registros pendientes que
+            disparan un vaciado.
+            max_delay (float, opcional): Segundos máximos de espera.
+            durability (str, opcional): BUFFERED o SYNC.
+        """
+        self.backend = backend
+        self.max_pending = max_pending
+        self.max_delay = max_delay
+        self.durability = durability
+        self.flushes = 0
+        self.last_error = None
+        # (kind, key) a ('put', registro), ('update', parche) o
+        # ('delete', None).
+        self._pending = {}
+        self._flushing = {}
+        self._oldest = None
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._closed = False
+        self._flusher = threading.Thread(target=self._flush_periodically,
+                                         daemon=True)
+        self._flusher.start()
+
+    def set_durability(self, durability):
+        """
+        Cambia el modo de durabilidad; al pasar a SYNC se vacía el búfer.
+
+        Args:
+            durability (str): BUFFERED o SYNC.
+        """
+        if durability not in (BUFFERED, SYNC):
+            raise ValueError(f"Modo de durabilidad desconocido: "
+                             f"{durability!r}")
+        self.durability = durability
+        if durability == SYNC:
+            self.flush()
+
+    def _flush_periodically(self):
+        while self._wait_for_deadline():
+            try:
+                self.flush()
+            # pylint: disable-next=broad-exception-caught
+            except Exception as exception:
+                # Los cambios siguen pendientes; se reintenta en el
+                # siguiente plazo y el error queda disponible.
+                self.last_error = exception
+
+    def _wait_for_deadline(self):
+        """
+        Espera a que el cambio pendiente más antiguo cumpla su plazo.
+
+        Returns:
+            bool: False si el almacén se cerró.
+        """
+        with self._lock:
+            while not self._closed:
+                if self._oldest is None:
+                    self._wakeup.wait()
+                    continue
+                remaining = self._oldest + self.max_delay - time.monotonic()
+                if remaining <= 0:
+                    return True
+                self._wakeup.wait(remaining)
+            return False
+
+    def _entry(self, kind, key):
+        entry = self._pending.get((kind, key))
+        if entry is None:
+            entry = self._flushing.get((kind, key))
+        return entry
+
+    def _enqueue(self, kind, key, operation, value):
+        with self._lock:
+            previous = self._pending.get((kind, key))
+            if operation == 'update' and previous is not None:
+                if previous[0] == 'delete':
+                    raise KeyError((kind, key))
+                if previous[0] == 'put':
+                    operation = 'put'
+                    value = merge_patch(previous[1], value)
+                else:
+                    value = self._combine(previous[1], value)
+            self._pending[(kind, key)] = (operation, value)
+            if self._oldest is None:
+                self._oldest = time.monotonic()
+                self._wakeup.notify()
+            full = len(self._pending) >= self.max_pending
+        if full or self.durability == SYNC:
+            self.flush()
+
+    @staticmethod
+    def _combine(base, changes):
+        # Dos parches pendientes se combinan conservando los None, que
+        # al aplicarse significan borrar la llave.
+        for name, value in changes.items():
+            current = base.get(name)
+            if isinstance(value, dict) and isinstance(current, dict):
+                WriteBehindBackend._combine(current, value)
+            else:
+                base[name] = value
+        return base
+
+    def put(self, kind, key, record):
+        self._enqueue(kind, key, 'put', copy.deepcopy(record))
+
+    def update(self, kind, key, changes):
+        with self._lock:
+            entry = self._entry(kind, key)
+        if entry is None:
+            if not self.backend.exists(kind, key):
+                raise KeyError((kind, key))
+        elif entry[0] == 'delete':
+            raise KeyError((kind, key))
+        self._enqueue(kind, key, 'update', copy.deepcopy(changes))
+
+    def compare_and_swap(self, kind, key, expected, changes,
+                         replace=False):
+        # La comparación necesita la versión escrita en el almacén, así
+        # que primero se aplican los cambios pendientes.
+        self.flush()
+        return self.backend.compare_and_swap(kind, key, expected, changes,
+                                             replace)
+
+    def delete(self, kind, key):
+        if not self.exists(kind, key):
+            raise KeyError((kind, key))
+        self._enqueue(kind, key, 'delete', None)
+
+    def get(self, kind, key):
+        with self._lock:
+            flushing = self._flushing.get((kind, key))
+            pending = self._pending.get((kind, key))
+            if pending is not None and pending[0] != 'update':
+                if pending[0] == 'delete':
+                    raise KeyError((kind, key))
+                return copy.deepcopy(pending[1])
+            if flushing is not None and flushing[0] == 'delete':
+                raise KeyError((kind, key))
+            record = None
+            if flushing is not None and flushing[0] == 'put':
+                record = copy.deepcopy(flushing[1])
+        if record is None:
+            # Los parches son idempotentes: aplicar uno que el vaciado ya
+            # escribió no cambia el resultado.
+            record = self.backend.get(kind, key)
+            if flushing is not None:
+                merge_patch(record, copy.deepcopy(flushing[1]))
+        if pending is not None:
+            merge_patch(record, copy.deepcopy(pending[1]))
+        return record
+
+    def exists(self, kind, key):
+        with self._lock:
+            entry = self._entry(kind, key)
+        if entry is not None:
+            return entry[0] != 'delete'
+        return self.backend.exists(kind, key)
+
+    def keys(self, kind):
+        with self._lock:
+            pending = {key: entry[0]
+                       for table in (self._flushing, self._pending)
+                       for (entry_kind, key), entry in table.items()
+                       if entry_kind == kind}
+        keys = [key for key in self.backend.keys(kind)
+                if pending.get(key) != 'delete']
+        known = set(keys)
+        keys.extend(key for key, operation in pending.items()
+                    if operation == 'put' and key not in known)
+        return keys
+
+    def stamp(self, kind, key):
+        with self._lock:
+            if self._entry(kind, key) is not None:
+                return None
+        return self.backend.stamp(kind, key)
+
+    def pending(self):
+        """
+        Número de registros con cambios sin aplicar.
+        """
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self):
+        """
+        Aplica al almacén subyacente todos los cambios pendientes.
+
+        Las altas completas de un mismo tipo se escriben con una sola
+        llamada a ``put_many``. Si el almacén falla, los cambios vuelven a
+        quedar pendientes; reaplicar los que sí se escribieron no altera
+        el resultado.
+        """
+        with self._flush_lock:
+            with self._lock:
+                if not self._pending:
+                    return
+                self._flushing = self._pending
+                self._pending = {}
+                self._oldest = None
+            try:
+                puts = {}
+                for (kind, key), (operation, value) \
+                        in self._flushing.items():
+                    if operation == 'put':
+                        puts.setdefault(kind, []).append((key, value))
+                    elif operation == 'update':
+                        self.backend.update(kind, key, value)
+                    else:
+                        try:
+                            self.backend.delete(kind, key)
+                        except KeyError:
+                            pass
+                for kind, records in puts.items():
+                    self.backend.put_many(kind, records)
+            except Exception:
+                with self._lock:
+                    self._requeue(self._flushing)
+                raise
+            finally:
+                with self._lock:
+                    self._flushing = {}
+                    self.flushes += 1
+
+    def _requeue(self, entries):
+        for item, entry in entries.items():
+            newer = self._pending.get(item)
+            if newer is None:
+                self._pending[item] = entry
+            elif newer[0] == 'update' and entry[0] == 'put':
+                self._pending[item] = ('put',
+                                       merge_patch(entry[1], newer[1]))
+            elif newer[0] == 'update' and entry[0] == 'update':
+                self._pending[item] = ('update',
+                                       self._combine(entry[1], newer[1]))
+        if self._pending and self._oldest is None:
+            self._oldest = time.monotonic()
+
+    def close(self):
+        """
+        Vacía el búfer, detiene el hilo de vaciado y cierra el almacén
+        subyacente.
+        """
+        with self._lock:
+            self._closed = True
+            self._wakeup.notify()
+        self._flusher.join()
+        self.flush()
+        self.backend.close()